@@ -0,0 +1,125 @@
+"""
+Fact-check prompt size and latency with and without per-field retrieval.
+
+Runs offline on a recorded set of search results (benchmarks/fixtures/company_sources.json) and fact-checks the
+recorded notes twice: once with the full source string and once with only the BM25-retrieved chunks. Each check
+renders the FactChecker prompt and sends it to the replaying chat model of offline_pipeline.py, whose latency is
+a seeded log-normal base latency plus a per-token prefill cost, so the end-to-end latency includes the model time
+that the smaller prompt saves, not only the preparation time that retrieval adds.
+
+    python benchmarks/fact_check_retrieval.py [--fixture PATH] [--top-k 3] [--chunk-size 200] [--repeat 20]
+                                              [--llm-latency-ms 200] [--llm-ms-per-1k-tokens 20]
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import time
+
+from ai_common import format_sources
+from pydantic import BaseModel, create_model
+
+from business_researcher import CompanySchema, PersonSchema, SearchType
+from business_researcher.components import estimate_tokens
+from business_researcher.components.fact_checker import FACT_CHECK_INSTRUCTIONS, AtomicFactfulness
+from business_researcher.components.retrieval import retrieve_evidence
+from offline_pipeline import FIXTURES_DIR, Latency, ReplayChatModel
+
+FIXTURE_PATH = os.path.join(FIXTURES_DIR, 'company_sources.json')
+
+
+def get_factfulness_model(fixture: dict) -> type[BaseModel]:
+    schema = (PersonSchema if fixture['search_type'] == SearchType.PERSON else CompanySchema).model_json_schema()
+    return create_model('FactfulnessModel', **{x: AtomicFactfulness for x in schema['properties'].keys()})
+
+
+def render_prompt(fixture: dict, content: str) -> str:
+    factfulness_model = get_factfulness_model(fixture=fixture)
+    return FACT_CHECK_INSTRUCTIONS.format(search_type=fixture['search_type'],
+                                          info=fixture['topic'],
+                                          notes=json.dumps(fixture['notes'], indent=2),
+                                          content=content,
+                                          today=datetime.date.today().isoformat(),
+                                          schema=factfulness_model.model_json_schema())
+
+
+def measure(fn, repeat: int) -> tuple[str, list[float]]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - t0)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixture', default=FIXTURE_PATH)
+    parser.add_argument('--max-tokens-per-source', type=int, default=10000)
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--chunk-overlap', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--llm-latency-ms', type=float, default=200, help='Median base latency of a model call')
+    parser.add_argument('--llm-ms-per-1k-tokens', type=float, default=20,
+                        help='Extra model latency per 1000 prompt tokens (prefill)')
+    parser.add_argument('--sigma', type=float, default=0.3, help='Log-normal sigma of the base latency')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with open(args.fixture) as f:
+        fixture = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'llm_responses.json')) as f:
+        responses = json.load(f)
+    schema = (PersonSchema if fixture['search_type'] == SearchType.PERSON else CompanySchema).model_json_schema()
+
+    def full():
+        source_str = format_sources(unique_sources=fixture['unique_sources'],
+                                    max_tokens_per_source=args.max_tokens_per_source,
+                                    include_raw_content=True)
+        return render_prompt(fixture=fixture, content=source_str)
+
+    def retrieved():
+        content = retrieve_evidence(unique_sources=fixture['unique_sources'],
+                                    notes=fixture['notes'],
+                                    json_schema=schema['properties'],
+                                    top_k=args.top_k,
+                                    chunk_size=args.chunk_size,
+                                    chunk_overlap=args.chunk_overlap)
+        return render_prompt(fixture=fixture, content=content)
+
+    def check(prepare, latency: Latency):
+        llm = ReplayChatModel(model_name_alias='replay', responses=responses, notes=fixture['notes'],
+                              latency=latency, seconds_per_token=args.llm_ms_per_1k_tokens / 1e6)
+        structured_llm = llm.with_structured_output(get_factfulness_model(fixture=fixture))
+
+        def run():
+            prompt = prepare()
+            structured_llm.invoke(prompt)
+            return prompt
+        return run
+
+    print(f"Fixture: {args.fixture} ({len(fixture['unique_sources'])} sources, {len(fixture['notes'])} fields)")
+    print(f"Replay model: {args.llm_latency_ms} ms median (sigma {args.sigma}, seed {args.seed}) "
+          f"+ {args.llm_ms_per_1k_tokens} ms per 1k prompt tokens")
+    print(f"{'mode':<12}{'prompt chars':>14}{'est. tokens':>14}{'prep p50 ms':>14}{'total p50 ms':>14}"
+          f"{'total max ms':>14}")
+    results = {}
+    for name, prepare in [('full', full), ('retrieval', retrieved)]:
+        prompt, prep_timings = measure(fn=prepare, repeat=args.repeat)
+        # Same seed for both modes: the base latencies match, the difference comes from prompt size
+        _, timings = measure(fn=check(prepare=prepare, latency=Latency(median_ms=args.llm_latency_ms,
+                                                                       sigma=args.sigma, seed=args.seed)),
+                             repeat=args.repeat)
+        results[name] = (estimate_tokens(prompt), statistics.median(timings))
+        print(f"{name:<12}{len(prompt):>14}{results[name][0]:>14}{statistics.median(prep_timings) * 1000:>14.2f}"
+              f"{results[name][1] * 1000:>14.2f}{max(timings) * 1000:>14.2f}")
+
+    print(f"Input token reduction: {1 - results['retrieval'][0] / results['full'][0]:.1%}, "
+          f"p50 latency reduction: {1 - results['retrieval'][1] / results['full'][1]:.1%}")
+
+
+if __name__ == '__main__':
+    main()
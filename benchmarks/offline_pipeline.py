@@ -0,0 +1,270 @@
+"""
+Offline, deterministic throughput and latency benchmark of the full research pipeline.
+
+No provider is called: `get_llm` is replaced by a chat model that replays recorded responses
+(benchmarks/fixtures/llm_responses.json plus the notes in company_sources.json), and the `WebSearchNode` used by
+the researcher is replaced by a node that replays the recorded search results of company_sources.json. Both
+sleep for a log-normally distributed latency (median and sigma are configurable, seeded) before answering, so
+the numbers show the pipeline's own overhead and how it scales with concurrency.
+
+For every concurrency level, `run_batch` researches the entities and the script reports throughput, entity
+latency percentiles and a per-node breakdown taken from the run spans.
+
+    python benchmarks/offline_pipeline.py [--levels 1 8 64] [--entities 16] [--llm-latency-ms 200]
+                                          [--search-latency-ms 300] [--sigma 0.3] [--seed 7]
+                                          [--llm-ms-per-1k-tokens 0] [--pipelined-extraction]
+
+Use `--llm-latency-ms 0 --search-latency-ms 0` to measure pure framework overhead. `--llm-ms-per-1k-tokens` adds
+prompt-size dependent latency to every LLM call (prefill time), which is what `--pipelined-extraction` saves on.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import time
+from typing import Any, Optional
+
+from ai_common import format_sources, get_model_name_alias
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from pydantic import BaseModel, ConfigDict
+
+from business_researcher import BusinessResearcher, SearchType
+from business_researcher.components import estimate_tokens, fact_checker, note_reviewer, note_taker, query_writer
+from business_researcher.enums import Node
+from business_researcher.state import SearchState
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LLM_CONFIG = {
+    'language_model': {'model': 'openai/gpt-oss-20b', 'model_provider': 'groq', 'api_key': 'offline',
+                       'max_llm_retries': 1, 'model_args': {'temperature': 0}},
+    'reasoning_model': {'model': 'openai/gpt-oss-120b', 'model_provider': 'groq', 'api_key': 'offline',
+                        'max_llm_retries': 1, 'model_args': {'temperature': 0}},
+}
+
+
+class Latency:
+    """Seeded log-normal latency distribution."""
+
+    def __init__(self, median_ms: float, sigma: float, seed: int):
+        self.median = median_ms / 1000
+        self.sigma = sigma
+        self.rng = random.Random(seed)
+
+    def sample(self, extra: float = 0.0) -> float:
+        """A sampled latency plus `extra` seconds."""
+        delay = self.median * math.exp(self.sigma * self.rng.gauss(0, 1)) if self.median > 0 else 0.0
+        return delay + extra
+
+    async def sleep(self, extra: float = 0.0) -> None:
+        """Sleep for a sampled latency plus `extra` seconds."""
+        delay = self.sample(extra=extra)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ReplayChatModel(BaseChatModel):
+    """Chat model that answers with recorded responses after a simulated latency."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name_alias: str
+    responses: dict[str, Any]
+    notes: dict[str, Any]
+    latency: Latency
+    seconds_per_token: float = 0.0
+    schema_type: Optional[type[BaseModel]] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return 'replay'
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = ''.join(str(m.content) for m in messages)
+        time.sleep(self.latency.sample(extra=estimate_tokens(prompt) * self.seconds_per_token))
+        return self._get_result(prompt=prompt)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = ''.join(str(m.content) for m in messages)
+        await self.latency.sleep(extra=estimate_tokens(prompt) * self.seconds_per_token)
+        return self._get_result(prompt=prompt)
+
+    def _get_result(self, prompt: str) -> ChatResult:
+        content = json.dumps(self._get_response())
+        message = AIMessage(content=content,
+                            usage_metadata={'input_tokens': estimate_tokens(prompt),
+                                            'output_tokens': estimate_tokens(content),
+                                            'total_tokens': estimate_tokens(prompt) + estimate_tokens(content)},
+                            response_metadata={'model_name': self.model_name_alias})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _get_response(self) -> dict[str, Any]:
+        if self.schema_type is None:
+            return self.responses['query_writer']
+        if self.schema_type.__name__ == 'ReviewOutput':
+            return self.responses['note_reviewer']
+        if self.schema_type.__name__ == 'FactfulnessModel':
+            return {f: {'title': f, 'value': self.notes.get(f), **self.responses['fact_checker']}
+                    for f in self.schema_type.model_fields}
+        return {f: self.notes[f] for f in self.schema_type.model_fields}
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs):
+        structured_model = self.model_copy(update={'schema_type': schema})
+
+        def parse(raw: AIMessage) -> Any:
+            parsed = schema.model_validate_json(raw.content)
+            return {'raw': raw, 'parsed': parsed, 'parsing_error': None} if include_raw else parsed
+
+        def invoke_structured(prompt: Any, config: RunnableConfig) -> Any:
+            return parse(raw=structured_model.invoke(prompt, config))
+
+        async def ainvoke_structured(prompt: Any, config: RunnableConfig) -> Any:
+            return parse(raw=await structured_model.ainvoke(prompt, config))
+
+        return RunnableLambda(invoke_structured, afunc=ainvoke_structured)
+
+
+class ReplayWebSearchNode:
+    """
+    Stand-in for `WebSearchNode` that returns recorded search results after a simulated latency.
+
+    The recorded sources are split between the recorded `queries`, so a query returns the same sources whether it
+    is searched alone or together with the others.
+    """
+
+    def __init__(self, unique_sources: dict[str, Any], queries: list[str], latency: Latency,
+                 max_tokens_per_source: int):
+        self.sources = list(unique_sources.values())
+        self.queries = queries
+        self.latency = latency
+        self.max_tokens_per_source = max_tokens_per_source
+
+    async def run(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        await asyncio.gather(*[self.latency.sleep() for _ in state.search_queries])
+        sources_per_query = max(len(self.sources) // max(len(self.queries), 1), 1)
+        unique_sources = {}
+        for j, query in enumerate(state.search_queries):
+            i = self.queries.index(query.search_query) if query.search_query in self.queries else j
+            for source in self.sources[i * sources_per_query:(i + 1) * sources_per_query + 1]:
+                unique_sources.setdefault(source['url'], source)
+        state.steps.append(Node.WEB_SEARCH)
+        state.unique_sources = unique_sources
+        state.source_str = format_sources(unique_sources=unique_sources,
+                                          max_tokens_per_source=self.max_tokens_per_source,
+                                          include_raw_content=True)
+        return state
+
+
+def build_researcher(args: argparse.Namespace, fixture: dict[str, Any], responses: dict[str, Any]) -> BusinessResearcher:
+    llm_latency = Latency(median_ms=args.llm_latency_ms, sigma=args.sigma, seed=args.seed)
+
+    def get_replay_llm(model_name: str, model_provider: str, api_key: Any, model_args: dict[str, Any]):
+        return ReplayChatModel(model_name_alias=get_model_name_alias(model_name=model_name,
+                                                                     model_provider=model_provider),
+                               responses=responses,
+                               notes=fixture['notes'],
+                               latency=llm_latency,
+                               seconds_per_token=args.llm_ms_per_1k_tokens / 1e6)
+
+    for module in (query_writer, note_taker, fact_checker, note_reviewer):
+        module.get_llm = get_replay_llm
+
+    researcher = BusinessResearcher(llm_config=LLM_CONFIG, web_search_api_key='offline',
+                                    checkpointer=not args.no_checkpoint)
+    researcher.web_search.web_search_node = ReplayWebSearchNode(
+        unique_sources=fixture['unique_sources'],
+        queries=[q['search_query'] for q in responses['query_writer']['queries']],
+        latency=Latency(median_ms=args.search_latency_ms, sigma=args.sigma, seed=args.seed + 1),
+        max_tokens_per_source=args.max_tokens_per_source,
+    )
+    return researcher
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+async def run_level(researcher: BusinessResearcher, concurrency: int, n_entities: int, args: argparse.Namespace):
+    config = RunnableConfig(recursion_limit=100, configurable={
+        'max_iterations': 3,
+        'max_results_per_query': 5,
+        'max_tokens_per_source': args.max_tokens_per_source,
+        'number_of_days_back': 360,
+        'number_of_queries': 3,
+        'search_category': 'general',
+        'search_depth': 'advanced',
+        'pipelined_extraction': args.pipelined_extraction,
+    })
+    inputs = [{'name': f'Norvale Robotics {i}', 'search_type': SearchType.COMPANY} for i in range(n_entities)]
+
+    t0 = time.perf_counter()
+    results = [r async for r in researcher.run_batch(inputs=inputs, concurrency=concurrency, config=config)]
+    elapsed = time.perf_counter() - t0
+
+    errors = [r['error'] for r in results if r['error'] is not None]
+    if len(errors) > 0:
+        raise RuntimeError(f'{len(errors)} entities failed, first error: {errors[0]}')
+
+    latencies = []
+    node_spans: dict[str, list[dict[str, Any]]] = {}
+    for r in results:
+        spans = r['spans']
+        latencies.append(spans[-1]['started_at'] + spans[-1]['wall_time'] - spans[0]['started_at'])
+        for span in spans:
+            node_spans.setdefault(span['node'], []).append(span)
+    return elapsed, latencies, node_spans
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with open(os.path.join(FIXTURES_DIR, 'company_sources.json')) as f:
+        fixture = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'llm_responses.json')) as f:
+        responses = json.load(f)
+    researcher = build_researcher(args=args, fixture=fixture, responses=responses)
+
+    print(f"LLM latency median {args.llm_latency_ms} ms (+{args.llm_ms_per_1k_tokens} ms per 1k prompt tokens), "
+          f"search latency median {args.search_latency_ms} ms, "
+          f"sigma {args.sigma}, seed {args.seed}, checkpointing {'off' if args.no_checkpoint else 'on'}, "
+          f"pipelined extraction {'on' if args.pipelined_extraction else 'off'}")
+    for concurrency in args.levels:
+        n_entities = max(args.entities, concurrency)
+        elapsed, latencies, node_spans = await run_level(researcher=researcher, concurrency=concurrency,
+                                                         n_entities=n_entities, args=args)
+        print(f"\nconcurrency {concurrency}: {n_entities} entities in {elapsed:.2f} s, "
+              f"throughput {n_entities / elapsed:.2f} entities/s")
+        print(f"  entity latency p50 {percentile(latencies, 50):.3f} s, p95 {percentile(latencies, 95):.3f} s, "
+              f"p99 {percentile(latencies, 99):.3f} s")
+        print(f"  {'node':<16}{'runs':>6}{'wall p50 ms':>13}{'wall p95 ms':>13}{'wall p99 ms':>13}"
+              f"{'wait p50 ms':>13}{'wait p95 ms':>13}")
+        for node, spans in node_spans.items():
+            wall = [s['wall_time'] * 1000 for s in spans]
+            wait = [s['wait_time'] * 1000 for s in spans]
+            print(f"  {node:<16}{len(spans):>6}{percentile(wall, 50):>13.2f}{percentile(wall, 95):>13.2f}"
+                  f"{percentile(wall, 99):>13.2f}{percentile(wait, 50):>13.2f}{percentile(wait, 95):>13.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--entities', type=int, default=16, help='Entities per level (at least the concurrency)')
+    parser.add_argument('--llm-latency-ms', type=float, default=200)
+    parser.add_argument('--search-latency-ms', type=float, default=300)
+    parser.add_argument('--llm-ms-per-1k-tokens', type=float, default=0,
+                        help='Extra LLM latency per 1000 prompt tokens')
+    parser.add_argument('--sigma', type=float, default=0.3, help='Log-normal sigma of the latencies')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--max-tokens-per-source', type=int, default=10000)
+    parser.add_argument('--no-checkpoint', action='store_true', help='Compile the graph without a checkpointer')
+    parser.add_argument('--pipelined-extraction', action='store_true',
+                        help="Extract each query's results as they arrive (SearchPipeline node)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
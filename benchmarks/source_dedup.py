@@ -0,0 +1,66 @@
+"""
+Source string size before and after near-duplicate source elimination.
+
+Runs offline on a recorded set of search results that contains syndicated copies of the same press release and
+a mirrored page (benchmarks/fixtures/syndicated_sources.json). The source string is sent to the LLM by both
+NoteTaker and FactChecker, so every duplicated token is paid at least twice per iteration.
+
+    python benchmarks/source_dedup.py [--fixture PATH] [--threshold 0.8] [--shingle-size 5] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from ai_common import format_sources
+
+from business_researcher.components import estimate_tokens
+from business_researcher.components.dedup import deduplicate_sources
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'syndicated_sources.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixture', default=FIXTURE_PATH)
+    parser.add_argument('--max-tokens-per-source', type=int, default=10000)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--shingle-size', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.fixture) as f:
+        fixture = json.load(f)
+    unique_sources = fixture['unique_sources']
+
+    timings = []
+    kept_sources, dropped_sources = unique_sources, {}
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        kept_sources, dropped_sources = deduplicate_sources(unique_sources=unique_sources,
+                                                            threshold=args.threshold,
+                                                            shingle_size=args.shingle_size)
+        timings.append(time.perf_counter() - t0)
+
+    results = {}
+    print(f"Fixture: {args.fixture} (threshold {args.threshold}, shingle size {args.shingle_size})")
+    print(f"{'mode':<12}{'sources':>10}{'source chars':>14}{'est. tokens':>14}")
+    for name, sources in [('all', unique_sources), ('dedup', kept_sources)]:
+        source_str = format_sources(unique_sources=sources,
+                                    max_tokens_per_source=args.max_tokens_per_source,
+                                    include_raw_content=True)
+        results[name] = estimate_tokens(source_str)
+        print(f"{name:<12}{len(sources):>10}{len(source_str):>14}{results[name]:>14}")
+
+    print('Dropped sources:')
+    for url, kept_url in dropped_sources.items():
+        print(f'  {url} -> {kept_url}')
+    print(f"Dedup latency: p50 {statistics.median(timings) * 1000:.2f} ms, max {max(timings) * 1000:.2f} ms")
+    saved = results['all'] - results['dedup']
+    print(f"Source tokens saved: {saved} ({saved / results['all']:.1%}), "
+          f"{2 * saved} per iteration (NoteTaker + FactChecker)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Cold-start benchmark: package import time and time to the first compiled graph.
+
+Every repetition runs in a fresh interpreter (as a short-lived worker would) and measures
+  * `import business_researcher`,
+  * `from business_researcher import BusinessResearcher` (loads the graph stack),
+  * `BusinessResearcher(...)` construction, which builds and compiles the graph,
+and which heavy dependencies are loaded after the bare package import. No network access is needed: the
+researcher is created with placeholder API keys and never invoked.
+
+    python benchmarks/startup.py [--repeat 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ['ai_common', 'langchain_core', 'langchain_ollama', 'langgraph']
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import business_researcher
+t1 = time.perf_counter()
+loaded = [m for m in {heavy_modules!r} if m in sys.modules]
+from business_researcher import BusinessResearcher
+t2 = time.perf_counter()
+model = {{'model': 'openai/gpt-oss-20b', 'model_provider': 'groq', 'api_key': 'offline', 'max_llm_retries': 1,
+          'model_args': {{'temperature': 0}}}}
+BusinessResearcher(llm_config={{'language_model': model, 'reasoning_model': model}}, web_search_api_key='offline')
+t3 = time.perf_counter()
+print(json.dumps({{'package_import': t1 - t0, 'researcher_import': t2 - t1, 'graph_build': t3 - t2,
+                  'loaded': loaded}}))
+"""
+
+
+def run_probe() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in [SRC_DIR, env.get('PYTHONPATH')] if p)
+    out = subprocess.run([sys.executable, '-c', PROBE.format(heavy_modules=HEAVY_MODULES)],
+                         env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.repeat)]
+    print(f'{args.repeat} cold starts')
+    print(f"  {'stage':<28}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for stage in ['package_import', 'researcher_import', 'graph_build']:
+        values = [r[stage] * 1000 for r in runs]
+        print(f'  {stage:<28}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}')
+    totals = [(r['package_import'] + r['researcher_import'] + r['graph_build']) * 1000 for r in runs]
+    print(f"  {'total':<28}{statistics.median(totals):>12.1f}{min(totals):>10.1f}{max(totals):>10.1f}")
+    print(f"  heavy modules loaded by `import business_researcher`: {', '.join(runs[0]['loaded']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,53 @@
-from .researcher import BusinessResearcher
-from .enums import SearchType
-from .schema import PersonSchema, CompanySchema
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .researcher import BusinessResearcher
+    from .cache import InMemoryCache, SqliteCache
+    from .checkpoint import CheckpointRetention, SqliteCheckpointer
+    from .components.rate_limit import RateLimit, RateLimiter
+    from .cli import main
+    from .enums import SearchType
+    from .job_queue import JobRetryPolicy, SqliteJobQueue
+    from .schema import PersonSchema, CompanySchema
+    from .service import ResearchService
+    from .telemetry import NodeSpan, spans_to_jsonl, spans_to_prometheus
+    from .worker_pool import WorkerPool
+
+# Exports are imported on first access, so `import business_researcher` (and the console entry point) does not
+# load langgraph, langchain and ai_common until they are actually needed.
+_LAZY_EXPORTS = {
+    'BusinessResearcher': '.researcher',
+    'InMemoryCache': '.cache',
+    'SqliteCache': '.cache',
+    'CheckpointRetention': '.checkpoint',
+    'SqliteCheckpointer': '.checkpoint',
+    'RateLimit': '.components.rate_limit',
+    'RateLimiter': '.components.rate_limit',
+    'main': '.cli',
+    'SearchType': '.enums',
+    'JobRetryPolicy': '.job_queue',
+    'SqliteJobQueue': '.job_queue',
+    'PersonSchema': '.schema',
+    'CompanySchema': '.schema',
+    'ResearchService': '.service',
+    'NodeSpan': '.telemetry',
+    'spans_to_jsonl': '.telemetry',
+    'spans_to_prometheus': '.telemetry',
+    'WorkerPool': '.worker_pool',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
 
 
 # In alphabetical order
@@ -9,4 +56,18 @@ __all__ = [
     'SearchType',
     'PersonSchema',
     'CompanySchema',
+    'InMemoryCache',
+    'SqliteCache',
+    'CheckpointRetention',
+    'SqliteCheckpointer',
+    'RateLimit',
+    'RateLimiter',
+    'NodeSpan',
+    'ResearchService',
+    'JobRetryPolicy',
+    'SqliteJobQueue',
+    'WorkerPool',
+    'main',
+    'spans_to_jsonl',
+    'spans_to_prometheus',
 ]
@@ -0,0 +1,196 @@
+"""
+File-based batch research: stream entities from a CSV or JSONL file and append one JSONL result per entity.
+
+Input rows have the columns (CSV) or keys (JSONL) `name`, `company`, `email` and `search_type`; empty values are
+dropped. Rows are numbered from 0 in file order and the number is written to the output as `row`. The input is
+read lazily and the output is appended and flushed line by line, so a restarted job skips the rows that already
+have a successful result in the output file and retries the failed ones.
+"""
+import csv
+import itertools
+import json
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any, Optional, TextIO
+
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel
+
+from .researcher import BusinessResearcher
+
+INPUT_FIELDS = ('name', 'company', 'email', 'search_type')
+
+
+class BatchSummary(BaseModel):
+    """
+    Progress of a `BatchFileRunner` run.
+
+    Attributes:
+        completed: Rows researched successfully.
+        failed: Rows that failed (retried on the next run).
+        skipped: Rows skipped because the output already had a successful result for them.
+        cost: Total cost in USD of the rows researched successfully.
+    """
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    cost: float = 0.0
+
+
+def get_input_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    match extension:
+        case '.csv':
+            return 'csv'
+        case '.jsonl' | '.ndjson':
+            return 'jsonl'
+        case _:
+            raise ValueError(f'Cannot infer the input format of {path!r}; expected a .csv or .jsonl file')
+
+
+def read_entities(path: str, input_format: Optional[str] = None,
+                  default_search_type: Optional[str] = None) -> Iterator[tuple[int, dict[str, Any], Optional[str]]]:
+    """
+    Lazily yield (row, input_dict, error) triples from a CSV or JSONL file.
+
+    A JSONL line that is not valid JSON or not a JSON object does not stop the file: it is yielded with an empty
+    input_dict and the reason in `error` (None for every readable row).
+    """
+    input_format = input_format if input_format is not None else get_input_format(path=path)
+    with open(path, newline='' if input_format == 'csv' else None, encoding='utf-8') as f:
+        if input_format == 'csv':
+            records = ((record, None) for record in csv.DictReader(f))
+        elif input_format == 'jsonl':
+            records = (parse_json_record(line=line) for line in f if len(line.strip()) > 0)
+        else:
+            raise ValueError(f"Unknown input format {input_format!r}; expected 'csv' or 'jsonl'")
+
+        for row, (record, error) in enumerate(records):
+            if error is not None:
+                yield row, {}, error
+                continue
+            input_dict = {k: str(record[k]).strip() for k in INPUT_FIELDS
+                          if record.get(k) is not None and len(str(record[k]).strip()) > 0}
+            if 'search_type' in input_dict:
+                input_dict['search_type'] = input_dict['search_type'].lower()
+            elif default_search_type is not None:
+                input_dict['search_type'] = default_search_type
+            yield row, input_dict, None
+
+
+def parse_json_record(line: str) -> tuple[dict[str, Any], Optional[str]]:
+    """(record, None) for a JSON object line, ({}, reason) otherwise."""
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {}, f'JSONDecodeError: {e}'
+    if not isinstance(record, dict):
+        return {}, f'ValueError: Expected a JSON object, got {type(record).__name__}'
+    return record, None
+
+
+def read_completed_rows(path: str) -> set[int]:
+    """Rows with a successful result in an existing output file. Unparsable (e.g. truncated) lines are ignored."""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(result, dict) and result.get('error') is None and 'row' in result:
+                completed.add(result['row'])
+    return completed
+
+
+def open_output(path: str) -> TextIO:
+    """Open `path` for appending, terminating a line left incomplete by an interrupted run."""
+    out = open(path, 'a+', encoding='utf-8')
+    if out.tell() > 0:
+        out.seek(out.tell() - 1)
+        if out.read(1) != '\n':
+            out.write('\n')
+    return out
+
+
+class BatchFileRunner:
+    """
+    Researches every row of an input file that has no successful result in the output file yet.
+
+    Each result is appended to the output as soon as its entity finishes (so lines are in completion order) and
+    then yielded. A result line contains `row`, `input`, `content`, `token_usage`, `cost` (from `get_cost`, None
+    if the entity failed), `thread_id`, `resumes`, `is_cached` and `error`. `summary` is updated as rows finish.
+    Rows that cannot be read are not researched; they get an error line like failed rows (and are retried on the
+    next run, e.g. after the input was fixed).
+    """
+
+    def __init__(self,
+                 researcher: BusinessResearcher,
+                 get_cost: Callable[[dict[str, dict[str, int]]], float],
+                 config: RunnableConfig,
+                 concurrency: int = 8,
+                 max_resumes: int = 1):
+        self.researcher = researcher
+        self.get_cost = get_cost
+        self.concurrency = concurrency
+        self.config = config
+        self.max_resumes = max_resumes
+        self.summary = BatchSummary()
+
+    async def run(self,
+                  input_path: str,
+                  output_path: str,
+                  input_format: Optional[str] = None,
+                  default_search_type: Optional[str] = None) -> AsyncIterator[dict[str, Any]]:
+        completed_rows = read_completed_rows(path=output_path)
+        # run_batch numbers the inputs it consumes; map those numbers back to file rows
+        rows: dict[int, int] = {}
+        batch_indices = itertools.count()
+        # Unreadable rows met while run_batch pulls inputs; written out with the next result
+        unreadable: deque[dict[str, Any]] = deque()
+
+        def pending_inputs() -> Iterator[dict[str, Any]]:
+            for row, input_dict, error in read_entities(path=input_path, input_format=input_format,
+                                                        default_search_type=default_search_type):
+                if row in completed_rows:
+                    self.summary.skipped += 1
+                    continue
+                if error is not None:
+                    unreadable.append({'row': row, 'input': input_dict, 'content': None, 'token_usage': None,
+                                       'cost': None, 'thread_id': None, 'resumes': 0, 'is_cached': False,
+                                       'error': error})
+                    continue
+                rows[next(batch_indices)] = row
+                yield input_dict
+
+        def write(line: dict[str, Any]) -> dict[str, Any]:
+            out.write(json.dumps(line, default=str) + '\n')
+            out.flush()
+            if line['error'] is None:
+                self.summary.completed += 1
+                self.summary.cost += line['cost']
+            else:
+                self.summary.failed += 1
+            return line
+
+        with open_output(path=output_path) as out:
+            async for result in self.researcher.run_batch(inputs=pending_inputs(), concurrency=self.concurrency,
+                                                          config=self.config, max_resumes=self.max_resumes):
+                while len(unreadable) > 0:
+                    yield write(line=unreadable.popleft())
+                yield write(line={
+                    'row': rows.pop(result['index']),
+                    'input': result['input'],
+                    'content': result['content'],
+                    'token_usage': result['token_usage'],
+                    'cost': self.get_cost(result['token_usage']) if result['token_usage'] is not None else None,
+                    'thread_id': result['thread_id'],
+                    'resumes': result['resumes'],
+                    'is_cached': result.get('is_cached', False),
+                    'error': result['error'],
+                })
+            while len(unreadable) > 0:
+                yield write(line=unreadable.popleft())
@@ -0,0 +1,218 @@
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Deterministic SHA-256 key over JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class InMemoryCache:
+    """
+    Thread-safe in-process LRU cache with the same interface as `SqliteCache`.
+
+    Entries expire after `ttl_seconds` (None: never) and the least recently used entries are evicted beyond
+    `max_entries`. Values are deep-copied on `set` and `get`, so callers may mutate what they put in or get out
+    without changing the cached entry (as with the JSON round trip of `SqliteCache`).
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = 1024) -> None:
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError(f'ttl_seconds must be positive, got {ttl_seconds}')
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f'max_entries must be positive, got {max_entries}')
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            created_at, value = entry
+            age = now - created_at
+            if self.ttl_seconds is not None and age > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            if max_age is not None and age > max_age:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+            'size': len(self),
+        }
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteCache:
+    """
+    Persistent key-value cache backed by a local SQLite file.
+
+    Values must be JSON-serializable. Entries expire after `ttl_seconds` (None: never), and once the cache holds
+    more than `max_entries` entries the least recently used ones are evicted (None: unbounded). Several caches can
+    share one file through distinct namespaces. Hit, miss and eviction counters are kept per instance.
+    """
+
+    def __init__(self,
+                 path: str,
+                 namespace: str = 'default',
+                 ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None) -> None:
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError(f'ttl_seconds must be positive, got {ttl_seconds}')
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f'max_entries must be positive, got {max_entries}')
+
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+            'created_at REAL NOT NULL, accessed_at REAL NOT NULL, '
+            'PRIMARY KEY (namespace, key))'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (namespace, accessed_at)')
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value, or None on a miss. `max_age` (seconds) tightens the TTL for this lookup."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute('SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?',
+                                           (self.namespace, key)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            age = now - created_at
+            if (self.ttl_seconds is not None and age > self.ttl_seconds) or (max_age is not None and age > max_age):
+                if self.ttl_seconds is not None and age > self.ttl_seconds:
+                    self._connection.execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (self.namespace, key))
+                self.misses += 1
+                return None
+
+            self._connection.execute('UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                                     (now, self.namespace, key))
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO cache (namespace, key, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (self.namespace, key, json.dumps(value, default=str), now, now)
+            )
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (self.namespace, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM cache WHERE namespace = ?', (self.namespace,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM cache WHERE namespace = ?',
+                                            (self.namespace,)).fetchone()[0]
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+            'size': len(self),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self) -> None:
+        # Caller must hold the lock
+        if self.ttl_seconds is not None:
+            cursor = self._connection.execute('DELETE FROM cache WHERE namespace = ? AND created_at < ?',
+                                              (self.namespace, time.time() - self.ttl_seconds))
+            self.evictions += max(cursor.rowcount, 0)
+
+        if self.max_entries is not None:
+            size = self._connection.execute('SELECT COUNT(*) FROM cache WHERE namespace = ?',
+                                            (self.namespace,)).fetchone()[0]
+            if size > self.max_entries:
+                cursor = self._connection.execute(
+                    'DELETE FROM cache WHERE namespace = ? AND key IN '
+                    '(SELECT key FROM cache WHERE namespace = ? ORDER BY accessed_at ASC LIMIT ?)',
+                    (self.namespace, self.namespace, size - self.max_entries)
+                )
+                self.evictions += max(cursor.rowcount, 0)
+
+
+Cache = InMemoryCache | SqliteCache
@@ -0,0 +1,293 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (WRITES_IDX_MAP, BaseCheckpointSaver, ChannelVersions, Checkpoint,
+                                       CheckpointMetadata, CheckpointTuple, get_checkpoint_id, get_checkpoint_metadata)
+from pydantic import BaseModel, Field
+
+
+class CheckpointRetention(BaseModel):
+    """
+    Retention policy for the checkpoints of finished research threads.
+
+    Attributes:
+        max_threads: Keep at most this many finished threads; the oldest are dropped first (None: unbounded).
+        drop_on_success: Drop the checkpoints of a thread as soon as its graph run completes. Threads of failed
+            runs are kept (subject to the other limits) so they can be inspected or resumed.
+        ttl_seconds: Drop threads that finished more than this many seconds ago (None: no expiry).
+    """
+    max_threads: Optional[int] = Field(default=128, gt=0)
+    drop_on_success: bool = False
+    ttl_seconds: Optional[float] = Field(default=None, gt=0)
+
+
+class CheckpointManager:
+    """
+    Applies a `CheckpointRetention` policy to a checkpointer.
+
+    Threads are tracked from the moment their run finishes; threads with a run in progress are never dropped.
+    Threads already stored in a durable checkpointer (one providing `list_threads`, e.g. `SqliteCheckpointer`)
+    are picked up on first use, so the policy also covers runs of earlier processes.
+    """
+
+    def __init__(self, checkpointer: BaseCheckpointSaver, retention: CheckpointRetention):
+        self.checkpointer = checkpointer
+        self.retention = retention
+        self.finished: OrderedDict[str, float] = OrderedDict()  # thread_id -> finish time, oldest first
+        self.active: set[str] = set()
+        self.is_loaded = False
+        self.lock = threading.Lock()
+
+    def start(self, thread_id: str) -> None:
+        with self.lock:
+            self.active.add(thread_id)
+            self.finished.pop(thread_id, None)
+
+    async def finish(self, thread_id: str, is_successful: bool) -> None:
+        stored_threads = None
+        if not self.is_loaded:
+            # Off the event loop: a durable checkpointer queries its database
+            stored_threads = await asyncio.to_thread(self._list_stored_threads)
+        now = time.time()
+        with self.lock:
+            self._load(stored_threads=stored_threads)
+            self.active.discard(thread_id)
+            if is_successful and self.retention.drop_on_success:
+                expired = [thread_id]
+            else:
+                self.finished[thread_id] = now
+                expired = []
+            expired += self._pop_expired(now=now)
+
+        for expired_thread_id in expired:
+            await self.checkpointer.adelete_thread(expired_thread_id)
+
+    def _list_stored_threads(self) -> dict[str, float]:
+        list_threads = getattr(self.checkpointer, 'list_threads', None)
+        return list_threads() if list_threads is not None else {}
+
+    def _load(self, stored_threads: Optional[dict[str, float]]) -> None:
+        # Caller must hold the lock
+        if self.is_loaded or stored_threads is None:
+            return
+        self.is_loaded = True
+        for thread_id, updated_at in sorted(stored_threads.items(), key=lambda x: x[1]):
+            if thread_id not in self.active:
+                self.finished[thread_id] = updated_at
+
+    def _pop_expired(self, now: float) -> list[str]:
+        expired = []
+        if self.retention.ttl_seconds is not None:
+            while len(self.finished) > 0 and next(iter(self.finished.values())) < now - self.retention.ttl_seconds:
+                expired.append(self.finished.popitem(last=False)[0])
+        if self.retention.max_threads is not None:
+            while len(self.finished) > self.retention.max_threads:
+                expired.append(self.finished.popitem(last=False)[0])
+        return expired
+
+
+class SqliteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    Durable LangGraph checkpointer backed by a local SQLite file.
+
+    Uses the standard library `sqlite3` module behind a lock, so a single instance can be shared by `run`,
+    `run_batch` and `get_response` regardless of which event loop they run on; async methods run the queries
+    in a worker thread. `list_threads` exposes the last update time of every stored thread for
+    `CheckpointManager`.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS checkpoints ('
+            'thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, '
+            'parent_checkpoint_id TEXT, type TEXT NOT NULL, checkpoint BLOB NOT NULL, '
+            'metadata_type TEXT NOT NULL, metadata BLOB NOT NULL, created_at REAL NOT NULL, '
+            'PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))'
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS writes ('
+            'thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, '
+            'task_id TEXT NOT NULL, task_path TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, '
+            'type TEXT NOT NULL, value BLOB NOT NULL, '
+            'PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))'
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config['configurable']['thread_id'])
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if checkpoint_id is not None:
+                row = self._connection.execute(
+                    'SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata '
+                    'FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?',
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = self._connection.execute(
+                    'SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata '
+                    'FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1',
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+            if row is None:
+                return None
+            writes = self._connection.execute(
+                'SELECT task_id, channel, type, value FROM writes '
+                'WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx',
+                (thread_id, checkpoint_ns, row[0])
+            ).fetchall()
+        return self._to_tuple(thread_id=thread_id, checkpoint_ns=checkpoint_ns, row=row, writes=writes)
+
+    def list(self,
+             config: Optional[RunnableConfig],
+             *,
+             filter: Optional[dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None,
+             limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        query = ('SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, '
+                 'metadata_type, metadata FROM checkpoints')
+        conditions, params = [], []
+        if config is not None:
+            conditions.append('thread_id = ?')
+            params.append(str(config['configurable']['thread_id']))
+            if 'checkpoint_ns' in config['configurable']:
+                conditions.append('checkpoint_ns = ?')
+                params.append(config['configurable']['checkpoint_ns'])
+        if before is not None and get_checkpoint_id(before) is not None:
+            conditions.append('checkpoint_id < ?')
+            params.append(get_checkpoint_id(before))
+        if len(conditions) > 0:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY checkpoint_id DESC'
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+
+        count = 0
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and count >= limit:
+                break
+            with self._lock:
+                writes = self._connection.execute(
+                    'SELECT task_id, channel, type, value FROM writes '
+                    'WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx',
+                    (thread_id, checkpoint_ns, row[0])
+                ).fetchall()
+            checkpoint_tuple = self._to_tuple(thread_id=thread_id, checkpoint_ns=checkpoint_ns, row=row, writes=writes)
+            if filter is not None and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            count += 1
+            yield checkpoint_tuple
+
+    def put(self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = str(config['configurable']['thread_id'])
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint_type, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, '
+                'type, checkpoint, metadata_type, metadata, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (thread_id, checkpoint_ns, checkpoint['id'], config['configurable'].get('checkpoint_id'),
+                 checkpoint_type, serialized_checkpoint, metadata_type, serialized_metadata, time.time())
+            )
+        return {'configurable': {'thread_id': thread_id, 'checkpoint_ns': checkpoint_ns, 'checkpoint_id': checkpoint['id']}}
+
+    def put_writes(self,
+                   config: RunnableConfig,
+                   writes: Sequence[tuple[str, Any]],
+                   task_id: str,
+                   task_path: str = '') -> None:
+        # Special channels (errors, interrupts, ...) replace earlier writes; regular writes are only stored once
+        verb = 'INSERT OR REPLACE' if all(channel in WRITES_IDX_MAP for channel, _ in writes) else 'INSERT OR IGNORE'
+        rows = [
+            (str(config['configurable']['thread_id']), config['configurable'].get('checkpoint_ns', ''),
+             config['configurable']['checkpoint_id'], task_id, task_path, WRITES_IDX_MAP.get(channel, idx), channel,
+             *self.serde.dumps_typed(value))
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with self._lock:
+            self._connection.executemany(
+                f'{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, idx, channel, '
+                f'type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM checkpoints WHERE thread_id = ?', (str(thread_id),))
+            self._connection.execute('DELETE FROM writes WHERE thread_id = ?', (str(thread_id),))
+
+    def list_threads(self) -> dict[str, float]:
+        """Map every stored thread to the time of its last checkpoint."""
+        with self._lock:
+            rows = self._connection.execute('SELECT thread_id, MAX(created_at) FROM checkpoints GROUP BY thread_id')
+            return dict(rows.fetchall())
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self,
+                    config: Optional[RunnableConfig],
+                    *,
+                    filter: Optional[dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(self,
+                   config: RunnableConfig,
+                   checkpoint: Checkpoint,
+                   metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self,
+                          config: RunnableConfig,
+                          writes: Sequence[tuple[str, Any]],
+                          task_id: str,
+                          task_path: str = '') -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: Sequence[Any], writes: Sequence[tuple]) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint, metadata_type, metadata = row
+        return CheckpointTuple(
+            config={'configurable': {'thread_id': thread_id, 'checkpoint_ns': checkpoint_ns,
+                                     'checkpoint_id': checkpoint_id}},
+            checkpoint=self.serde.loads_typed((checkpoint_type, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=({'configurable': {'thread_id': thread_id, 'checkpoint_ns': checkpoint_ns,
+                                             'checkpoint_id': parent_checkpoint_id}}
+                           if parent_checkpoint_id is not None else None),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((value_type, value)))
+                            for task_id, channel, value_type, value in writes],
+        )
@@ -0,0 +1,272 @@
+"""
+Command line entry point (`business-researcher`).
+
+    business-researcher research "Stripe" --type company
+    business-researcher research "William Gaybrick" --type person --company Stripe
+    business-researcher batch entities.csv --output results.jsonl --concurrency 16
+    business-researcher serve --port 8080 --max-concurrency 8
+    business-researcher pool entities.csv --queue jobs.db --output results.jsonl --processes 4
+
+API keys are read from the environment: `<PROVIDER>_API_KEY` for the model provider (e.g. GROQ_API_KEY) and
+TAVILY_API_KEY for web search. Heavy dependencies are only imported once a command runs, so `--help` and argument
+errors return immediately.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Optional
+from uuid import uuid4
+
+DEFAULT_MODEL_PROVIDER = 'groq'
+DEFAULT_LANGUAGE_MODEL = 'openai/gpt-oss-20b'
+DEFAULT_REASONING_MODEL = 'openai/gpt-oss-120b'
+
+
+def get_llm_config(args: argparse.Namespace) -> dict[str, Any]:
+    from pydantic import SecretStr
+
+    api_key = SecretStr(get_env_api_key(name=f'{args.model_provider.upper()}_API_KEY'))
+    return {
+        'language_model': {
+            'model': args.language_model,
+            'model_provider': args.model_provider,
+            'api_key': api_key,
+            'max_llm_retries': args.max_llm_retries,
+            'model_args': {'temperature': 0},
+        },
+        'reasoning_model': {
+            'model': args.reasoning_model,
+            'model_provider': args.model_provider,
+            'api_key': api_key,
+            'max_llm_retries': args.max_llm_retries,
+            'model_args': {'temperature': 0},
+        },
+    }
+
+
+def get_env_api_key(name: str) -> str:
+    value = os.environ.get(name, '')
+    if len(value) == 0:
+        raise SystemExit(f'business-researcher: environment variable {name} is not set')
+    return value
+
+
+def get_run_config(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        'recursion_limit': 100,
+        'configurable': {
+            'thread_id': str(uuid4()),
+            'max_iterations': args.max_iterations,
+            'max_results_per_query': args.max_results_per_query,
+            'max_tokens_per_source': args.max_tokens_per_source,
+            'number_of_days_back': args.number_of_days_back,
+            'number_of_queries': args.number_of_queries,
+            'search_category': args.search_category,
+            'search_depth': args.search_depth,
+            'model_cascade': args.model_cascade,
+            'pipelined_extraction': args.pipelined_extraction,
+        },
+    }
+
+
+def build_researcher(args: argparse.Namespace, llm_config: dict[str, Any]):
+    from pydantic import SecretStr
+
+    from .cache import SqliteCache
+    from .researcher import BusinessResearcher
+
+    return BusinessResearcher(
+        llm_config=llm_config,
+        web_search_api_key=SecretStr(get_env_api_key(name='TAVILY_API_KEY')),
+        search_cache=SqliteCache(path=args.search_cache) if args.search_cache is not None else None,
+    )
+
+
+def add_common_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--model-provider', default=DEFAULT_MODEL_PROVIDER)
+    parser.add_argument('--language-model', default=DEFAULT_LANGUAGE_MODEL)
+    parser.add_argument('--reasoning-model', default=DEFAULT_REASONING_MODEL)
+    parser.add_argument('--max-llm-retries', type=int, default=3)
+    parser.add_argument('--max-iterations', type=int, default=5)
+    parser.add_argument('--max-results-per-query', type=int, default=5)
+    parser.add_argument('--max-tokens-per-source', type=int, default=10000)
+    parser.add_argument('--number-of-days-back', type=int, default=360)
+    parser.add_argument('--number-of-queries', type=int, default=3)
+    parser.add_argument('--search-category', default='general')
+    parser.add_argument('--search-depth', default='advanced')
+    parser.add_argument('--search-cache', default=None, help='Path of a SQLite web search cache')
+    parser.add_argument('--model-cascade', action='store_true',
+                        help='Extract and review on the language model, escalate failing fields to the reasoning model')
+    parser.add_argument('--pipelined-extraction', action='store_true',
+                        help="Start note taking on each query's results as they arrive")
+
+
+async def research(args: argparse.Namespace) -> int:
+    from ai_common import calculate_token_cost
+
+    llm_config = get_llm_config(args=args)
+    researcher = build_researcher(args=args, llm_config=llm_config)
+    input_dict = {'name': args.name, 'search_type': args.type}
+    if args.company is not None:
+        input_dict['company'] = args.company
+
+    out_dict = await researcher.run(input_dict=input_dict, config=get_run_config(args=args))
+    _, total_cost = calculate_token_cost(llm_config=llm_config, token_usage=out_dict['token_usage'])
+    print(json.dumps({'content': out_dict['content'],
+                      'token_usage': out_dict['token_usage'],
+                      'cost': total_cost}, indent=2 if args.indent else None, default=str))
+    return 0 if out_dict['content'] is not None else 1
+
+
+async def batch(args: argparse.Namespace) -> int:
+    from ai_common import calculate_token_cost
+
+    from .batch import BatchFileRunner
+
+    llm_config = get_llm_config(args=args)
+    runner = BatchFileRunner(
+        researcher=build_researcher(args=args, llm_config=llm_config),
+        get_cost=lambda token_usage: calculate_token_cost(llm_config=llm_config, token_usage=token_usage)[1],
+        concurrency=args.concurrency,
+        config=get_run_config(args=args),
+        max_resumes=args.max_resumes,
+    )
+    async for line in runner.run(input_path=args.input, output_path=args.output, input_format=args.format,
+                                 default_search_type=args.type):
+        if line['error'] is not None:
+            print(f"row {line['row']} failed: {line['error']}", file=sys.stderr)
+
+    summary = runner.summary
+    print(f'{summary.completed} completed, {summary.failed} failed, {summary.skipped} skipped '
+          f'(already in {args.output}), cost {summary.cost:.4f} USD', file=sys.stderr)
+    return 0 if summary.failed == 0 else 1
+
+
+async def serve(args: argparse.Namespace) -> int:
+    from .service import ResearchService
+
+    service = ResearchService(researcher=build_researcher(args=args, llm_config=get_llm_config(args=args)),
+                              config=get_run_config(args=args),
+                              max_concurrency=args.max_concurrency)
+    print(f'Serving on http://{args.host}:{args.port}', file=sys.stderr)
+    await service.serve(host=args.host, port=args.port)
+    return 0
+
+
+async def pool(args: argparse.Namespace) -> int:
+    import functools
+
+    from ai_common import calculate_token_cost
+
+    from .batch import open_output, read_entities
+    from .job_queue import JobRetryPolicy
+    from .worker_pool import WorkerPool
+
+    llm_config = get_llm_config(args=args)
+    get_env_api_key(name='TAVILY_API_KEY')
+    worker_pool = WorkerPool(
+        queue_path=args.queue,
+        researcher_factory=functools.partial(build_researcher, args=args, llm_config=llm_config),
+        config=get_run_config(args=args),
+        processes=args.processes,
+        concurrency=args.concurrency,
+        retry_policy=JobRetryPolicy(lease_seconds=args.lease_seconds, max_attempts=args.max_attempts),
+    )
+    if args.input is not None:
+        input_path = os.path.abspath(args.input)
+        entities = read_entities(path=args.input, input_format=args.format, default_search_type=args.type)
+        jobs = []
+        for row, input_dict, error in entities:
+            if error is not None:
+                print(f'{input_path}:{row} skipped: {error}', file=sys.stderr)
+                continue
+            jobs.append((f'{input_path}:{row}', input_dict))
+        added = worker_pool.enqueue(jobs=jobs)
+        print(f'{added} new jobs in {args.queue}', file=sys.stderr)
+
+    n_done, n_dead, total_cost = 0, 0, 0.0
+    with open_output(path=args.output) as out:
+        async for job in worker_pool.run():
+            cost = None
+            if job['token_usage'] is not None:
+                _, cost = calculate_token_cost(llm_config=llm_config, token_usage=job['token_usage'])
+                total_cost += cost
+            line = {k: job[k] for k in ('key', 'input', 'status', 'attempts', 'content', 'token_usage')}
+            out.write(json.dumps({**line, 'cost': cost, 'error': job['error']}, default=str) + '\n')
+            out.flush()
+            if job['status'] == 'done':
+                n_done += 1
+            else:
+                n_dead += 1
+                print(f"{job['key']} dead-lettered: {job['error']}", file=sys.stderr)
+
+    print(f'{n_done} done, {n_dead} dead-lettered, {worker_pool.restarts} worker restarts, '
+          f'cost {total_cost:.4f} USD', file=sys.stderr)
+    return 0 if n_dead == 0 else 1
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='business-researcher', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    research_parser = commands.add_parser('research', help='Research a single company or person')
+    research_parser.add_argument('name')
+    research_parser.add_argument('--type', choices=['company', 'person'], default='company')
+    research_parser.add_argument('--company', default=None, help='Company of the person (person research)')
+    research_parser.add_argument('--indent', action='store_true', help='Pretty-print the JSON output')
+    add_common_arguments(parser=research_parser)
+    research_parser.set_defaults(action=research)
+
+    batch_parser = commands.add_parser('batch', help='Research every entity of a CSV or JSONL file',
+                                       description='Rows need name and search_type, optionally company and email. '
+                                                   'One JSONL result per row is appended to --output; rerunning '
+                                                   'with the same output skips rows that already succeeded.')
+    batch_parser.add_argument('input', help='CSV or JSONL file of entities')
+    batch_parser.add_argument('--output', required=True, help='JSONL file the results are appended to')
+    batch_parser.add_argument('--format', choices=['csv', 'jsonl'], default=None,
+                              help='Input format (inferred from the file extension by default)')
+    batch_parser.add_argument('--type', choices=['company', 'person'], default=None,
+                              help='Search type of rows without a search_type')
+    batch_parser.add_argument('--concurrency', type=int, default=8)
+    batch_parser.add_argument('--max-resumes', type=int, default=1)
+    add_common_arguments(parser=batch_parser)
+    batch_parser.set_defaults(action=batch)
+
+    serve_parser = commands.add_parser('serve', help='Serve research requests over a local HTTP/JSON endpoint')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8080)
+    serve_parser.add_argument('--max-concurrency', type=int, default=8, help='Researches running at a time')
+    add_common_arguments(parser=serve_parser)
+    serve_parser.set_defaults(action=serve)
+
+    pool_parser = commands.add_parser('pool', help='Research a durable job queue with a pool of worker processes',
+                                      description='Rows of the input file are added to a SQLite job queue (rows '
+                                                  'already queued are skipped) and researched by worker processes. '
+                                                  'Finished jobs are appended to --output as JSON lines. Rerun '
+                                                  'without an input to finish an interrupted queue.')
+    pool_parser.add_argument('input', nargs='?', default=None, help='CSV or JSONL file of entities to enqueue')
+    pool_parser.add_argument('--queue', required=True, help='SQLite job queue file')
+    pool_parser.add_argument('--output', required=True, help='JSONL file the results are appended to')
+    pool_parser.add_argument('--format', choices=['csv', 'jsonl'], default=None,
+                             help='Input format (inferred from the file extension by default)')
+    pool_parser.add_argument('--type', choices=['company', 'person'], default=None,
+                             help='Search type of rows without a search_type')
+    pool_parser.add_argument('--processes', type=int, default=None, help='Worker processes (default: CPU count)')
+    pool_parser.add_argument('--concurrency', type=int, default=4, help='Researches per worker process')
+    pool_parser.add_argument('--lease-seconds', type=float, default=300)
+    pool_parser.add_argument('--max-attempts', type=int, default=3)
+    add_common_arguments(parser=pool_parser)
+    pool_parser.set_defaults(action=pool)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = get_parser().parse_args(argv)
+    return asyncio.run(args.action(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,35 +5,73 @@ This package contains the core components for the business research system,
 including query generation, information extraction, and content review functionality.
 
 Main Components:
+    - ArtifactCache: Memoizes schemas, dynamic models and structured-output runnables
+    - Budget: Per-run token and cost budget
+    - Escalator: Re-extracts fields that failed fact checking on the reasoning model (model cascade)
     - QueryWriter: Generates targeted web search queries
+    - RateLimiter: Provider-aware token buckets and adaptive concurrency for LLM and search calls
     - LinkedinFinder: Analyzes and filters LinkedIn URLs
     - NoteTaker: Extracts structured information from sources
     - NoteReviewer: Reviews extracted information quality
     - ReviewOutput: Output model for review results
+    - SearchPipeline: Overlaps web search and note taking, extracting each query's results as they arrive
+    - WebSearch: Web search node with an optional persistent result cache
 
 Utility Functions:
+    - deduplicate_sources: Drops near-duplicate sources (MinHash over word shingles)
+    - estimate_tokens: Rough token estimate of a prompt
     - generate_info_str: Creates formatted information strings
     - generate_schema_str: Creates formatted schema strings
+    - get_filled_fields: Returns the schema fields that hold actual information
     - get_schema: Retrieves extraction schema from state
+    - get_search_mode: Routes to the search pipeline when pipelined extraction is enabled
+    - get_token_delta: Computes per-model token usage since an earlier snapshot
+    - get_result_key: Creates the normalized entity key used by the result store
     - is_review_successful: Checks if review criteria are met
+    - needs_escalation: Routes failed fields to the Escalator when the model cascade is enabled
+    - select_tier: Picks the language- or reasoning-model variant of a node per run
 """
 
+from .artifacts import ArtifactCache
+from .budget import Budget, BudgetExceededError
+from .dedup import deduplicate_sources
+from .escalator import Escalator, select_tier
 from .fact_checker import FactChecker
 from .linkedin_finder import LinkedinFinder
 from .note_reviewer import NoteReviewer
 from .note_taker import NoteTaker
 from .query_writer import QueryWriter
-from .routing import is_review_successful
-from .utils import generate_info_str, generate_schema_str, get_schema
+from .rate_limit import RateLimit, RateLimiter
+from .search_pipeline import SearchPipeline
+from .routing import get_search_mode, is_review_successful, needs_escalation
+from .utils import (estimate_tokens, generate_info_str, generate_schema_str, get_filled_fields, get_result_key,
+                    get_schema, get_token_delta)
+from .web_search import WebSearch
 
 __all__ = [
+    "ArtifactCache",
+    "Budget",
+    "BudgetExceededError",
+    "Escalator",
     "FactChecker",
     "LinkedinFinder",
     "NoteReviewer",
     "NoteTaker",
     "QueryWriter",
+    "RateLimit",
+    "RateLimiter",
+    "SearchPipeline",
+    "WebSearch",
+    "deduplicate_sources",
     "is_review_successful",
+    "needs_escalation",
+    "select_tier",
+    "estimate_tokens",
     "generate_info_str",
     "generate_schema_str", 
+    "get_filled_fields",
+    "get_result_key",
     "get_schema",
+    "get_search_mode",
+    "get_token_delta",
 ]
\ No newline at end of file
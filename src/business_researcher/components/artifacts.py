@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class ArtifactCache:
+    """
+    Builds artifacts that only depend on the search type and a subset of schema fields once.
+
+    Used for JSON schemas, dynamically created pydantic models and structured-output runnables, which are
+    otherwise rebuilt on every node invocation. Entries are keyed by (kind, search_type, frozenset(fields)) and
+    the least recently used ones are evicted beyond `max_entries`. Hits and misses are counted per kind.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+        self._artifacts: OrderedDict[tuple, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, search_type: str, fields: Optional[Iterable[str]], build: Callable[[], T]) -> T:
+        key = (kind, search_type, frozenset(fields) if fields is not None else None)
+        with self._lock:
+            if key in self._artifacts:
+                self._artifacts.move_to_end(key)
+                self.hits[kind] = self.hits.get(kind, 0) + 1
+                return self._artifacts[key]
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+
+        # Built outside the lock; concurrent misses may build twice, the last one wins
+        artifact = build()
+        with self._lock:
+            self._artifacts[key] = artifact
+            self._artifacts.move_to_end(key)
+            while len(self._artifacts) > self.max_entries:
+                self._artifacts.popitem(last=False)
+        return artifact
+
+    def __len__(self) -> int:
+        return len(self._artifacts)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        out = {}
+        for kind in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits.get(kind, 0), self.misses.get(kind, 0)
+            out[kind] = {'hits': hits, 'misses': misses, 'hit_rate': hits / (hits + misses)}
+        return out
+
+
+schema_artifacts = ArtifactCache()
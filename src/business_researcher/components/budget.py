@@ -0,0 +1,64 @@
+from typing import Any
+
+from ai_common import calculate_token_cost
+from ..configuration import Configuration
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised instead of making an LLM call whose estimated prompt would overflow the run budget."""
+
+
+class Budget:
+    """
+    Per-run token and cost budget.
+
+    Limits come from the `max_input_tokens_per_run`, `max_output_tokens_per_run` and `max_cost_usd_per_run`
+    configuration fields (None: unlimited). Costs are computed from `llm_config` with `calculate_token_cost`.
+    Nodes skip the calls whose estimated prompt would overflow the budget, and the graph then ends with the
+    'budget' outcome (`is_budget_exhausted` in the output).
+    """
+
+    def __init__(self, llm_config: dict[str, Any]):
+        self.llm_config = llm_config
+
+    @staticmethod
+    def is_limited(configurable: Configuration) -> bool:
+        return any(x is not None for x in (configurable.max_input_tokens_per_run,
+                                           configurable.max_output_tokens_per_run,
+                                           configurable.max_cost_usd_per_run))
+
+    def get_cost(self, token_usage: dict[str, dict[str, int]]) -> float:
+        _, total_cost = calculate_token_cost(llm_config=self.llm_config, token_usage=token_usage)
+        return total_cost
+
+    def is_exhausted(self, token_usage: dict[str, dict[str, int]], configurable: Configuration) -> bool:
+        return not self.allows(token_usage=token_usage, configurable=configurable, model_name=None, input_tokens=0)
+
+    def allows(self,
+               token_usage: dict[str, dict[str, int]],
+               configurable: Configuration,
+               model_name: str | None,
+               input_tokens: int) -> bool:
+        """Whether a call to `model_name` with a prompt of about `input_tokens` tokens fits in the remaining budget."""
+        if not self.is_limited(configurable=configurable):
+            return True
+
+        projected = {m: dict(u) for m, u in token_usage.items()}
+        if model_name is not None:
+            projected.setdefault(model_name, {'input_tokens': 0, 'output_tokens': 0})
+            projected[model_name]['input_tokens'] += input_tokens
+        total_input_tokens = sum(u['input_tokens'] for u in projected.values())
+        total_output_tokens = sum(u['output_tokens'] for u in projected.values())
+
+        if configurable.max_input_tokens_per_run is not None:
+            limit = configurable.max_input_tokens_per_run
+            if total_input_tokens > limit or (input_tokens == 0 and total_input_tokens >= limit):
+                return False
+        if configurable.max_output_tokens_per_run is not None:
+            if total_output_tokens >= configurable.max_output_tokens_per_run:
+                return False
+        if configurable.max_cost_usd_per_run is not None:
+            cost = self.get_cost(token_usage=projected)
+            if cost > configurable.max_cost_usd_per_run or (input_tokens == 0 and cost >= configurable.max_cost_usd_per_run):
+                return False
+        return True
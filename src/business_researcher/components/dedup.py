@@ -0,0 +1,66 @@
+import hashlib
+import heapq
+import re
+from typing import Any
+
+WORD_PATTERN = re.compile(r'\w+', flags=re.UNICODE)
+
+
+def get_source_text(source: dict[str, Any]) -> str:
+    text = source.get('content') or ''
+    if source.get('raw_content'):
+        text += '\n' + source['raw_content']
+    return text
+
+
+def shingle(text: str, shingle_size: int) -> set[int]:
+    """Hashed word n-grams of the lower-cased text."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        grams = [' '.join(words)] if len(words) > 0 else []
+    else:
+        grams = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=4).digest(), 'little') for g in grams}
+
+
+def minhash_signature(shingles: set[int], num_hashes: int) -> frozenset[int]:
+    """Bottom-k MinHash sketch: the `num_hashes` smallest shingle hashes."""
+    return frozenset(heapq.nsmallest(num_hashes, shingles))
+
+
+def estimate_similarity(signature_1: frozenset[int], signature_2: frozenset[int], num_hashes: int) -> float:
+    """Estimate the Jaccard similarity of two shingle sets from their bottom-k sketches."""
+    union = heapq.nsmallest(num_hashes, signature_1 | signature_2)
+    if len(union) == 0:
+        return 1.0
+    return sum(1 for x in union if x in signature_1 and x in signature_2) / len(union)
+
+
+def deduplicate_sources(unique_sources: dict[str, Any],
+                        threshold: float,
+                        shingle_size: int = 5,
+                        num_hashes: int = 128) -> tuple[dict[str, Any], dict[str, str]]:
+    """
+    Drop sources whose content is a near-duplicate of an earlier source.
+
+    Sources are visited in order, so the higher ranked copy is kept. Two sources are near-duplicates when the
+    estimated Jaccard similarity of their word shingles is at least `threshold`.
+
+    Returns:
+        (kept_sources, dropped): The remaining sources, and a map from each dropped URL to the URL it duplicates.
+    """
+    kept_sources, dropped = {}, {}
+    kept_signatures: list[tuple[str, frozenset[int]]] = []
+
+    for key, source in unique_sources.items():
+        signature = minhash_signature(shingles=shingle(text=get_source_text(source), shingle_size=shingle_size),
+                                      num_hashes=num_hashes)
+        duplicate_of = next((k for k, s in kept_signatures
+                             if estimate_similarity(signature, s, num_hashes=num_hashes) >= threshold), None)
+        if duplicate_of is None:
+            kept_sources[key] = source
+            kept_signatures.append((key, signature))
+        else:
+            dropped[source.get('url', key)] = kept_sources[duplicate_of].get('url', duplicate_of)
+
+    return kept_sources, dropped
@@ -0,0 +1,64 @@
+from collections.abc import Awaitable, Callable
+from typing import Final
+
+from langchain_core.runnables import RunnableConfig
+
+from ai_common import get_config_from_runnable
+from .budget import BudgetExceededError
+from .fact_checker import FactChecker
+from .note_taker import NoteTaker
+from ..enums import Node
+from ..state import SearchState
+
+NodeAction = Callable[[SearchState, RunnableConfig], Awaitable[SearchState]]
+
+
+def select_tier(language_model_action: NodeAction,
+                reasoning_model_action: NodeAction,
+                configuration_module_prefix: str) -> NodeAction:
+    """Node action that runs on the language model with `model_cascade` enabled, on the reasoning model otherwise."""
+
+    async def action(state: SearchState, config: RunnableConfig) -> SearchState:
+        configurable = get_config_from_runnable(configuration_module_prefix=configuration_module_prefix,
+                                                config=config)
+        if configurable.model_cascade:
+            return await language_model_action(state, config)
+        return await reasoning_model_action(state, config)
+
+    return action
+
+
+class Escalator:
+    """
+    Second tier of the model cascade (`model_cascade`).
+
+    Note taking and review run on the language model; the fields that fail fact checking afterwards (including
+    those that came back 'Not Available') are re-extracted from the current sources with the reasoning-model
+    `note_taker` and fact-checked again. Fields that still fail stay missing for the reviewer.
+    """
+
+    def __init__(self, note_taker: NoteTaker, fact_checker: FactChecker, configuration_module_prefix: str):
+        self.note_taker = note_taker
+        self.fact_checker = fact_checker
+        self.configuration_module_prefix: Final = configuration_module_prefix
+
+    async def arun(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        configurable = get_config_from_runnable(
+            configuration_module_prefix=self.configuration_module_prefix,
+            config=config
+        )
+        fields = state.escalation_fields
+        state.escalation_fields = []
+        if state.is_budget_exhausted or state.notes is None or len(fields) == 0:
+            return state
+
+        state.steps.append(Node.ESCALATOR)
+        try:
+            await self.note_taker.extract_fields(state=state, fields=fields, sources=state.unique_sources,
+                                                 configurable=configurable)
+        except BudgetExceededError:
+            state.is_budget_exhausted = True
+            return state
+
+        await self.fact_checker.check_fields(state=state, fields=fields, configurable=configurable)
+        return state
@@ -1,12 +1,20 @@
+import asyncio
 import datetime
 import json
-from typing import Any, Final, List
+from typing import Any, Final, List, Optional
 
-from langchain_core.callbacks import get_usage_metadata_callback
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field, create_model
-from ai_common import get_llm, get_model_name_alias
-
-from .utils import get_schema
+from ai_common import get_config_from_runnable, get_llm, get_model_name_alias
+
+from .artifacts import ArtifactCache
+from .budget import Budget, BudgetExceededError
+from .llm_call import ainvoke_llm
+from .rate_limit import RateLimiter
+from .retrieval import ChunkIndex
+from .utils import get_schema, is_missing_value
+from ..cache import Cache
+from ..configuration import Configuration
 from ..enums import Node
 from ..state import SearchState
 
@@ -63,7 +71,21 @@ class AtomicFactfulness(BaseModel):
 
 
 class FactChecker:
-    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str):
+    """
+    Checks the extracted notes against the sources and marks the values that are not supported as missing.
+
+    With `fact_check_retrieval`, the sources are split into chunks (`fact_check_chunk_size` words overlapping by
+    `fact_check_chunk_overlap`) in an in-process BM25 index, and every field is checked only against its
+    `fact_check_top_k` best matching chunks instead of all sources.
+
+    With `fact_check_shard_size`, the checked fields are split into shards that are verified concurrently (up to
+    `fact_check_max_concurrency` calls at a time). Each shard resends its sources, so combine sharding with
+    `fact_check_retrieval` to keep input tokens in check.
+    """
+
+    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str,
+                 llm_cache: Optional[Cache] = None, budget: Optional[Budget] = None,
+                 rate_limiter: Optional[RateLimiter] = None, tier: str = 'reasoning_model'):
         self.model_name = model_params['model']
         self.model_name_alias = get_model_name_alias(model_name=self.model_name,
                                                      model_provider=model_params['model_provider'])
@@ -73,46 +95,131 @@ class FactChecker:
                                 api_key=model_params['api_key'],
                                 model_args=model_params['model_args'])
         self.model_params = model_params
+        self.llm_cache = llm_cache
+        self.budget = budget
+        self.rate_limiter = rate_limiter
+        self.tier = tier
+        self.artifacts = ArtifactCache()
+
+    def run(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        """
+        Synchronous wrapper around `arun`.
+
+        Must not be called from a thread that is already running an event loop; graph execution uses `arun`.
+        """
+        return asyncio.run(self.arun(state=state, config=config))
+
+    async def arun(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        configurable = get_config_from_runnable(
+            configuration_module_prefix=self.configuration_module_prefix,
+            config=config
+        )
+        if state.is_budget_exhausted or state.notes is None:
+            return state
 
-    def run(self, state: SearchState) -> SearchState:
         state.steps.append(Node.FACT_CHECKER)
-        json_schema_base = get_schema(state=state)
+        verdicts = await self.check_fields(state=state,
+                                           fields=None if state.iteration == 0 else state.search_focus,
+                                           configurable=configurable)
+        if configurable.model_cascade:
+            # Fields that failed the check or were not found at all
+            state.escalation_fields = [k for k, v in verdicts.items()
+                                       if v.is_fact is False or is_missing_value(getattr(state.notes, k))]
+        return state
+
+    async def check_fields(self,
+                           state: SearchState,
+                           fields: Optional[list[str]],
+                           configurable: Configuration) -> dict[str, AtomicFactfulness]:
+        """
+        Fact-check `fields` of `state.notes` (all schema fields if None) and mark the ones that are not facts as
+        missing. Returns the verdict of every checked field.
+        """
+        json_schema = get_schema(state=state, fields=fields)['properties']
+        all_notes = state.notes.model_dump()  # notes will be dict
+        notes = {k: all_notes[k] for k in json_schema.keys()}
+
+        fields = list(json_schema.keys())
+        shard_size = configurable.fact_check_shard_size if configurable.fact_check_shard_size > 0 else max(len(fields), 1)
+        shards = [fields[i:i + shard_size] for i in range(0, len(fields), shard_size)]
+        semaphore = asyncio.Semaphore(configurable.fact_check_max_concurrency)
+        # Chunked and indexed once, every shard queries the same index
+        chunk_index = ChunkIndex(unique_sources=state.unique_sources,
+                                 chunk_size=configurable.fact_check_chunk_size,
+                                 chunk_overlap=configurable.fact_check_chunk_overlap
+                                 ) if configurable.fact_check_retrieval else None
+
+        async def check_shard(shard: list[str]) -> dict[str, AtomicFactfulness]:
+            async with semaphore:
+                try:
+                    return await self._check(state=state,
+                                             notes={k: notes[k] for k in shard},
+                                             json_schema={k: json_schema[k] for k in shard},
+                                             configurable=configurable,
+                                             chunk_index=chunk_index)
+                except BudgetExceededError:
+                    # Fields of this shard stay unchecked
+                    state.is_budget_exhausted = True
+                    return {}
+
+        verdicts = {}
+        for shard_verdicts in await asyncio.gather(*[check_shard(shard) for shard in shards]):
+            verdicts.update(shard_verdicts)
+
+        for k in verdicts.keys():
+            if verdicts[k].is_fact is False:
+                match notes[k]:
+                    case str():
+                        setattr(state.notes, k, 'Not Available')
+                    case list():
+                        setattr(state.notes, k, [])
+
+        return verdicts
+
+    async def _check(self,
+                     state: SearchState,
+                     notes: dict[str, Any],
+                     json_schema: dict[str, Any],
+                     configurable: Configuration,
+                     chunk_index: Optional[ChunkIndex] = None) -> dict[str, AtomicFactfulness]:
+        fields = list(json_schema.keys())
+        FactfulnessModel = self.artifacts.get(
+            kind='factfulness_model', search_type=state.search_type, fields=fields,
+            build=lambda: create_model('FactfulnessModel', **{x: AtomicFactfulness for x in fields})
+        )
+        factfulness_schema = self.artifacts.get(kind='factfulness_schema', search_type=state.search_type,
+                                                fields=fields, build=FactfulnessModel.model_json_schema)
+        structured_llm = self.artifacts.get(
+            kind='structured_llm', search_type=state.search_type, fields=fields,
+            build=lambda: self.base_llm.with_structured_output(
+                schema=FactfulnessModel,
+                include_raw=True,
+            ).with_retry(
+                stop_after_attempt=self.model_params['max_llm_retries']
+            )
+        )
 
-        if state.iteration == 0:
-            notes = state.notes.model_dump() # notes will be dict
-            json_schema = json_schema_base['properties']
+        if chunk_index is not None:
+            content = chunk_index.retrieve(notes=notes, json_schema=json_schema, top_k=configurable.fact_check_top_k)
         else:
-            notes = {key: getattr(state.notes, key) for key in state.search_focus}
-            json_schema = {key: json_schema_base['properties'][key] for key in state.search_focus}
-
-        FactfulnessModel = create_model('FactfulnessModel', **{x: AtomicFactfulness for x in json_schema.keys()})
+            content = state.source_str
 
         instructions = FACT_CHECK_INSTRUCTIONS.format(search_type=state.search_type,
                                                       info=state.topic,
                                                       notes=json.dumps(notes, indent=2),
-                                                      content=state.source_str,
+                                                      content=content,
                                                       today=datetime.date.today().isoformat(),
-                                                      schema=FactfulnessModel.model_json_schema())
-
-        structured_llm = self.base_llm.with_structured_output(
-            schema=FactfulnessModel,
-            include_raw=True,
-        ).with_retry(
-            stop_after_attempt=self.model_params['max_llm_retries']
-        )
-
-        with get_usage_metadata_callback() as cb:
-            out_dict = structured_llm.invoke(instructions)
-            fact_check = out_dict['parsed']
-            for k in notes.keys():
-                if getattr(fact_check, k).is_fact is False:
-                    match notes[k]:
-                        case str():
-                            setattr(state.notes, k, 'Not Available')
-                        case list():
-                            setattr(state.notes, k, [])
-
-            state.token_usage[self.model_name]['input_tokens'] += cb.usage_metadata[self.model_name_alias]['input_tokens']
-            state.token_usage[self.model_name]['output_tokens'] += cb.usage_metadata[self.model_name_alias]['output_tokens']
-
-        return state
\ No newline at end of file
+                                                      schema=factfulness_schema)
+
+        fact_check = await ainvoke_llm(llm=structured_llm,
+                                       instructions=instructions,
+                                       state=state,
+                                       model_params=self.model_params,
+                                       model_name_alias=self.model_name_alias,
+                                       schema=FactfulnessModel,
+                                       cache=self.llm_cache,
+                                       budget=self.budget,
+                                       rate_limiter=self.rate_limiter,
+                                       tier=self.tier,
+                                       configurable=configurable)
+        return {k: getattr(fact_check, k) for k in json_schema.keys()}
@@ -1,7 +1,14 @@
-from ai_common import format_sources
+import asyncio
+import functools
+from typing import Any, Final, Optional
+
+from ai_common import format_sources, get_config_from_runnable
 from langchain_core.output_parsers import JsonOutputParser
-from langchain_ollama import ChatOllama
+from langchain_core.runnables import Runnable, RunnableConfig
 
+from .utils import get_result_key
+from ..cache import Cache, InMemoryCache, make_cache_key
+from ..configuration import Configuration
 from ..enums import Node, SearchType
 from ..state import SearchState
 
@@ -70,43 +77,108 @@ LINKEDIN_FIND_INSTRUCTIONS = {
 }
 
 
+def is_linkedin_candidate(url: str, search_type: str) -> bool:
+    return (
+            ((search_type == SearchType.PERSON) and ('linkedin.com/in/' in url)) or
+            ((search_type == SearchType.COMPANY) and ('linkedin.com/company/' in url))
+    )
+
+
 class LinkedinFinder:
-    def __init__(self, model_name: str, context_window_length: int, ollama_url: str):
+    """
+    Verifies that the LinkedIn pages among the search results belong to the researched entity.
+
+    Candidate URLs are checked concurrently (at most `linkedin_max_concurrency` at a time) with a local Ollama
+    model. Verdicts are cached per (entity, URL, model), so later iterations and later runs for the same entity
+    do not ask again; pass a `SqliteCache` to keep them across processes.
+
+    The Ollama client (`langchain_ollama`) is imported and created on the first verification, so constructing the
+    finder, or a researcher that has one, does not load it.
+
+    As a graph stage (enabled with `linkedin_verification`), LinkedIn pages that do not belong to the entity are
+    removed from the sources before note taking; all other sources are kept.
+    """
+
+    def __init__(self,
+                 model_name: str,
+                 context_window_length: int,
+                 ollama_url: str,
+                 configuration_module_prefix: str,
+                 verdict_cache: Optional[Cache] = None):
         self.model_name = model_name
-        self.linkedin_llm = ChatOllama(
-            model=model_name,
+        self.context_window_length = context_window_length
+        self.ollama_url = ollama_url
+        self.configuration_module_prefix: Final = configuration_module_prefix
+        self.verdict_cache = verdict_cache if verdict_cache is not None else InMemoryCache(max_entries=10_000)
+
+    @functools.cached_property
+    def linkedin_llm(self) -> Runnable:
+        from langchain_ollama import ChatOllama
+
+        return ChatOllama(
+            model=self.model_name,
             temperature=0,
-            base_url=ollama_url,
+            base_url=self.ollama_url,
             format='json',
-            num_ctx=context_window_length,
+            num_ctx=self.context_window_length,
         ) | JsonOutputParser()
 
-    def run(self, state: SearchState) -> SearchState:
+    def run(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        """
+        Synchronous wrapper around `arun`.
+
+        Must not be called from a thread that is already running an event loop; graph execution uses `arun`.
+        """
+        return asyncio.run(self.arun(state=state, config=config))
+
+    async def arun(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        configurable = get_config_from_runnable(
+            configuration_module_prefix=self.configuration_module_prefix,
+            config=config
+        )
+        if not configurable.linkedin_verification:
+            return state
+
         state.steps.append(Node.LINKEDIN_FINDER)
-        linkedin_instructions_template = LINKEDIN_FIND_INSTRUCTIONS[state.search_type]
-
-        unique_sources = {}
-        for key, value in state.unique_sources.items():
-            url = value['url']
-
-            if (
-                    ((state.search_type == SearchType.PERSON) and ('linkedin.com/in/' in url)) or
-                    ((state.search_type == SearchType.COMPANY) and ('linkedin.com/company/' in url))
-            ):
-                content = value['content']
-                raw_content = value['raw_content'] if value['raw_content'] is not None else ''
-                content += raw_content
-                instructions = linkedin_instructions_template.format(info=state.topic, url=url, url_content=content)
-                results = self.linkedin_llm.invoke(instructions)
-
-                if results['result'] == 'YES':
-                    unique_sources[url] = {'url': url,
-                                           'content': content,
-                                           'raw_content': raw_content,
-                                           'title': value['title']}
-
-
-        source_str = format_sources(unique_sources=unique_sources, max_tokens_per_source=5000, include_raw_content=True)
-        state.unique_sources = unique_sources
-        state.source_str = source_str
+        unique_sources = await self.filter_sources(state=state, sources=state.unique_sources, configurable=configurable)
+        if len(unique_sources) < len(state.unique_sources):
+            state.unique_sources = unique_sources
+            state.source_str = format_sources(unique_sources=state.unique_sources,
+                                              max_tokens_per_source=configurable.max_tokens_per_source,
+                                              include_raw_content=True)
         return state
+
+    async def filter_sources(self,
+                             state: SearchState,
+                             sources: dict[str, Any],
+                             configurable: Configuration) -> dict[str, Any]:
+        """`sources` without the LinkedIn pages that do not belong to the entity of `state`."""
+        candidates = {k: v for k, v in sources.items() if is_linkedin_candidate(url=v['url'],
+                                                                                search_type=state.search_type)}
+        if len(candidates) == 0:
+            return sources
+
+        entity_key = get_result_key(state=state)
+        semaphore = asyncio.Semaphore(configurable.linkedin_max_concurrency)
+
+        async def verify(source: dict[str, Any]) -> bool:
+            key = make_cache_key('linkedin', self.model_name, entity_key, source['url'])
+            # Off the event loop: a SqliteCache does disk I/O
+            verdict = await asyncio.to_thread(self.verdict_cache.get, key=key)
+            if verdict is None:
+                async with semaphore:
+                    verdict = await self._verify(state=state, source=source)
+                await asyncio.to_thread(self.verdict_cache.set, key=key, value=verdict)
+            return verdict
+
+        verdicts = await asyncio.gather(*[verify(source) for source in candidates.values()])
+        rejected = {k for k, is_verified in zip(candidates.keys(), verdicts) if not is_verified}
+        return {k: v for k, v in sources.items() if k not in rejected}
+
+    async def _verify(self, state: SearchState, source: dict[str, Any]) -> bool:
+        content = source['content'] + (source['raw_content'] if source.get('raw_content') is not None else '')
+        instructions = LINKEDIN_FIND_INSTRUCTIONS[state.search_type].format(info=state.topic,
+                                                                             url=source['url'],
+                                                                             url_content=content)
+        results = await self.linkedin_llm.ainvoke(instructions)
+        return results.get('result') == 'YES'
@@ -0,0 +1,140 @@
+import asyncio
+import contextlib
+import time
+from typing import Any, Optional
+
+from langchain_core.callbacks import get_usage_metadata_callback
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from .artifacts import schema_artifacts
+from .budget import Budget, BudgetExceededError
+from .rate_limit import RateLimiter, RateLimitObserver
+from .utils import estimate_tokens
+from ..cache import Cache, make_cache_key
+from ..configuration import Configuration
+from ..state import SearchState
+from ..telemetry import RetryCounter, current_span
+
+
+def get_llm_cache_key(model_params: dict[str, Any],
+                      instructions: str,
+                      json_schema: Optional[dict[str, Any]] = None,
+                      **kwargs) -> str:
+    return make_cache_key(
+        model_params['model'],
+        model_params['model_provider'],
+        model_params.get('model_args'),
+        instructions,
+        json_schema,
+        kwargs,
+    )
+
+
+async def ainvoke_llm(llm: Runnable,
+                      instructions: str,
+                      state: SearchState,
+                      model_params: dict[str, Any],
+                      model_name_alias: str,
+                      schema: Optional[type[BaseModel]] = None,
+                      cache: Optional[Cache] = None,
+                      budget: Optional[Budget] = None,
+                      configurable: Optional[Configuration] = None,
+                      rate_limiter: Optional[RateLimiter] = None,
+                      tier: Optional[str] = None,
+                      **kwargs) -> Any:
+    """
+    Invoke an LLM asynchronously and account for its token usage in the state.
+
+    Args:
+        llm: Either a chat model (schema is None) or a structured-output runnable built with
+            `include_raw=True` for `schema`.
+        instructions: Rendered prompt.
+        state: Search state whose `token_usage` is updated.
+        model_params: Parameters of the model behind `llm` ('model', 'model_provider', 'model_args', ...).
+        model_name_alias: Name under which the provider reports usage metadata.
+        schema: Structured output schema, if any.
+        cache: Optional exact-match response cache keyed on (model, model_args, prompt, schema, kwargs).
+        budget: Optional run budget, checked against the limits in `configurable` before calling the provider.
+        configurable: Run configuration; required when `budget` is given.
+        rate_limiter: Optional limiter registry. If it limits the (model_provider, model) pair, the call waits for
+            a concurrency slot and for the estimated prompt tokens, is charged the reported tokens afterwards, and
+            rate limit errors of its attempts shrink the limiter's concurrency and delay the retries.
+        tier: Model tier of the call ('language_model' or 'reasoning_model'); counted in `state.tier_stats`.
+        **kwargs: Extra arguments forwarded to `llm.ainvoke`.
+
+    Returns:
+        The parsed `schema` instance for structured calls, otherwise the message content.
+
+    On a cache hit no call is made; the cached token counts are added to `state.saved_token_usage`
+    instead of `state.token_usage`. Calls, cache hits, retries and prompt size are recorded on the span of the
+    running graph node, if any.
+
+    Raises:
+        BudgetExceededError: If the estimated prompt would overflow the run budget. No call is made.
+    """
+    model_name = model_params['model']
+    cache_key = None
+    span = current_span.get()
+
+    if cache is not None:
+        json_schema = schema_artifacts.get(kind=f'json_schema:{schema.__name__}', search_type=state.search_type,
+                                           fields=schema.model_fields, build=schema.model_json_schema
+                                           ) if schema is not None else None
+        cache_key = get_llm_cache_key(model_params=model_params, instructions=instructions, json_schema=json_schema,
+                                      **kwargs)
+        # Off the event loop: a SqliteCache does disk I/O
+        cached = await asyncio.to_thread(cache.get, key=cache_key)
+        if cached is not None:
+            if span is not None:
+                span.cache_hits += 1
+            saved = state.saved_token_usage.setdefault(model_name, {'input_tokens': 0, 'output_tokens': 0})
+            saved['input_tokens'] += cached['input_tokens']
+            saved['output_tokens'] += cached['output_tokens']
+            return schema.model_validate(cached['output']) if schema is not None else cached['output']
+
+    if budget is not None and not budget.allows(token_usage=state.token_usage,
+                                                configurable=configurable,
+                                                model_name=model_name,
+                                                input_tokens=estimate_tokens(instructions)):
+        raise BudgetExceededError(f'Run budget exhausted, skipping {model_name} call')
+
+    callbacks = []
+    if span is not None:
+        span.llm_calls += 1
+        span.prompt_chars += len(instructions)
+        callbacks.append(RetryCounter(span=span))
+
+    limit = contextlib.nullcontext()
+    limiter = rate_limiter.get(model_provider=model_params['model_provider'],
+                               model=model_name) if rate_limiter is not None else None
+    if limiter is not None:
+        limit = limiter.limit(estimated_tokens=estimate_tokens(instructions))
+        callbacks.append(RateLimitObserver(limiter=limiter))
+
+    async with limit as permit:
+        with get_usage_metadata_callback() as cb:
+            t0 = time.perf_counter()
+            result = await llm.ainvoke(instructions, config={'callbacks': callbacks}, **kwargs)
+            latency = time.perf_counter() - t0
+            input_tokens = cb.usage_metadata[model_name_alias]['input_tokens']
+            output_tokens = cb.usage_metadata[model_name_alias]['output_tokens']
+        if permit is not None:
+            permit.reconcile(tokens=input_tokens + output_tokens)
+
+    if tier is not None:
+        tier_stats = state.tier_stats.setdefault(tier, {'llm_calls': 0, 'latency': 0.0})
+        tier_stats['llm_calls'] += 1
+        tier_stats['latency'] += latency
+    state.token_usage[model_name]['input_tokens'] += input_tokens
+    state.token_usage[model_name]['output_tokens'] += output_tokens
+    output = result['parsed'] if schema is not None else result.content
+
+    if cache is not None and output is not None:
+        await asyncio.to_thread(cache.set, key=cache_key, value={
+            'output': output.model_dump(mode='json') if schema is not None else output,
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+        })
+
+    return output
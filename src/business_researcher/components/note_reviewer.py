@@ -1,14 +1,20 @@
+import asyncio
 import copy
 import json
-from typing import Any, Final
+import re
+from typing import Any, Final, Optional
 import datetime
 
-from langchain_core.callbacks import get_usage_metadata_callback
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 
-from ai_common import get_llm, get_model_name_alias
+from ai_common import get_config_from_runnable, get_llm, get_model_name_alias
+from ..cache import Cache
 from ..state import SearchState
 from ..enums import Node, SearchType
+from .budget import Budget, BudgetExceededError
+from .llm_call import ainvoke_llm
+from .rate_limit import RateLimiter
 from .utils import get_schema
 
 
@@ -44,6 +50,43 @@ Today's date is:
 </Task>
 """
 
+PLACEHOLDER_VALUES = frozenset({'', '-', 'n/a', 'na', 'none', 'null', 'unknown', 'not available', 'not found', 'not specified'})
+UNCERTAINTY_MARKERS = ('unclear', 'uncertain', 'unverified', 'possibly', 'probably', 'likely', 'reportedly',
+                       'approximately', 'estimated', 'tbd', 'various')
+UNCERTAINTY_PATTERN = re.compile(r'\b(?:' + '|'.join(UNCERTAINTY_MARKERS) + r')\b', flags=re.IGNORECASE)
+
+
+def is_placeholder(value: Any) -> bool:
+    match value:
+        case None:
+            return True
+        case str():
+            return (value.strip().lower() in PLACEHOLDER_VALUES) or ('***' in value)
+        case list():
+            return (len(value) == 0) or all(is_placeholder(x) for x in value)
+        case _:
+            return False
+
+
+def pre_review(info: BaseModel, fields: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Deterministically review the given fields of the extracted information.
+
+    Returns:
+        (missing_fields, ambiguous_fields): Fields that are certainly missing (placeholders, empty lists, masked
+        values) and string fields that contain an uncertainty marker as a whole word and need the LLM's judgement.
+        All other fields are considered well populated, having already passed the fact check.
+    """
+    missing_fields, ambiguous_fields = [], []
+    for field in fields:
+        value = getattr(info, field)
+        if is_placeholder(value):
+            missing_fields.append(field)
+        elif isinstance(value, str) and UNCERTAINTY_PATTERN.search(value) is not None:
+            ambiguous_fields.append(field)
+    return missing_fields, ambiguous_fields
+
+
 class ReviewOutput(BaseModel):
     is_satisfactory: bool = Field(description='True if all required fields are well populated, False otherwise')
     missing_fields: list[str] = Field(description='List of field names that are missing or incomplete')
@@ -51,11 +94,18 @@ class ReviewOutput(BaseModel):
 
 
 class NoteReviewer:
-    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str):
+    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str,
+                 llm_cache: Optional[Cache] = None, budget: Optional[Budget] = None,
+                 rate_limiter: Optional[RateLimiter] = None, tier: str = 'reasoning_model'):
         self.model_name = model_params['model']
         self.model_name_alias = get_model_name_alias(model_name=self.model_name,
                                                      model_provider=model_params['model_provider'])
         self.configuration_module_prefix: Final = configuration_module_prefix
+        self.model_params = model_params
+        self.llm_cache = llm_cache
+        self.budget = budget
+        self.rate_limiter = rate_limiter
+        self.tier = tier
         base_llm = get_llm(model_name=model_params['model'],
                            model_provider=model_params['model_provider'],
                            api_key=model_params['api_key'],
@@ -67,7 +117,15 @@ class NoteReviewer:
             stop_after_attempt = model_params['max_llm_retries'],
             )
 
-    def run(self, state: SearchState) -> SearchState:
+    def run(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        """
+        Synchronous wrapper around `arun`.
+
+        Must not be called from a thread that is already running an event loop; graph execution uses `arun`.
+        """
+        return asyncio.run(self.arun(state=state, config=config))
+
+    async def arun(self, state: SearchState, config: RunnableConfig) -> SearchState:
         """
         Review and validate the quality and completeness of extracted information.
 
@@ -100,8 +158,10 @@ class NoteReviewer:
                - First iteration: Deep copy all extracted notes to out_info
                - Subsequent iterations: Update only focused fields in out_info
             3. Adds NOTE_REVIEWER to processing steps and increments iteration
-            4. Generates schema-based review instructions with current date context
-            5. Invokes structured LLM to assess information completeness
+            4. Optional deterministic pre-review (`rule_based_review`): placeholder, empty and masked values are
+               marked missing; only fields with uncertain values are left for the LLM, and the LLM call is
+               skipped (and counted in `skipped_llm_calls`) when there are none
+            5. Asynchronously invokes structured LLM to assess the remaining fields
             6. Tracks token usage for monitoring and cost management
             7. Updates review status and identifies fields needing attention
 
@@ -123,6 +183,16 @@ class NoteReviewer:
             - Current date provided for temporal context in review
         """
 
+        configurable = get_config_from_runnable(
+            configuration_module_prefix=self.configuration_module_prefix,
+            config=config
+        )
+        if state.notes is None:
+            # Nothing was extracted because the run budget ran out
+            state.steps.append(Node.NOTE_REVIEWER)
+            state.iteration += 1
+            return state
+
         if (
                 ((state.search_type == SearchType.PERSON) and ('linkedin.com/in/' not in state.notes.linkedin_profile)) or
                 ((state.search_type == SearchType.COMPANY) and ('linkedin.com/company/' not in state.notes.linkedin_profile))
@@ -135,27 +205,50 @@ class NoteReviewer:
             for key in state.search_focus:
                 setattr(state.out_info, key, getattr(state.notes, key))
 
-
-
         schema = get_schema(state=state)
-        instructions = REVIEW_PROMPT.format(schema=json.dumps(schema, indent=2),
-                                            info=state.out_info.model_dump(),
-                                            today=datetime.date.today().isoformat())
+        review_fields = list(schema['properties'].keys())
+        missing_fields, ambiguous_fields = [], review_fields
+        if configurable.rule_based_review:
+            missing_fields, ambiguous_fields = pre_review(info=state.out_info, fields=review_fields)
 
-        with get_usage_metadata_callback() as cb:
-            out_dict = self.structured_llm.invoke(instructions)
-            review_output = out_dict['parsed']
-            # results = self.base_llm.invoke(instructions, response_format={"type": "json_object"})
-            # json_dict = json.loads(results.content)
+        review_output = None
+        if len(ambiguous_fields) == 0:
+            state.skipped_llm_calls[Node.NOTE_REVIEWER] = state.skipped_llm_calls.get(Node.NOTE_REVIEWER, 0) + 1
+        elif not state.is_budget_exhausted:
+            schema = get_schema(state=state, fields=ambiguous_fields)
+            instructions = REVIEW_PROMPT.format(schema=json.dumps(schema, indent=2),
+                                                info={k: getattr(state.out_info, k) for k in ambiguous_fields},
+                                                today=datetime.date.today().isoformat())
+            try:
+                review_output = await ainvoke_llm(llm=self.structured_llm,
+                                                  instructions=instructions,
+                                                  state=state,
+                                                  model_params=self.model_params,
+                                                  model_name_alias=self.model_name_alias,
+                                                  schema=ReviewOutput,
+                                                  cache=self.llm_cache,
+                                                  budget=self.budget,
+                                                  rate_limiter=self.rate_limiter,
+                                                  tier=self.tier,
+                                                  configurable=configurable)
+            except BudgetExceededError:
+                state.is_budget_exhausted = True
 
-            state.token_usage[self.model_name]['input_tokens'] += cb.usage_metadata[self.model_name_alias]['input_tokens']
-            state.token_usage[self.model_name]['output_tokens'] += cb.usage_metadata[self.model_name_alias]['output_tokens']
-            state.is_review_successful = review_output.is_satisfactory
+        if (len(ambiguous_fields) == 0) or (review_output is not None):
+            if review_output is not None:
+                # Keep every field the LLM names, not only the ones it was asked about
+                missing_fields += [x for x in review_output.missing_fields
+                                   if (x in review_fields) and (x not in missing_fields)]
 
             if state.iteration == 0:
-                state.search_focus = review_output.missing_fields
+                state.search_focus = missing_fields
             else:
-                state.search_focus = [x for x in review_output.missing_fields if x in state.search_focus]
+                state.search_focus = [x for x in missing_fields if x in state.search_focus]
+            # Decided from the fields that are searched next, so an unsuccessful review always has a focus
+            state.is_review_successful = len(state.search_focus) == 0
+
+        if self.budget is not None and self.budget.is_exhausted(token_usage=state.token_usage, configurable=configurable):
+            state.is_budget_exhausted = True
 
         # Leave these two steps as the last before return.
         state.steps.append(Node.NOTE_REVIEWER)
@@ -1,9 +1,18 @@
+import asyncio
 import datetime
-from typing import Any, Final
+from typing import Any, Final, Optional
 
-from langchain_core.callbacks import get_usage_metadata_callback
+from langchain_core.runnables import Runnable, RunnableConfig
+from pydantic import BaseModel, create_model
 
-from ai_common import get_llm, get_model_name_alias
+from ai_common import format_sources, get_config_from_runnable, get_llm, get_model_name_alias
+from .artifacts import ArtifactCache
+from .budget import Budget, BudgetExceededError
+from .llm_call import ainvoke_llm
+from .rate_limit import RateLimiter
+from .utils import merge_values
+from ..cache import Cache
+from ..configuration import Configuration
 from ..enums import SearchType, Node
 from ..schema import PersonSchema, CompanySchema
 from ..state import SearchState
@@ -45,7 +54,9 @@ Please make sure that:
 """
 
 class NoteTaker:
-    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str):
+    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str,
+                 llm_cache: Optional[Cache] = None, budget: Optional[Budget] = None,
+                 rate_limiter: Optional[RateLimiter] = None, tier: str = 'reasoning_model'):
         self.model_name = model_params['model']
         self.model_name_alias = get_model_name_alias(model_name=self.model_name,
                                                      model_provider=model_params['model_provider'])
@@ -55,8 +66,21 @@ class NoteTaker:
                                 api_key=model_params['api_key'],
                                 model_args=model_params['model_args'])
         self.model_params = model_params
+        self.llm_cache = llm_cache
+        self.budget = budget
+        self.rate_limiter = rate_limiter
+        self.tier = tier
+        self.artifacts = ArtifactCache()
 
-    def run(self, state: SearchState) -> SearchState:
+    def run(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        """
+        Synchronous wrapper around `arun`.
+
+        Must not be called from a thread that is already running an event loop; graph execution uses `arun`.
+        """
+        return asyncio.run(self.arun(state=state, config=config))
+
+    async def arun(self, state: SearchState, config: RunnableConfig) -> SearchState:
         """
         Extract structured information from source content based on search type.
 
@@ -71,6 +95,10 @@ class NoteTaker:
         maintain accuracy while avoiding hallucination. Missing information is explicitly
         handled by marking it as "Not Available" in the extracted data.
 
+        With `incremental_note_taking` enabled (default), iterations after the first only send the sources
+        that have not been processed yet and only ask for the fields in `search_focus`. The result is merged
+        into the existing notes, and the LLM call is skipped when there are no new sources.
+
         Args:
             state (SearchState): The current search state containing:
                 - search_type: Type of search (PERSON or COMPANY) determining extraction schema
@@ -106,7 +134,7 @@ class NoteTaker:
                - Source content for information extraction
                - Current date in ISO format for temporal context
                - JSON schema definition for structured output
-            6. Invokes LLM with structured JSON output format
+            6. Asynchronously invokes LLM with structured JSON output format
             7. Processes and validates LLM response:
                - Parses JSON response from LLM
                - Extracts 'value' fields from structured response
@@ -144,27 +172,122 @@ class NoteTaker:
             if not hasattr(state, 'company') or state.company is None:
                 raise ValueError("state.company is required when search_type is COMPANY")
 
+        configurable = get_config_from_runnable(
+            configuration_module_prefix=self.configuration_module_prefix,
+            config=config
+        )
+        if state.is_budget_exhausted:
+            return state
+
         state.steps.append(Node.NOTE_TAKER)
         notes_type = PersonSchema if state.search_type == SearchType.PERSON else CompanySchema
-        # json_schema = get_schema(state=state)
+
+        if (not configurable.incremental_note_taking) or (state.notes is None):
+            # json_schema = get_schema(state=state)
+            instructions = NOTE_TAKING_INSTRUCTIONS.format(search_type = state.search_type,
+                                                           info = state.topic,
+                                                           content = state.source_str,
+                                                           today = datetime.date.today().isoformat())
+            structured_llm = self.artifacts.get(kind='structured_llm', search_type=state.search_type, fields=None,
+                                                build=lambda: self._build_structured_llm(schema=notes_type))
+
+            try:
+                state.notes = await ainvoke_llm(llm=structured_llm,
+                                                instructions=instructions,
+                                                state=state,
+                                                model_params=self.model_params,
+                                                model_name_alias=self.model_name_alias,
+                                                schema=notes_type,
+                                                cache=self.llm_cache,
+                                                budget=self.budget,
+                                                rate_limiter=self.rate_limiter,
+                                                tier=self.tier,
+                                                configurable=configurable)
+            except BudgetExceededError:
+                state.is_budget_exhausted = True
+                return state
+            state.processed_sources = list(state.unique_sources.keys())
+            return state
+
+        # Incremental extraction: only sources not seen before, only fields that are still missing
+        new_sources = {k: v for k, v in state.unique_sources.items() if k not in set(state.processed_sources)}
+        if len(new_sources) == 0:
+            state.skipped_llm_calls[Node.NOTE_TAKER] = state.skipped_llm_calls.get(Node.NOTE_TAKER, 0) + 1
+            return state
+
+        focus = set(state.search_focus)
+        fields = [f for f in notes_type.model_fields if (len(focus) == 0) or (f in focus)]
+        try:
+            await self.extract_fields(state=state, fields=fields, sources=new_sources, configurable=configurable)
+        except BudgetExceededError:
+            state.is_budget_exhausted = True
+            return state
+
+        state.processed_sources += list(new_sources.keys())
+        return state
+
+    async def extract_fields(self,
+                             state: SearchState,
+                             fields: list[str],
+                             sources: dict[str, Any],
+                             configurable: Configuration) -> SearchState:
+        """
+        Extract only `fields` from `sources` and merge them into the existing `state.notes`.
+
+        A value already found is not overwritten with a missing one.
+
+        Raises:
+            BudgetExceededError: If the call would overflow the run budget.
+        """
+        values = await self.extract_values(state=state, fields=fields, sources=sources, configurable=configurable)
+        merge_values(notes=state.notes, values=values)
+        return state
+
+    async def extract_values(self,
+                             state: SearchState,
+                             fields: list[str],
+                             sources: dict[str, Any],
+                             configurable: Configuration) -> dict[str, Any]:
+        """
+        Extract `fields` from `sources` without touching `state.notes`. Returns the values in schema order.
+
+        Raises:
+            BudgetExceededError: If the call would overflow the run budget.
+        """
+        notes_type = PersonSchema if state.search_type == SearchType.PERSON else CompanySchema
+        fields = [f for f in notes_type.model_fields if f in set(fields)]
+        partial_notes_type = self.artifacts.get(
+            kind='partial_model', search_type=state.search_type, fields=fields,
+            build=lambda: create_model(f'Partial{notes_type.__name__}',
+                                       **{f: (notes_type.model_fields[f].annotation, notes_type.model_fields[f])
+                                          for f in fields})
+        )
         instructions = NOTE_TAKING_INSTRUCTIONS.format(search_type = state.search_type,
                                                        info = state.topic,
-                                                       content = state.source_str,
+                                                       content = format_sources(unique_sources=sources,
+                                                                                max_tokens_per_source=configurable.max_tokens_per_source,
+                                                                                include_raw_content=True),
                                                        today = datetime.date.today().isoformat())
-        structured_llm = self.base_llm.with_structured_output(
-            schema = notes_type,
+        structured_llm = self.artifacts.get(kind='partial_structured_llm', search_type=state.search_type, fields=fields,
+                                            build=lambda: self._build_structured_llm(schema=partial_notes_type))
+
+        partial_notes = await ainvoke_llm(llm=structured_llm,
+                                          instructions=instructions,
+                                          state=state,
+                                          model_params=self.model_params,
+                                          model_name_alias=self.model_name_alias,
+                                          schema=partial_notes_type,
+                                          cache=self.llm_cache,
+                                          budget=self.budget,
+                                          rate_limiter=self.rate_limiter,
+                                          tier=self.tier,
+                                          configurable=configurable)
+        return {f: getattr(partial_notes, f) for f in fields}
+
+    def _build_structured_llm(self, schema: type[BaseModel]) -> Runnable:
+        return self.base_llm.with_structured_output(
+            schema = schema,
             include_raw = True,
         ).with_retry(
             stop_after_attempt = self.model_params['max_llm_retries']
             )
-
-        with get_usage_metadata_callback() as cb:
-            out_dict = structured_llm.invoke(instructions)
-            state.notes = out_dict['parsed']
-            # results = self.base_llm.invoke(instructions, response_format={"type": "json_object"})
-            # json_dict = json.loads(results.content)
-            # json_dict = {k: v['value'] for k, v in json_dict.items()}
-            # state.notes = PersonSchema(**json_dict) if state.search_type == SearchType.PERSON else CompanySchema(**json_dict)
-            state.token_usage[self.model_name]['input_tokens'] += cb.usage_metadata[self.model_name_alias]['input_tokens']
-            state.token_usage[self.model_name]['output_tokens'] += cb.usage_metadata[self.model_name_alias]['output_tokens']
-        return state
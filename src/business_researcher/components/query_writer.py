@@ -1,11 +1,15 @@
-from typing import Any, Final
+import asyncio
+from typing import Any, Final, Optional
 import json
 
 from langchain_core.runnables import RunnableConfig
-from langchain_core.callbacks import get_usage_metadata_callback
 
 from ai_common import get_config_from_runnable, get_llm, get_model_name_alias, SearchQuery, LlmServers
+from .budget import Budget, BudgetExceededError
+from .llm_call import ainvoke_llm
+from .rate_limit import RateLimiter
 from .utils import get_schema
+from ..cache import Cache
 from ..enums import Node, SearchType
 from ..state import SearchState
 
@@ -120,7 +124,9 @@ QUERY_WRITING_INSTRUCTIONS = {
 
 
 class QueryWriter:
-    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str):
+    def __init__(self, model_params: dict[str, Any], configuration_module_prefix: str,
+                 llm_cache: Optional[Cache] = None, budget: Optional[Budget] = None,
+                 rate_limiter: Optional[RateLimiter] = None, tier: str = 'language_model'):
         self.model_name = model_params['model']
         self.model_name_alias = get_model_name_alias(model_name=self.model_name,
                                                      model_provider=model_params['model_provider'])
@@ -131,6 +137,11 @@ class QueryWriter:
             api_key=model_params['api_key'],
             model_args=model_params['model_args']
             )
+        self.model_params = model_params
+        self.llm_cache = llm_cache
+        self.budget = budget
+        self.rate_limiter = rate_limiter
+        self.tier = tier
         self.kwargs = None
         match model_params['model_provider']:
             case LlmServers.GROQ:
@@ -151,6 +162,14 @@ class QueryWriter:
         """
 
     def run(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        """
+        Synchronous wrapper around `arun`.
+
+        Must not be called from a thread that is already running an event loop; graph execution uses `arun`.
+        """
+        return asyncio.run(self.arun(state=state, config=config))
+
+    async def arun(self, state: SearchState, config: RunnableConfig) -> SearchState:
         """
         Generate targeted web search queries based on the search type and extraction schema.
 
@@ -182,8 +201,8 @@ class QueryWriter:
             4. Selects appropriate query instruction template based on search type
             5. Builds extraction schema, optionally filtered by search focus
             6. Formats instructions with context, schema, and query count
-            7. Invokes structured LLM to generate queries matching the Queries schema
-            8. Tracks token usage for monitoring and cost management
+            7. Asynchronously invokes the LLM to generate queries matching the Queries schema
+            8. Tracks token usage for monitoring and cost management (served from the LLM cache when enabled)
             9. Updates state with generated queries and returns modified state
 
         Note:
@@ -197,24 +216,33 @@ class QueryWriter:
             configuration_module_prefix=self.configuration_module_prefix,
             config=config
         )
+        if state.is_budget_exhausted:
+            return state
+
         state.steps.append(Node.QUERY_WRITER)
         query_instructions_template = QUERY_WRITING_INSTRUCTIONS[state.search_type]
-        schema = get_schema(state = state)
-
-        if len(state.search_focus) > 0:
-            schema['required'] = state.search_focus
-            schema['properties'] = {k: v for k, v in schema['properties'].items() if k in state.search_focus}
+        schema = get_schema(state = state, fields = state.search_focus if len(state.search_focus) > 0 else None)
 
         instructions = query_instructions_template.format(info=state.topic,
                                                           schema=json.dumps(schema, indent=2),
                                                           number_of_queries=configurable.number_of_queries)
-        with get_usage_metadata_callback() as cb:
-            results = self.base_llm.invoke(instructions, **self.kwargs)
-
-
-            state.token_usage[self.model_name]['input_tokens'] += cb.usage_metadata[self.model_name_alias]['input_tokens']
-            state.token_usage[self.model_name]['output_tokens'] += cb.usage_metadata[self.model_name_alias]['output_tokens']
-            json_dict = json.loads(results.content)
-            state.search_queries = [SearchQuery(**q) for q in json_dict['queries']]
+        try:
+            content = await ainvoke_llm(llm=self.base_llm,
+                                        instructions=instructions,
+                                        state=state,
+                                        model_params=self.model_params,
+                                        model_name_alias=self.model_name_alias,
+                                        cache=self.llm_cache,
+                                        budget=self.budget,
+                                        rate_limiter=self.rate_limiter,
+                                        tier=self.tier,
+                                        configurable=configurable,
+                                        **self.kwargs)
+        except BudgetExceededError:
+            state.is_budget_exhausted = True
+            return state
+
+        json_dict = json.loads(content)
+        state.search_queries = [SearchQuery(**q) for q in json_dict['queries']]
 
         return state
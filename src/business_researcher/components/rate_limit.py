@@ -0,0 +1,276 @@
+import asyncio
+import contextlib
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from pydantic import BaseModel, Field
+
+WEB_SEARCH_KEY: tuple[str, str] = ('tavily', 'search')
+
+
+class RateLimit(BaseModel):
+    """
+    Limits of one (model_provider, model) pair, set with the optional 'rate_limit' entry of a model in `llm_config`.
+
+    Attributes:
+        requests_per_minute: Request budget of the provider (None: unlimited).
+        tokens_per_minute: Token budget of the provider (None: unlimited). Estimated prompt tokens are charged
+            before a call and corrected with the reported input and output tokens afterwards.
+        max_concurrency: Upper bound (and starting value) of the adaptive concurrency limit. Only applies to
+            models with a 'rate_limit' entry; models without one are not limited at all.
+        min_concurrency: Lower bound of the adaptive concurrency limit.
+        latency_target_seconds: Calls slower than this shrink the concurrency limit like a rate limit error
+            does (None: latency is ignored).
+        decrease_factor: Multiplicative decrease of the concurrency limit on a rate limit error or a slow call.
+        cooldown_seconds: Pause of all calls after a rate limit error without a Retry-After hint.
+    """
+    requests_per_minute: Optional[float] = Field(default=None, gt=0)
+    tokens_per_minute: Optional[float] = Field(default=None, gt=0)
+    max_concurrency: int = Field(default=64, gt=0)
+    min_concurrency: int = Field(default=1, gt=0)
+    latency_target_seconds: Optional[float] = Field(default=None, gt=0)
+    decrease_factor: float = Field(default=0.5, gt=0, lt=1)
+    cooldown_seconds: float = Field(default=5, ge=0)
+
+
+class TokenBucket:
+    """Bucket of `per_minute` units refilled continuously. The level may go negative after a correction."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def get_wait(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units (at most the capacity) are available."""
+        self.refill(now=now)
+        return max(min(amount, self.capacity) - self.level, 0) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status_code == 429 or 'RateLimit' in type(error).__name__
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    try:
+        return float(headers.get('retry-after')) if headers is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class Permit:
+    """Admission of one call by a `ProviderLimiter`."""
+
+    def __init__(self, limiter: 'ProviderLimiter', estimated_tokens: int):
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+
+    def reconcile(self, tokens: int) -> None:
+        """Correct the token bucket with the tokens the call actually used."""
+        self.limiter.charge_tokens(tokens=tokens - self.estimated_tokens)
+        self.estimated_tokens = tokens
+
+
+class ProviderLimiter:
+    """
+    Rate limiter of a single provider model: token buckets for requests and tokens per minute, and an AIMD
+    concurrency limit that grows by about one slot per round of successful calls and shrinks multiplicatively on
+    rate limit errors (and on calls slower than `latency_target_seconds`). A rate limit error also pauses all calls
+    of the model, including the pending retry, for the Retry-After time or `cooldown_seconds`.
+
+    Waiters are woken through futures of their own event loop, so one limiter can be shared by researchers that
+    run on different loops or threads.
+    """
+
+    def __init__(self, name: str, rate_limit: RateLimit):
+        self.name = name
+        self.rate_limit = rate_limit
+        self.concurrency = float(rate_limit.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.request_bucket = TokenBucket(rate_limit.requests_per_minute) if rate_limit.requests_per_minute else None
+        self.token_bucket = TokenBucket(rate_limit.tokens_per_minute) if rate_limit.tokens_per_minute else None
+        self.calls = 0
+        self.rate_limited = 0
+        self.wait_time = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._lock = threading.Lock()
+
+    @contextlib.asynccontextmanager
+    async def limit(self, estimated_tokens: int = 0, requests: int = 1) -> AsyncIterator[Permit]:
+        """Hold a concurrency slot and the request/token budget of a call for the duration of the block."""
+        t0 = time.monotonic()
+        await self._acquire_slot()
+        try:
+            await self._wait_for_budget(estimated_tokens=estimated_tokens, requests=requests)
+            started_at = time.monotonic()
+            self.wait_time += started_at - t0
+            yield Permit(limiter=self, estimated_tokens=estimated_tokens)
+            self.on_success(latency=time.monotonic() - started_at)
+        finally:
+            self._release_slot()
+
+    async def _acquire_slot(self) -> None:
+        while True:
+            with self._lock:
+                if self.in_flight < max(math.floor(self.concurrency), 1):
+                    self.in_flight += 1
+                    self.calls += 1
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                if waiter.cancelled():
+                    # Pass the wake-up on, it may have been meant for this waiter
+                    self._wake()
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        with self._lock:
+            free = max(math.floor(self.concurrency), 1) - self.in_flight
+            while free > 0 and len(self._waiters) > 0:
+                waiter = self._waiters.popleft()
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+                free -= 1
+
+    async def _wait_for_budget(self, estimated_tokens: int, requests: int) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self.paused_until - now
+                if self.request_bucket is not None:
+                    wait = max(wait, self.request_bucket.get_wait(amount=requests, now=now))
+                if self.token_bucket is not None:
+                    wait = max(wait, self.token_bucket.get_wait(amount=estimated_tokens, now=now))
+                if wait <= 0:
+                    if self.request_bucket is not None:
+                        self.request_bucket.take(amount=requests)
+                    if self.token_bucket is not None:
+                        self.token_bucket.take(amount=estimated_tokens)
+                    return
+            await asyncio.sleep(wait)
+
+    def charge_tokens(self, tokens: int) -> None:
+        if self.token_bucket is not None:
+            with self._lock:
+                self.token_bucket.take(amount=tokens)
+
+    def on_success(self, latency: float) -> None:
+        target = self.rate_limit.latency_target_seconds
+        if target is not None and latency > target:
+            self._decrease()
+            return
+        with self._lock:
+            self.concurrency = min(self.concurrency + 1 / self.concurrency, self.rate_limit.max_concurrency)
+        self._wake()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """Shrink the concurrency limit and pause new calls. Returns the seconds until calls resume."""
+        self._decrease()
+        with self._lock:
+            self.rate_limited += 1
+            now = time.monotonic()
+            pause = retry_after if retry_after is not None else self.rate_limit.cooldown_seconds
+            self.paused_until = max(self.paused_until, now + pause)
+            return self.paused_until - now
+
+    def _decrease(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            # At most one decrease per cooldown, so a burst of errors from the same window counts once
+            if now - self.last_decrease >= self.rate_limit.cooldown_seconds:
+                self.concurrency = max(self.concurrency * self.rate_limit.decrease_factor,
+                                       self.rate_limit.min_concurrency)
+                self.last_decrease = now
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {'concurrency': self.concurrency, 'in_flight': self.in_flight, 'waiting': len(self._waiters),
+                    'calls': self.calls, 'rate_limited': self.rate_limited, 'wait_time': self.wait_time}
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RateLimitObserver(AsyncCallbackHandler):
+    """
+    Reports rate limit errors of a call to its limiter and holds the call's retry back until the limiter's pause
+    is over, so `with_retry` does not hammer a provider that is already refusing requests.
+    """
+
+    def __init__(self, limiter: ProviderLimiter):
+        self.limiter = limiter
+
+    async def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        if is_rate_limit_error(error):
+            await asyncio.sleep(self.limiter.on_rate_limited(retry_after=get_retry_after(error)))
+
+
+class RateLimiter:
+    """
+    Shared registry of `ProviderLimiter`s keyed by (model_provider, model).
+
+    Pass one instance to several researchers (e.g. in service mode) to share the provider budget between them.
+    Web search is limited under `WEB_SEARCH_KEY`. Only keys in `rate_limits` are limited, unless a
+    `default_rate_limit` is given for all other keys; `get` returns None for a key that is not limited.
+    """
+
+    def __init__(self, rate_limits: Optional[dict[tuple[str, str], RateLimit]] = None,
+                 default_rate_limit: Optional[RateLimit] = None):
+        self.rate_limits = dict(rate_limits) if rate_limits is not None else {}
+        self.default_rate_limit = default_rate_limit
+        self._limiters: dict[tuple[str, str], ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_llm_config(cls, llm_config: dict[str, Any],
+                        web_search_rate_limit: Optional[RateLimit] = None) -> 'RateLimiter':
+        rate_limits = {(p['model_provider'], p['model']): RateLimit.model_validate(p['rate_limit'])
+                       for p in llm_config.values() if p.get('rate_limit') is not None}
+        if web_search_rate_limit is not None:
+            rate_limits[WEB_SEARCH_KEY] = web_search_rate_limit
+        return cls(rate_limits=rate_limits)
+
+    def get(self, model_provider: str, model: str) -> Optional[ProviderLimiter]:
+        key = (model_provider, model)
+        with self._lock:
+            if key not in self._limiters:
+                rate_limit = self.rate_limits.get(key, self.default_rate_limit)
+                if rate_limit is None:
+                    return None
+                self._limiters[key] = ProviderLimiter(name=f'{model_provider}/{model}', rate_limit=rate_limit)
+            return self._limiters[key]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.stats() for limiter in limiters}
@@ -0,0 +1,136 @@
+import math
+import re
+from collections import Counter
+from typing import Any
+
+TOKEN_PATTERN = re.compile(r'\w+', flags=re.UNICODE)
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it', 'its',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'were', 'with',
+})
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def chunk_sources(unique_sources: dict[str, Any], chunk_size: int, chunk_overlap: int = 0) -> list[dict[str, Any]]:
+    """
+    Split the content of each source into chunks of roughly `chunk_size` words.
+
+    Each chunk records the 1-based index of its source in `unique_sources`, matching the "Source N" labels of
+    the formatted source string.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f'chunk_size must be positive, got {chunk_size}')
+    if not 0 <= chunk_overlap < chunk_size:
+        raise ValueError(f'chunk_overlap must be in [0, chunk_size), got {chunk_overlap}')
+
+    chunks = []
+    for source_index, source in enumerate(unique_sources.values(), start=1):
+        text = source.get('content') or ''
+        if source.get('raw_content'):
+            text += '\n' + source['raw_content']
+        words = text.split()
+        step = chunk_size - chunk_overlap
+        for start in range(0, max(len(words), 1), step):
+            chunk_words = words[start:start + chunk_size]
+            if len(chunk_words) == 0:
+                break
+            chunks.append({
+                'source_index': source_index,
+                'url': source.get('url'),
+                'title': source.get('title'),
+                'text': ' '.join(chunk_words),
+            })
+            if start + chunk_size >= len(words):
+                break
+    return chunks
+
+
+class BM25Index:
+    """Minimal in-process Okapi BM25 index over a list of texts."""
+
+    def __init__(self, texts: list[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_frequencies = [Counter(tokenize(text)) for text in texts]
+        self.lengths = [sum(tf.values()) for tf in self.term_frequencies]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if len(self.lengths) > 0 else 0.0
+
+        document_frequencies = Counter()
+        for tf in self.term_frequencies:
+            document_frequencies.update(tf.keys())
+        n = len(texts)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequencies.items()}
+
+    def __len__(self) -> int:
+        return len(self.term_frequencies)
+
+    def score(self, query: str) -> list[float]:
+        query_terms = [t for t in set(tokenize(query)) if t in self.idf]
+        scores = [0.0] * len(self.term_frequencies)
+        for i, (tf, length) in enumerate(zip(self.term_frequencies, self.lengths)):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length > 0 else self.k1
+            for term in query_terms:
+                frequency = tf.get(term, 0)
+                if frequency > 0:
+                    scores[i] += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, query: str, top_k: int) -> list[int]:
+        """Indices of the `top_k` best matching texts with a positive score, best first."""
+        scores = self.score(query=query)
+        ranked = sorted((i for i, s in enumerate(scores) if s > 0), key=lambda i: scores[i], reverse=True)
+        return ranked[:top_k]
+
+
+def format_retrieved_chunks(chunks: list[dict[str, Any]], chunk_ids: list[int]) -> str:
+    """Format the selected chunks grouped by source, keeping the "Source N" numbering of the full source string."""
+    by_source: dict[int, list[int]] = {}
+    for chunk_id in sorted(set(chunk_ids)):
+        by_source.setdefault(chunks[chunk_id]['source_index'], []).append(chunk_id)
+
+    content = 'Sources:\n\n'
+    for source_index, ids in sorted(by_source.items()):
+        first = chunks[ids[0]]
+        content += f"Source {source_index}: {first['title']}\n===\nURL: {first['url']}\n===\nRelevant excerpts:\n"
+        content += '\n...\n'.join(chunks[i]['text'] for i in ids)
+        content += '\n===\n\n'
+    return content
+
+
+class ChunkIndex:
+    """BM25 index over the chunks of a set of sources, built once and queried for any subset of the fields."""
+
+    def __init__(self, unique_sources: dict[str, Any], chunk_size: int, chunk_overlap: int = 0):
+        self.chunks = chunk_sources(unique_sources=unique_sources, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.index = BM25Index(texts=[c['text'] for c in self.chunks])
+
+    def retrieve(self, notes: dict[str, Any], json_schema: dict[str, Any], top_k: int) -> str:
+        """
+        Build a source string holding only the chunks that are most relevant to the fields being checked.
+
+        Every field queries the index with its name, its schema description and its extracted value; the union of
+        the top-k chunks of all fields is returned, formatted with the same "Source N" numbering as the full source
+        string.
+        """
+        chunk_ids = []
+        for field, value in notes.items():
+            value_str = ' '.join(map(str, value)) if isinstance(value, list) else str(value)
+            query = f"{field.replace('_', ' ')} {json_schema.get(field, {}).get('description', '')} {value_str}"
+            chunk_ids += self.index.search(query=query, top_k=top_k)
+
+        return format_retrieved_chunks(chunks=self.chunks, chunk_ids=chunk_ids)
+
+
+def retrieve_evidence(unique_sources: dict[str, Any],
+                      notes: dict[str, Any],
+                      json_schema: dict[str, Any],
+                      top_k: int,
+                      chunk_size: int,
+                      chunk_overlap: int = 0) -> str:
+    """One-off `ChunkIndex.retrieve`; build a `ChunkIndex` instead to query the same sources several times."""
+    chunk_index = ChunkIndex(unique_sources=unique_sources, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return chunk_index.retrieve(notes=notes, json_schema=json_schema, top_k=top_k)
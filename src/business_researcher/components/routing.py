@@ -1,17 +1,37 @@
-from typing import Literal
+from typing import Literal, Optional
 from langchain_core.runnables import RunnableConfig
 
+from .budget import Budget
 from .. state import SearchState
 from ..configuration import Configuration
 
 
-def is_review_successful(state: SearchState, config: RunnableConfig) -> Literal['successful', 'unsuccessful', 'max_iter']:
+def is_review_successful(state: SearchState,
+                         config: RunnableConfig,
+                         budget: Optional[Budget] = None) -> Literal['successful', 'unsuccessful', 'max_iter', 'budget']:
     configurable = Configuration.from_runnable(runnable=config)
 
     if state.is_review_successful:
         return 'successful'
+    elif state.is_budget_exhausted or (
+            budget is not None and budget.is_exhausted(token_usage=state.token_usage, configurable=configurable)
+    ):
+        return 'budget'
     else:
         if state.iteration == configurable.max_iterations:
             return 'max_iter'
         else:
             return 'unsuccessful'
+
+
+def needs_escalation(state: SearchState) -> Literal['escalate', 'review']:
+    """With `model_cascade`, route fields that failed fact checking to the reasoning model before the review."""
+    if len(state.escalation_fields) > 0 and not state.is_budget_exhausted:
+        return 'escalate'
+    return 'review'
+
+
+def get_search_mode(state: SearchState, config: RunnableConfig) -> Literal['pipelined', 'sequential']:
+    """With `pipelined_extraction`, search and note taking run overlapped in the search pipeline node."""
+    configurable = Configuration.from_runnable(runnable=config)
+    return 'pipelined' if configurable.pipelined_extraction else 'sequential'
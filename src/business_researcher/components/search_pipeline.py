@@ -0,0 +1,139 @@
+import asyncio
+from typing import Any, Final, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from ai_common import format_sources, get_config_from_runnable
+from .budget import BudgetExceededError
+from .dedup import deduplicate_sources
+from .linkedin_finder import LinkedinFinder
+from .note_taker import NoteTaker
+from .utils import is_missing_value, merge_values
+from .web_search import WebSearch
+from ..enums import Node, SearchType
+from ..schema import PersonSchema, CompanySchema
+from ..state import SearchState
+
+
+class SearchPipeline:
+    """
+    Graph node that overlaps web search and note taking (`pipelined_extraction`).
+
+    Every query is searched on its own, and as soon as its results arrive the sources not seen before are
+    deduplicated, LinkedIn-verified (with a `linkedin_finder` and `linkedin_verification`) and handed to the
+    `note_taker` as one extraction batch, while the slower queries are still in flight. Once all batches are done
+    their values are merged in query order (for every field, the first value that is not missing) into the notes
+    the fact checker sees, so an iteration takes about the slowest search plus one batch extraction instead of
+    all searches plus one extraction over all sources.
+
+    Each batch is a separate LLM call on fewer sources; the same rules as for `incremental_note_taking` apply to
+    which sources and fields are extracted in later iterations.
+    """
+
+    def __init__(self,
+                 web_search: WebSearch,
+                 note_taker: NoteTaker,
+                 configuration_module_prefix: str,
+                 linkedin_finder: Optional[LinkedinFinder] = None):
+        self.web_search = web_search
+        self.note_taker = note_taker
+        self.linkedin_finder = linkedin_finder
+        self.configuration_module_prefix: Final = configuration_module_prefix
+
+    async def arun(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        configurable = get_config_from_runnable(
+            configuration_module_prefix=self.configuration_module_prefix,
+            config=config
+        )
+        if state.is_budget_exhausted:
+            return state
+
+        state.steps.append(Node.SEARCH_PIPELINE)
+        notes_type = PersonSchema if state.search_type == SearchType.PERSON else CompanySchema
+        is_incremental = configurable.incremental_note_taking and (state.notes is not None)
+        focus = set(state.search_focus) if is_incremental else set()
+        fields = [f for f in notes_type.model_fields if (len(focus) == 0) or (f in focus)]
+        if not is_incremental:
+            state.processed_sources = []
+        processed = set(state.processed_sources)
+
+        async def search(index: int) -> tuple[int, list[dict[str, Any]]]:
+            return index, await self.web_search.search_query(state=state, query=state.search_queries[index],
+                                                             config=config, configurable=configurable)
+
+        async def extract(sources: dict[str, Any]) -> tuple[dict[str, Any], Optional[dict[str, Any]]]:
+            if self.linkedin_finder is not None and configurable.linkedin_verification:
+                sources = await self.linkedin_finder.filter_sources(state=state, sources=sources,
+                                                                    configurable=configurable)
+            batch = {k: v for k, v in sources.items() if k not in processed}
+            if state.is_budget_exhausted or (len(batch) == 0 and state.notes is not None):
+                skipped = state.skipped_llm_calls.get(Node.SEARCH_PIPELINE, 0)
+                state.skipped_llm_calls[Node.SEARCH_PIPELINE] = skipped + 1
+                return sources, None
+            try:
+                values = await self.note_taker.extract_values(state=state, fields=fields, sources=batch,
+                                                              configurable=configurable)
+            except BudgetExceededError:
+                state.is_budget_exhausted = True
+                return sources, None
+            state.processed_sources += list(batch.keys())
+            return sources, values
+
+        sources_per_query: list[list[dict[str, Any]]] = [[] for _ in state.search_queries]
+        seen, kept, dropped_sources = set(), {}, {}
+        extractions: list[tuple[int, asyncio.Task]] = []
+        searches = [asyncio.create_task(search(index=i)) for i in range(len(state.search_queries))]
+        try:
+            for next_search in asyncio.as_completed(searches):
+                index, sources = await next_search
+                sources_per_query[index] = sources
+                new_sources = {}
+                for source in sources:
+                    if source['url'] not in seen:
+                        seen.add(source['url'])
+                        new_sources[source['url']] = source
+                if configurable.near_duplicate_threshold is not None and len(new_sources) > 0:
+                    # Sources of earlier batches rank first, so they are never dropped in favour of a later one
+                    candidates, dropped = deduplicate_sources(unique_sources={**kept, **new_sources},
+                                                              threshold=configurable.near_duplicate_threshold,
+                                                              shingle_size=configurable.shingle_size)
+                    new_sources = {k: v for k, v in new_sources.items() if k in candidates}
+                    dropped_sources.update(dropped)
+                kept.update(new_sources)
+                if len(new_sources) > 0:
+                    extractions.append((index, asyncio.create_task(extract(sources=new_sources))))
+
+            if len(extractions) == 0 and state.notes is None:
+                # No sources at all: extract once anyway so the notes are filled with missing values
+                extractions.append((0, asyncio.create_task(extract(sources={}))))
+            results = await asyncio.gather(*[task for _, task in extractions])
+        finally:
+            for task in searches + [task for _, task in extractions]:
+                task.cancel()
+
+        verified = set()
+        merged = {}
+        batches = sorted(zip([index for index, _ in extractions], results), key=lambda x: x[0])
+        for _, (sources, values) in batches:
+            verified.update(sources.keys())
+            for f, value in (values or {}).items():
+                if (f not in merged) or (is_missing_value(merged[f]) and not is_missing_value(value)):
+                    merged[f] = value
+
+        if len(merged) > 0:
+            if is_incremental:
+                merge_values(notes=state.notes, values=merged)
+            else:
+                state.notes = notes_type.model_validate(merged)
+
+        unique_sources = {}
+        for sources in sources_per_query:
+            for source in sources:
+                if source['url'] in verified:
+                    unique_sources.setdefault(source['url'], source)
+        state.unique_sources = unique_sources
+        state.source_str = format_sources(unique_sources=unique_sources,
+                                          max_tokens_per_source=configurable.max_tokens_per_source,
+                                          include_raw_content=True)
+        state.dropped_sources.update(dropped_sources)
+        return state
@@ -1,5 +1,11 @@
-from typing import Any
+import math
+from collections.abc import Iterable
+from typing import Any, Optional
 
+from pydantic import BaseModel
+
+from .artifacts import schema_artifacts
+from ..cache import make_cache_key
 from ..state import SearchState
 from ..enums import SearchType
 from ..schema import PersonSchema, CompanySchema
@@ -22,6 +28,49 @@ def generate_info_str(state: SearchState):
     return info_str
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough, provider-independent token estimate (~4 characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def is_missing_value(value: Any) -> bool:
+    """True for the filler values the LLM components use for information that could not be found."""
+    return (value is None) or (value == 'Not Available') or (value == [])
+
+
+def merge_values(notes: BaseModel, values: dict[str, Any]) -> None:
+    """Set `values` on `notes`, except missing values that would overwrite a value found in earlier sources."""
+    for f, value in values.items():
+        if not (is_missing_value(value) and not is_missing_value(getattr(notes, f))):
+            setattr(notes, f, value)
+
+
+def get_filled_fields(info: Optional[BaseModel]) -> dict[str, Any]:
+    """Fields of an extraction schema instance that hold actual information."""
+    if info is None:
+        return {}
+    return {k: v for k, v in info.model_dump().items() if not is_missing_value(v)}
+
+
+def get_token_delta(token_usage: dict[str, dict[str, int]],
+                    previous: dict[str, dict[str, int]]) -> dict[str, dict[str, int]]:
+    """Per-model token usage accumulated since `previous`; models without new usage are left out."""
+    delta = {}
+    for model_name, usage in token_usage.items():
+        before = previous.get(model_name, {})
+        model_delta = {k: v - before.get(k, 0) for k, v in usage.items()}
+        if any(v != 0 for v in model_delta.values()):
+            delta[model_name] = model_delta
+    return delta
+
+
+def get_result_key(state: SearchState) -> str:
+    """Key identifying the researched entity, insensitive to case and whitespace in the rendered info string."""
+    info_str = generate_info_str(state=state)
+    normalized = '\n'.join(' '.join(line.lower().split()) for line in info_str.splitlines())
+    return make_cache_key(state.search_type, normalized)
+
+
 def generate_schema_str(schema: dict[str, Any]) -> str:
     schema_str = '\n'
     for k, v in schema['properties'].items():
@@ -30,13 +79,32 @@ def generate_schema_str(schema: dict[str, Any]) -> str:
     return schema_str
 
 
-def get_schema(state: SearchState) -> dict[str, Any]:
+def get_schema(state: SearchState, fields: Optional[Iterable[str]] = None) -> dict[str, Any]:
+    """
+    JSON schema of the extraction model for the state's search type, narrowed to `fields` if given.
+
+    Schemas are built once per (search_type, fields). The returned dict is a shallow copy: callers may replace
+    its top-level keys but must not modify nested values.
+    """
+    schema = schema_artifacts.get(kind='schema',
+                                  search_type=state.search_type,
+                                  fields=fields,
+                                  build=lambda: build_schema(search_type=state.search_type, fields=fields))
+    return dict(schema)
+
+
+def build_schema(search_type: str, fields: Optional[Iterable[str]] = None) -> dict[str, Any]:
     # noinspection PyUnreachableCode
-    match state.search_type:
+    match search_type:
         case SearchType.PERSON:
             schema = PersonSchema.model_json_schema()
         case SearchType.COMPANY:
             schema = CompanySchema.model_json_schema()
         case _:
-            raise RuntimeError(f"Unknown search type {state.search_type}")
+            raise RuntimeError(f"Unknown search type {search_type}")
+
+    if fields is not None:
+        fields = set(fields)
+        schema['properties'] = {k: v for k, v in schema['properties'].items() if k in fields}
+        schema['required'] = [k for k in schema.get('required', []) if k in fields]
     return schema
@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+from typing import Any, Final, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from ai_common import get_config_from_runnable, format_sources, SearchQuery
+from ai_common.components import WebSearchNode
+from .dedup import deduplicate_sources
+from .rate_limit import WEB_SEARCH_KEY, RateLimiter, get_retry_after, is_rate_limit_error
+from ..cache import SqliteCache, make_cache_key
+from ..configuration import Configuration
+from ..enums import Node
+from ..state import SearchState
+
+
+def normalize_query(query: str) -> str:
+    return ' '.join(query.lower().split())
+
+
+class WebSearch:
+    """
+    Graph node wrapping `WebSearchNode` with an optional persistent per-query result cache and
+    near-duplicate source elimination.
+
+    Cache keys combine the normalized query text with every configuration parameter that changes the search result.
+    On a full hit no web search is made; otherwise only the missed queries are sent to `WebSearchNode`
+    (concurrently, one query each), and the sources of all queries are merged and formatted as usual.
+
+    When `near_duplicate_threshold` is set, sources whose content is a near-duplicate of a higher ranked source
+    (MinHash over word shingles) are dropped before formatting and recorded in `state.dropped_sources`.
+
+    With a `rate_limiter` that limits `WEB_SEARCH_KEY`, searches sent to the provider go through that limiter,
+    charged one request per query; cache hits are free.
+    """
+
+    def __init__(self, web_search_node: WebSearchNode, configuration_module_prefix: str,
+                 cache: Optional[SqliteCache] = None, rate_limiter: Optional[RateLimiter] = None):
+        self.web_search_node = web_search_node
+        self.configuration_module_prefix: Final = configuration_module_prefix
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+
+    async def run(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        if state.is_budget_exhausted:
+            return state
+
+        configurable = get_config_from_runnable(
+            configuration_module_prefix=self.configuration_module_prefix,
+            config=config
+        )
+        if self.cache is None:
+            state = await self._search(state=state, config=config)
+        else:
+            state = await self._cached_search(state=state, config=config, configurable=configurable)
+
+        if configurable.near_duplicate_threshold is not None:
+            unique_sources, dropped_sources = deduplicate_sources(unique_sources=state.unique_sources,
+                                                                  threshold=configurable.near_duplicate_threshold,
+                                                                  shingle_size=configurable.shingle_size)
+            if len(dropped_sources) > 0:
+                state.unique_sources = unique_sources
+                state.source_str = format_sources(unique_sources=unique_sources,
+                                                  max_tokens_per_source=configurable.max_tokens_per_source,
+                                                  include_raw_content=True)
+                state.dropped_sources.update(dropped_sources)
+        return state
+
+    async def _cached_search(self, state: SearchState, config: RunnableConfig, configurable: Configuration) -> SearchState:
+        # Hits are served from the cache, only the missed queries are searched (concurrently)
+        sources_per_query = await asyncio.gather(
+            *[self.search_query(state=state, query=q, config=config, configurable=configurable)
+              for q in state.search_queries]
+        )
+
+        unique_sources = {}
+        for sources in sources_per_query:
+            for source in sources:
+                unique_sources.setdefault(source['url'], source)
+
+        state.steps.append(Node.WEB_SEARCH)
+        state.unique_sources = unique_sources
+        state.source_str = format_sources(unique_sources=unique_sources,
+                                          max_tokens_per_source=configurable.max_tokens_per_source,
+                                          include_raw_content=True)
+        return state
+
+    async def _search(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        limiter = self.rate_limiter.get(*WEB_SEARCH_KEY) if self.rate_limiter is not None else None
+        if limiter is None:
+            return await self._run_node(state=state, config=config)
+
+        async with limiter.limit(requests=len(state.search_queries)):
+            try:
+                return await self._run_node(state=state, config=config)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    limiter.on_rate_limited(retry_after=get_retry_after(e))
+                raise
+
+    async def _run_node(self, state: SearchState, config: RunnableConfig) -> SearchState:
+        if inspect.iscoroutinefunction(self.web_search_node.run):
+            return await self.web_search_node.run(state, config)
+        return await asyncio.to_thread(self.web_search_node.run, state, config)
+
+    async def search_query(self,
+                           state: SearchState,
+                           query: SearchQuery,
+                           config: RunnableConfig,
+                           configurable: Configuration) -> list[dict[str, Any]]:
+        """Sources of a single query, served from the cache if there is one."""
+        if self.cache is None:
+            return await self._search_single(state=state, query=query, config=config)
+
+        search_params = {
+            'search_depth': configurable.search_depth,
+            'search_category': configurable.search_category,
+            'number_of_days_back': configurable.number_of_days_back,
+            'max_results_per_query': configurable.max_results_per_query,
+            'chunks_per_source': configurable.chunks_per_source,
+        }
+        key = make_cache_key(normalize_query(query.search_query), search_params)
+        # SQLite I/O off the event loop, like `SqliteCheckpointer`
+        sources = await asyncio.to_thread(self.cache.get, key=key)
+        if sources is None:
+            sources = await self._search_single(state=state, query=query, config=config)
+            await asyncio.to_thread(self.cache.set, key=key, value=sources)
+        return sources
+
+    async def _search_single(self, state: SearchState, query: SearchQuery, config: RunnableConfig) -> list[dict[str, Any]]:
+        # Shallow copy: token_usage stays shared with the original state so any usage is still accounted for.
+        query_state = state.model_copy(update={'search_queries': [query], 'steps': [], 'unique_sources': {}, 'source_str': ''})
+        query_state = await self._search(state=query_state, config=config)
+        return list(query_state.unique_sources.values())
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import Field
 from ai_common import CfgBase, TavilySearchCategory, TavilySearchDepth
 
@@ -16,3 +17,20 @@ class Configuration(CfgBase):
     include_image_descriptions: bool = Field(default=False)
     include_favicon: bool = Field(default=False)
     strip_thinking_tokens: bool = Field(default=True)
+    incremental_note_taking: bool = Field(default=True)
+    rule_based_review: bool = Field(default=False, description="Decide obvious fields without the LLM reviewer")
+    fact_check_retrieval: bool = Field(default=False, description="Fact check against retrieved chunks instead of all sources")
+    fact_check_top_k: int = Field(default=3, gt=0)  # chunks retrieved per field
+    fact_check_chunk_size: int = Field(default=200, gt=0)  # words
+    fact_check_chunk_overlap: int = Field(default=40, ge=0)  # words
+    fact_check_shard_size: int = Field(default=0, ge=0)  # fields per concurrent fact-check call, 0: single call
+    fact_check_max_concurrency: int = Field(default=4, gt=0)
+    near_duplicate_threshold: Optional[float] = Field(default=None, gt=0, le=1)  # Jaccard similarity, None: off
+    shingle_size: int = Field(default=5, gt=0)  # words per shingle for near-duplicate detection
+    linkedin_verification: bool = Field(default=False, description="Verify LinkedIn pages before note taking")
+    linkedin_max_concurrency: int = Field(default=4, gt=0)  # concurrent LinkedIn verifications
+    model_cascade: bool = Field(default=False, description="Extract and review on language_model, escalate failing fields to reasoning_model")
+    pipelined_extraction: bool = Field(default=False, description="Start note taking on each query's results as they arrive")
+    max_input_tokens_per_run: Optional[int] = Field(default=None, gt=0)  # None: unlimited
+    max_output_tokens_per_run: Optional[int] = Field(default=None, gt=0)  # None: unlimited
+    max_cost_usd_per_run: Optional[float] = Field(default=None, gt=0)  # None: unlimited
@@ -12,8 +12,10 @@ class Node(NodeBase):
     model_config = ConfigDict(frozen=True)
 
     # Class attributes
+    ESCALATOR: ClassVar[str] = 'escalator'
     FACT_CHECKER: ClassVar[str] = 'fact_checker'
     LINKEDIN_FINDER: ClassVar[str] = 'linkedin_finder'
     NOTE_TAKER: ClassVar[str] = 'note_taker'
     NOTE_REVIEWER: ClassVar[str] = 'note_reviewer'
     RESET: ClassVar[str] = 'reset'
+    SEARCH_PIPELINE: ClassVar[str] = 'search_pipeline'
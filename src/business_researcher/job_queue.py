@@ -0,0 +1,228 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+PENDING: str = 'pending'
+LEASED: str = 'leased'
+DONE: str = 'done'
+DEAD: str = 'dead'
+
+
+class JobRetryPolicy(BaseModel):
+    """
+    Lease and retry settings of a `SqliteJobQueue`.
+
+    Attributes:
+        lease_seconds: A leased job that is not completed, failed or heartbeated within this many seconds is
+            handed to another worker (its worker is assumed to have crashed).
+        max_attempts: A job that failed or lost its lease this many times is moved to the dead letters.
+        retry_delay_seconds: Delay before a failed job is retried; doubles with every attempt.
+    """
+    lease_seconds: float = Field(default=300, gt=0)
+    max_attempts: int = Field(default=3, gt=0)
+    retry_delay_seconds: float = Field(default=5, ge=0)
+
+
+class SqliteJobQueue:
+    """
+    Durable job queue in a local SQLite file, shared by the processes of a `WorkerPool`.
+
+    A job moves from 'pending' to 'leased' (owned by one worker until its lease expires) to 'done', or back to
+    'pending' for a retry, or to 'dead' after `max_attempts`. Finished jobs (done or dead) get an increasing
+    `finished_seq` so their results can be merged into one stream in completion order; they are marked as
+    delivered once consumed, so after a crash undelivered results are delivered again (at least once).
+
+    Jobs are enqueued with a unique key, so enqueueing the same input again (e.g. after a restart) is a no-op.
+    """
+
+    def __init__(self, path: str, retry_policy: Optional[JobRetryPolicy] = None) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.retry_policy = retry_policy if retry_policy is not None else JobRetryPolicy()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=60)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, lease_until REAL, worker TEXT, '
+            'result TEXT, error TEXT, finished_seq INTEGER, delivered INTEGER NOT NULL DEFAULT 0)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (delivered, finished_seq)')
+
+    def enqueue(self, jobs: Iterable[tuple[str, dict[str, Any]]], chunk_size: int = 1000) -> int:
+        """Add (key, payload) jobs, consuming `jobs` lazily in chunks. Returns the number of new jobs."""
+        added = 0
+        chunk = []
+        for key, payload in jobs:
+            chunk.append((key, json.dumps(payload), PENDING, time.time()))
+            if len(chunk) >= chunk_size:
+                added += self._insert(rows=chunk)
+                chunk = []
+        if len(chunk) > 0:
+            added += self._insert(rows=chunk)
+        return added
+
+    def _insert(self, rows: list[tuple]) -> int:
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                before = self._connection.total_changes
+                cursor.executemany('INSERT OR IGNORE INTO jobs (key, payload, status, available_at) VALUES (?, ?, ?, ?)',
+                                   rows)
+                added = self._connection.total_changes - before
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+        return added
+
+    def reject(self, jobs: Iterable[tuple[str, dict[str, Any], str]]) -> int:
+        """
+        Add (key, payload, error) jobs that must not run (e.g. invalid inputs) straight to the dead letters, so they
+        are reported like any other finished job. Keys already in the queue are skipped. Returns the number of
+        new jobs.
+        """
+        added = 0
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                for key, payload, error in jobs:
+                    cursor.execute('INSERT OR IGNORE INTO jobs (key, payload, status, available_at) VALUES (?, ?, ?, ?)',
+                                   (key, json.dumps(payload), PENDING, time.time()))
+                    if cursor.rowcount > 0:
+                        self._finish(cursor=cursor, job_id=cursor.lastrowid, status=DEAD, result=None, error=error)
+                        added += 1
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+        return added
+
+    def lease(self, worker: str, max_jobs: int = 1) -> list[tuple[int, dict[str, Any]]]:
+        """
+        Lease up to `max_jobs` available jobs to `worker` and return their (id, payload).
+
+        Jobs whose lease expired count as a failed attempt; those out of attempts are dead-lettered instead.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                expired = cursor.execute(
+                    'SELECT id FROM jobs WHERE status = ? AND lease_until < ? AND attempts >= ?',
+                    (LEASED, now, self.retry_policy.max_attempts)
+                ).fetchall()
+                for (job_id,) in expired:
+                    self._finish(cursor=cursor, job_id=job_id, status=DEAD, result=None, error='Lease expired')
+
+                rows = cursor.execute(
+                    'SELECT id, payload FROM jobs WHERE (status = ? AND available_at <= ?) '
+                    'OR (status = ? AND lease_until < ?) ORDER BY id LIMIT ?',
+                    (PENDING, now, LEASED, now, max_jobs)
+                ).fetchall()
+                cursor.executemany(
+                    'UPDATE jobs SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?',
+                    [(LEASED, worker, now + self.retry_policy.lease_seconds, job_id) for job_id, _ in rows]
+                )
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+        return [(job_id, json.loads(payload)) for job_id, payload in rows]
+
+    def heartbeat(self, job_ids: Iterable[int], worker: str) -> None:
+        """Extend the leases `worker` still holds on `job_ids`."""
+        lease_until = time.time() + self.retry_policy.lease_seconds
+        with self._lock:
+            self._connection.executemany('UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?',
+                                         [(lease_until, job_id, worker, LEASED) for job_id in job_ids])
+
+    def complete(self, job_id: int, worker: str, result: dict[str, Any]) -> bool:
+        """Store the result of a job. Returns False if `worker` no longer holds the lease (the result is dropped)."""
+        return self._settle(job_id=job_id, worker=worker, result=result, error=None)
+
+    def fail(self, job_id: int, worker: str, error: str, is_retriable: bool = True) -> bool:
+        """
+        Schedule a retry with exponential backoff, or dead-letter the job when it is out of attempts or the error
+        is not retriable (e.g. an invalid input that fails the same way on every attempt).
+        """
+        return self._settle(job_id=job_id, worker=worker, result=None, error=error, is_retriable=is_retriable)
+
+    def _settle(self, job_id: int, worker: str, result: Optional[dict[str, Any]], error: Optional[str],
+                is_retriable: bool = True) -> bool:
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                row = cursor.execute('SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?',
+                                     (job_id, worker, LEASED)).fetchone()
+                if row is not None:
+                    if error is None:
+                        self._finish(cursor=cursor, job_id=job_id, status=DONE, result=result, error=None)
+                    elif (not is_retriable) or (row[0] >= self.retry_policy.max_attempts):
+                        self._finish(cursor=cursor, job_id=job_id, status=DEAD, result=None, error=error)
+                    else:
+                        delay = self.retry_policy.retry_delay_seconds * 2 ** (row[0] - 1)
+                        cursor.execute('UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL, error = ?, '
+                                       'available_at = ? WHERE id = ?',
+                                       (PENDING, error, time.time() + delay, job_id))
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+        return row is not None
+
+    @staticmethod
+    def _finish(cursor: sqlite3.Cursor, job_id: int, status: str, result: Optional[dict[str, Any]],
+                error: Optional[str]) -> None:
+        cursor.execute(
+            'UPDATE jobs SET status = ?, result = ?, error = ?, worker = NULL, lease_until = NULL, '
+            'finished_seq = (SELECT COALESCE(MAX(finished_seq), 0) + 1 FROM jobs) WHERE id = ?',
+            (status, json.dumps(result, default=str) if result is not None else None, error, job_id)
+        )
+
+    def get_finished(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Undelivered finished jobs in completion order."""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT finished_seq, id, key, payload, status, attempts, result, error FROM jobs '
+                'WHERE delivered = 0 AND finished_seq IS NOT NULL ORDER BY finished_seq LIMIT ?', (limit,)
+            ).fetchall()
+        return [{'seq': seq, 'job_id': job_id, 'key': key, 'payload': json.loads(payload), 'status': status,
+                 'attempts': attempts, 'result': json.loads(result) if result is not None else None, 'error': error}
+                for seq, job_id, key, payload, status, attempts, result, error in rows]
+
+    def mark_delivered(self, job_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._connection.executemany('UPDATE jobs SET delivered = 1 WHERE id = ?', [(i,) for i in job_ids])
+
+    def requeue_dead(self) -> int:
+        """Give dead-lettered jobs a fresh set of attempts. Returns the number of requeued jobs."""
+        with self._lock:
+            cursor = self._connection.execute(
+                'UPDATE jobs SET status = ?, attempts = 0, available_at = ?, error = NULL, finished_seq = NULL, '
+                'delivered = 0 WHERE status = ?', (PENDING, time.time(), DEAD)
+            )
+        return cursor.rowcount
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            rows = self._connection.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        return {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0} | dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
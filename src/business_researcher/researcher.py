@@ -1,42 +1,165 @@
 import asyncio
-from typing import Any, Final
+import contextlib
+import copy
+import functools
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Any, Final, Optional
 from uuid import uuid4
 
 from ai_common import GraphBase
 from ai_common.components import WebSearchNode
 from langgraph.graph import START, END, StateGraph
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.runnables import RunnableConfig
-from pydantic import SecretStr
+from pydantic import SecretStr, ValidationError
 
-from .components import QueryWriter, FactChecker, NoteTaker, NoteReviewer, is_review_successful, generate_info_str
+from .cache import Cache, SqliteCache
+from .checkpoint import CheckpointManager, CheckpointRetention
+from .components import (QueryWriter, FactChecker, LinkedinFinder, NoteTaker, NoteReviewer, WebSearch, Budget,
+                         Escalator, RateLimiter, SearchPipeline, get_search_mode, is_review_successful,
+                         needs_escalation, select_tier, generate_info_str, get_filled_fields, get_result_key,
+                         get_token_delta)
+from .components.artifacts import schema_artifacts
 from .configuration import Configuration
 from .enums import SearchType, Node
+from .schema import PersonSchema, CompanySchema
 from .state import SearchState, Person, Company
+from .telemetry import instrument_node
 
 
 class BusinessResearcher(GraphBase):
+    """
+    Researches persons and companies with a LangGraph workflow.
 
-    def __init__(self, llm_config: dict[str, Any], web_search_api_key: SecretStr) -> None:
-        self.memory_saver = MemorySaver()
+    Checkpointing:
+        `checkpointer` is True (default) for an in-memory saver, False for no checkpoints at all (fire-and-forget
+        runs), or any LangGraph checkpointer such as `SqliteCheckpointer`. Checkpoints of finished threads are
+        dropped according to `checkpoint_retention` (default: keep the last 128 threads).
+
+    LinkedIn verification:
+        With `linkedin_config` ({'model', 'context_window_length', 'ollama_url'}), a LinkedinFinder stage runs
+        between web search and note taking for runs with `linkedin_verification` enabled. Its verdicts are
+        cached in `linkedin_cache` (default: in memory).
+
+    Rate limiting:
+        LLM calls and web searches go through `rate_limiter`, one token bucket and adaptive concurrency limit per
+        (model_provider, model). By default it is built from the optional 'rate_limit' entries of `llm_config`
+        (see `RateLimit`); models without one are not limited. Pass one `RateLimiter` to several researchers to
+        share a provider budget.
+
+    Model cascade:
+        With `model_cascade` enabled, note taking and review run on the language model. Fields that fail fact
+        checking (on the reasoning model) or are not found are re-extracted on the reasoning model by the
+        Escalator node. LLM calls and latency per tier are reported in `tier_stats`.
+
+    Pipelined extraction:
+        With `pipelined_extraction` enabled, the SearchPipeline node replaces web search, LinkedIn verification
+        and note taking: every query's results are extracted as soon as they arrive, and the batches are merged
+        before fact checking.
+    """
+
+    def __init__(self,
+                 llm_config: dict[str, Any],
+                 web_search_api_key: SecretStr,
+                 search_cache: Optional[SqliteCache] = None,
+                 llm_cache: Optional[Cache] = None,
+                 result_store: Optional[Cache] = None,
+                 checkpointer: BaseCheckpointSaver | bool = True,
+                 checkpoint_retention: Optional[CheckpointRetention] = None,
+                 linkedin_config: Optional[dict[str, Any]] = None,
+                 linkedin_cache: Optional[Cache] = None,
+                 rate_limiter: Optional[RateLimiter] = None) -> None:
+        if checkpointer is True:
+            checkpointer = MemorySaver()
+        self.checkpointer = checkpointer if checkpointer is not False else None
+        self.checkpoint_manager = None
+        if self.checkpointer is not None:
+            self.checkpoint_manager = CheckpointManager(
+                checkpointer=self.checkpointer,
+                retention=checkpoint_retention if checkpoint_retention is not None else CheckpointRetention()
+            )
         self.models = list({llm_config['language_model']['model'], llm_config['reasoning_model']['model']})
         self.configuration_module_prefix: Final = 'business_researcher.configuration'
+        self.result_store = result_store
+        self.budget = Budget(llm_config=llm_config)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter.from_llm_config(llm_config)
 
         self.query_writer = QueryWriter(model_params = llm_config['language_model'],
-                                        configuration_module_prefix = self.configuration_module_prefix)
+                                        configuration_module_prefix = self.configuration_module_prefix,
+                                        llm_cache = llm_cache,
+                                        budget = self.budget,
+                                        rate_limiter = self.rate_limiter,
+                                        tier = 'language_model')
         self.web_search_node = WebSearchNode(model_params = llm_config['language_model'],
                                              web_search_api_key = web_search_api_key,
                                              configuration_module_prefix = self.configuration_module_prefix)
+        self.web_search = WebSearch(web_search_node = self.web_search_node,
+                                    configuration_module_prefix = self.configuration_module_prefix,
+                                    cache = search_cache,
+                                    rate_limiter = self.rate_limiter)
+        self.linkedin_finder = None
+        if linkedin_config is not None:
+            self.linkedin_finder = LinkedinFinder(model_name=linkedin_config['model'],
+                                                  context_window_length=linkedin_config['context_window_length'],
+                                                  ollama_url=linkedin_config['ollama_url'],
+                                                  configuration_module_prefix=self.configuration_module_prefix,
+                                                  verdict_cache=linkedin_cache)
         self.note_taker = NoteTaker(model_params=llm_config['reasoning_model'],
-                                    configuration_module_prefix=self.configuration_module_prefix)
+                                    configuration_module_prefix=self.configuration_module_prefix,
+                                    llm_cache=llm_cache,
+                                    budget=self.budget,
+                                    rate_limiter=self.rate_limiter)
         self.fact_checker = FactChecker(model_params=llm_config['reasoning_model'],
-                                        configuration_module_prefix=self.configuration_module_prefix)
+                                        configuration_module_prefix=self.configuration_module_prefix,
+                                        llm_cache=llm_cache,
+                                        budget=self.budget,
+                                        rate_limiter=self.rate_limiter)
         self.note_reviewer = NoteReviewer(model_params=llm_config['reasoning_model'],
-                                          configuration_module_prefix=self.configuration_module_prefix)
+                                          configuration_module_prefix=self.configuration_module_prefix,
+                                          llm_cache=llm_cache,
+                                          budget=self.budget,
+                                          rate_limiter=self.rate_limiter)
+        self.escalator = Escalator(note_taker=self.note_taker,
+                                   fact_checker=self.fact_checker,
+                                   configuration_module_prefix=self.configuration_module_prefix)
+        # Language model tier of the cascade
+        self.fast_note_taker = NoteTaker(model_params=llm_config['language_model'],
+                                         configuration_module_prefix=self.configuration_module_prefix,
+                                         llm_cache=llm_cache,
+                                         budget=self.budget,
+                                         rate_limiter=self.rate_limiter,
+                                         tier='language_model')
+        self.fast_note_reviewer = NoteReviewer(model_params=llm_config['language_model'],
+                                               configuration_module_prefix=self.configuration_module_prefix,
+                                               llm_cache=llm_cache,
+                                               budget=self.budget,
+                                               rate_limiter=self.rate_limiter,
+                                               tier='language_model')
+        self.search_pipeline = SearchPipeline(web_search=self.web_search,
+                                              note_taker=self.note_taker,
+                                              configuration_module_prefix=self.configuration_module_prefix,
+                                              linkedin_finder=self.linkedin_finder)
+        self.fast_search_pipeline = SearchPipeline(web_search=self.web_search,
+                                                   note_taker=self.fast_note_taker,
+                                                   configuration_module_prefix=self.configuration_module_prefix,
+                                                   linkedin_finder=self.linkedin_finder)
 
         self.graph = self.build_graph()
 
-    async def run(self, input_dict: dict[str, Any], config: RunnableConfig) -> dict[str, Any]:
+    @staticmethod
+    def validate_input(input_dict: dict[str, Any]) -> None:
+        """
+        Check an input dict without researching it.
+
+        Raises:
+            KeyError: If `search_type` is missing.
+            ValueError: If `search_type` is invalid or the entity cannot be built (e.g. no name).
+        """
+        BusinessResearcher._build_entity(input_dict=input_dict)
+
+    @staticmethod
+    def _build_entity(input_dict: dict[str, Any]) -> tuple[str, Optional[Person], Optional[Company]]:
         search_type = input_dict['search_type']
 
         # noinspection PyUnreachableCode
@@ -56,6 +179,10 @@ class BusinessResearcher(GraphBase):
                 )
             case _:
                 raise ValueError(f'Invalid search type! - Can be either {SearchType.PERSON} or {SearchType.COMPANY}')
+        return search_type, person, company
+
+    def _build_state(self, input_dict: dict[str, Any]) -> SearchState:
+        search_type, person, company = self._build_entity(input_dict=input_dict)
 
         in_state = SearchState(
             company=company,
@@ -74,15 +201,290 @@ class BusinessResearcher(GraphBase):
             unique_sources={},
         )
         in_state.topic = generate_info_str(state = in_state)
+        return in_state
+
+    def get_entity_key(self, input_dict: dict[str, Any]) -> str:
+        """Normalized key of the entity in `input_dict`, as used by the result store."""
+        return get_result_key(state=self._build_state(input_dict=input_dict))
+
+    async def run(self,
+                  input_dict: dict[str, Any],
+                  config: RunnableConfig,
+                  max_age: Optional[float] = None,
+                  force_refresh: bool = False) -> dict[str, Any]:
+        """
+        Research a single person or company.
+
+        When a result store is configured, a stored result for the same normalized entity is returned without
+        invoking the graph, provided it is younger than `max_age` seconds (if given) and the store's TTL.
+        `force_refresh` skips the lookup; the fresh result replaces the stored one either way.
+        """
+        in_state = self._build_state(input_dict=input_dict)
+
+        result_key = None
+        if self.result_store is not None:
+            result_key = get_result_key(state=in_state)
+            if not force_refresh:
+                out_dict = await self._get_stored_result(state=in_state, key=result_key, max_age=max_age)
+                if out_dict is not None:
+                    return out_dict
+
+        out_state = await self._ainvoke(graph_input=in_state, config=config)
+        return await self._get_output(out_state=out_state, result_key=result_key)
 
-        out_state = await self.graph.ainvoke(in_state, config)
+    async def resume(self, thread_id: str, config: Optional[RunnableConfig] = None) -> dict[str, Any]:
+        """
+        Continue an interrupted or failed research from its last checkpoint.
+
+        The graph restarts at the node that did not complete, using the persisted `SearchState`, so searches and
+        LLM calls of completed nodes are not repeated. Use a durable checkpointer (e.g. `SqliteCheckpointer`) to
+        resume across processes. When `config` is omitted, the configuration values recorded in the checkpoint
+        are reused. A thread that already finished returns its final output without invoking the graph.
+
+        Raises:
+            ValueError: If checkpointing is disabled, there is no checkpoint for `thread_id`, or `config` is omitted
+                and the checkpoint does not record the configuration.
+        """
+        if self.checkpointer is None:
+            raise ValueError('resume requires a checkpointer')
+
+        resume_config = RunnableConfig(**config) if config is not None else RunnableConfig(recursion_limit=100)
+        resume_config['configurable'] = {**resume_config.get('configurable', {}), 'thread_id': thread_id}
+        snapshot = await self.graph.aget_state(resume_config)
+        if not snapshot.values:
+            raise ValueError(f'No checkpoint found for thread {thread_id}')
+        if config is None:
+            recorded = {k: v for k, v in snapshot.metadata.items() if k in Configuration.model_fields}
+            missing = [k for k, field in Configuration.model_fields.items()
+                       if field.is_required() and (k not in recorded)]
+            if len(missing) > 0:
+                raise ValueError(f'The checkpoint of thread {thread_id} does not record {missing}; pass config')
+            resume_config['configurable'] = {**recorded, 'thread_id': thread_id}
+
+        result_key = None
+        if self.result_store is not None:
+            result_key = get_result_key(state=SearchState.model_validate(snapshot.values))
+
+        if len(snapshot.next) == 0:
+            return await self._get_output(out_state=snapshot.values, result_key=result_key)
+        out_state = await self._ainvoke(graph_input=None, config=resume_config)
+        return await self._get_output(out_state=out_state, result_key=result_key)
+
+    async def is_resumable(self, thread_id: str) -> bool:
+        """Whether `thread_id` has a checkpoint of an unfinished graph run."""
+        if self.checkpointer is None:
+            return False
+        snapshot = await self.graph.aget_state(RunnableConfig(configurable={'thread_id': thread_id}))
+        return bool(snapshot.values) and len(snapshot.next) > 0
+
+    def get_artifact_stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Hits, misses and hit rate of the memoized schemas, dynamic models and structured-output runnables."""
+        return {
+            'schema': schema_artifacts.stats(),
+            'note_taker': self.note_taker.artifacts.stats(),
+            'fast_note_taker': self.fast_note_taker.artifacts.stats(),
+            'fact_checker': self.fact_checker.artifacts.stats(),
+        }
+
+    async def _get_output(self, out_state: dict[str, Any], result_key: Optional[str]) -> dict[str, Any]:
         out_dict = {
-            'content': out_state['out_info'].model_dump(),
+            'content': out_state['out_info'].model_dump() if out_state['out_info'] is not None else None,
             'token_usage': out_state['token_usage'],
+            'saved_token_usage': out_state['saved_token_usage'],
+            'is_budget_exhausted': out_state['is_budget_exhausted'],
+            'skipped_llm_calls': out_state['skipped_llm_calls'],
+            'dropped_sources': out_state['dropped_sources'],
+            'spans': out_state['spans'],
+            'tier_stats': out_state['tier_stats'],
+            'is_cached': False,
         }
 
+        if self.result_store is not None and out_dict['content'] is not None:
+            # Off the event loop: a SqliteCache does disk I/O
+            await asyncio.to_thread(self.result_store.set, key=result_key,
+                                    value={'content': out_dict['content'], 'token_usage': out_dict['token_usage']})
         return out_dict
 
+    async def astream(self,
+                      input_dict: dict[str, Any],
+                      config: RunnableConfig,
+                      max_age: Optional[float] = None,
+                      force_refresh: bool = False) -> AsyncIterator[dict[str, Any]]:
+        """
+        Research a single person or company, yielding progress after every graph node.
+
+        Each node event contains:
+            - type: 'node'
+            - node: Name of the node that just finished
+            - iteration: Iteration counter after the node
+            - token_delta: Tokens used by the node, per model
+            - fields: Schema fields filled so far (from `out_info` once reviewed, else from `notes`)
+            - span: Timing and usage of the node (see `NodeSpan`)
+
+        The last event has type 'result' and carries the same `output` dict as `run`. A stored result is
+        yielded as the only event. Callers may stop at any time; closing the generator (e.g. with
+        `contextlib.aclosing`) cancels the graph run so no further calls are made.
+        """
+        in_state = self._build_state(input_dict=input_dict)
+
+        result_key = None
+        if self.result_store is not None:
+            result_key = get_result_key(state=in_state)
+            if not force_refresh:
+                out_dict = await self._get_stored_result(state=in_state, key=result_key, max_age=max_age)
+                if out_dict is not None:
+                    yield {'type': 'result', 'output': out_dict}
+                    return
+
+        token_usage = copy.deepcopy(in_state.token_usage)
+        out_state = None
+        async with self._track_thread(config=config):
+            async for chunk in self.graph.astream(in_state, config, stream_mode='updates'):
+                for node, out_state in chunk.items():
+                    yield {
+                        'type': 'node',
+                        'node': node,
+                        'iteration': out_state['iteration'],
+                        'token_delta': get_token_delta(token_usage=out_state['token_usage'], previous=token_usage),
+                        'fields': get_filled_fields(info=out_state['out_info'] if out_state['out_info'] is not None
+                                                    else out_state['notes']),
+                        'span': out_state['spans'][-1],
+                    }
+                    token_usage = copy.deepcopy(out_state['token_usage'])
+
+        yield {'type': 'result', 'output': await self._get_output(out_state=out_state, result_key=result_key)}
+
+    async def _ainvoke(self, graph_input: Optional[SearchState], config: RunnableConfig) -> dict[str, Any]:
+        async with self._track_thread(config=config):
+            return await self.graph.ainvoke(graph_input, config)
+
+    @contextlib.asynccontextmanager
+    async def _track_thread(self, config: RunnableConfig) -> AsyncIterator[None]:
+        """Report the graph run on the config's thread to the checkpoint manager (retention policy)."""
+        if self.checkpoint_manager is None:
+            yield
+            return
+
+        thread_id = config['configurable']['thread_id']
+        self.checkpoint_manager.start(thread_id=thread_id)
+        is_successful = False
+        try:
+            yield
+            is_successful = True
+        finally:
+            await self.checkpoint_manager.finish(thread_id=thread_id, is_successful=is_successful)
+
+    async def _get_stored_result(self, state: SearchState, key: str,
+                                 max_age: Optional[float]) -> Optional[dict[str, Any]]:
+        stored = await asyncio.to_thread(self.result_store.get, key=key, max_age=max_age)
+        if stored is None:
+            return None
+
+        schema = PersonSchema if state.search_type == SearchType.PERSON else CompanySchema
+        try:
+            content = schema.model_validate(stored['content']).model_dump()
+        except ValidationError:
+            # Stored with an older schema
+            await asyncio.to_thread(self.result_store.delete, key=key)
+            return None
+
+        return {
+            'content': content,
+            'token_usage': {m: {'input_tokens': 0, 'output_tokens': 0} for m in self.models},
+            'saved_token_usage': copy.deepcopy(stored['token_usage']),
+            'is_budget_exhausted': False,
+            'skipped_llm_calls': {},
+            'dropped_sources': {},
+            'spans': [],
+            'tier_stats': {},
+            'is_cached': True,
+        }
+
+    async def run_batch(self,
+                        inputs: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+                        config: RunnableConfig,
+                        concurrency: int = 8,
+                        max_age: Optional[float] = None,
+                        force_refresh: bool = False,
+                        max_resumes: int = 1) -> AsyncIterator[dict[str, Any]]:
+        """
+        Research many entities with a bounded number of graphs in flight.
+
+        Inputs are consumed lazily and results are yielded as soon as each entity finishes, so completion
+        order may differ from input order. Each yielded dict contains:
+            - index: Position of the entity in `inputs`
+            - input: The input dict of the entity
+            - content: Research output (None if the entity failed)
+            - token_usage: Token usage of the entity (None if the entity failed)
+            - thread_id: Graph thread of the entity, usable with `resume`
+            - resumes: Number of times the entity was resumed from its last checkpoint
+            - error: Error message if the entity failed, else None
+
+        A failing entity does not abort the batch. Every entity runs on its own `thread_id`.
+        `max_age` and `force_refresh` are passed to `run` for every entity. An entity that fails mid-graph is
+        resumed from its last checkpoint up to `max_resumes` times, so completed nodes are not paid for again.
+        """
+        if concurrency < 1:
+            raise ValueError(f'concurrency must be positive, got {concurrency}')
+        if max_resumes < 0:
+            raise ValueError(f'max_resumes must be non-negative, got {max_resumes}')
+
+        async def research(index: int, input_dict: dict[str, Any]) -> dict[str, Any]:
+            thread_id = str(uuid4())
+            entity_config = RunnableConfig(**config)
+            entity_config['configurable'] = {**config.get('configurable', {}), 'thread_id': thread_id}
+            resumes = 0
+            try:
+                out_dict = await self.run(input_dict=input_dict, config=entity_config,
+                                          max_age=max_age, force_refresh=force_refresh)
+            except Exception as e:
+                error = e
+                while resumes < max_resumes and await self.is_resumable(thread_id=thread_id):
+                    resumes += 1
+                    try:
+                        out_dict = await self.resume(thread_id=thread_id, config=entity_config)
+                        break
+                    except Exception as resume_error:
+                        error = resume_error
+                else:
+                    return {'index': index, 'input': input_dict, 'content': None, 'token_usage': None,
+                            'thread_id': thread_id, 'resumes': resumes, 'error': f'{type(error).__name__}: {error}'}
+            return {'index': index, 'input': input_dict, **out_dict, 'thread_id': thread_id, 'resumes': resumes,
+                    'error': None}
+
+        async def iterate_inputs() -> AsyncIterator[dict[str, Any]]:
+            if isinstance(inputs, AsyncIterable):
+                async for item in inputs:
+                    yield item
+            else:
+                for item in inputs:
+                    yield item
+
+        pending = set()
+        input_iterator = aiter(iterate_inputs())
+        index = 0
+        is_exhausted = False
+        try:
+            while True:
+                while not is_exhausted and len(pending) < concurrency:
+                    try:
+                        input_dict = await anext(input_iterator)
+                    except StopAsyncIteration:
+                        is_exhausted = True
+                        break
+                    pending.add(asyncio.create_task(research(index=index, input_dict=input_dict)))
+                    index += 1
+
+                if len(pending) == 0:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
     def get_response(self, input_dict: dict[str, Any], verbose: bool = False):
 
         config = RunnableConfig(
@@ -109,29 +511,67 @@ class BusinessResearcher(GraphBase):
         workflow = StateGraph(SearchState, context_schema=Configuration)
 
         ## Nodes
-        workflow.add_node(node=Node.QUERY_WRITER, action=self.query_writer.run)
-        workflow.add_node(node=Node.WEB_SEARCH, action=self.web_search_node.run)
-        workflow.add_node(node=Node.NOTE_TAKER, action=self.note_taker.run)
-        workflow.add_node(node=Node.FACT_CHECKER, action=self.fact_checker.run)
-        workflow.add_node(node=Node.NOTE_REVIEWER, action=self.note_reviewer.run)
+        workflow.add_node(node=Node.QUERY_WRITER, action=instrument_node(Node.QUERY_WRITER, self.query_writer.arun))
+        workflow.add_node(node=Node.WEB_SEARCH, action=instrument_node(Node.WEB_SEARCH, self.web_search.run))
+        workflow.add_node(node=Node.NOTE_TAKER,
+                          action=instrument_node(Node.NOTE_TAKER,
+                                                 select_tier(language_model_action=self.fast_note_taker.arun,
+                                                             reasoning_model_action=self.note_taker.arun,
+                                                             configuration_module_prefix=self.configuration_module_prefix)))
+        workflow.add_node(node=Node.SEARCH_PIPELINE,
+                          action=instrument_node(Node.SEARCH_PIPELINE,
+                                                 select_tier(language_model_action=self.fast_search_pipeline.arun,
+                                                             reasoning_model_action=self.search_pipeline.arun,
+                                                             configuration_module_prefix=self.configuration_module_prefix)))
+        workflow.add_node(node=Node.FACT_CHECKER, action=instrument_node(Node.FACT_CHECKER, self.fact_checker.arun))
+        workflow.add_node(node=Node.ESCALATOR, action=instrument_node(Node.ESCALATOR, self.escalator.arun))
+        workflow.add_node(node=Node.NOTE_REVIEWER,
+                          action=instrument_node(Node.NOTE_REVIEWER,
+                                                 select_tier(language_model_action=self.fast_note_reviewer.arun,
+                                                             reasoning_model_action=self.note_reviewer.arun,
+                                                             configuration_module_prefix=self.configuration_module_prefix)))
+        if self.linkedin_finder is not None:
+            workflow.add_node(node=Node.LINKEDIN_FINDER,
+                              action=instrument_node(Node.LINKEDIN_FINDER, self.linkedin_finder.arun))
 
         ## Edges
         workflow.add_edge(start_key=START, end_key=Node.QUERY_WRITER)
-        workflow.add_edge(start_key=Node.QUERY_WRITER, end_key=Node.WEB_SEARCH)
-        workflow.add_edge(start_key=Node.WEB_SEARCH, end_key=Node.NOTE_TAKER)
+        workflow.add_conditional_edges(
+            source=Node.QUERY_WRITER,
+            path=get_search_mode,
+            path_map={
+                'sequential': Node.WEB_SEARCH,
+                'pipelined': Node.SEARCH_PIPELINE,
+            }
+        )
+        if self.linkedin_finder is not None:
+            workflow.add_edge(start_key=Node.WEB_SEARCH, end_key=Node.LINKEDIN_FINDER)
+            workflow.add_edge(start_key=Node.LINKEDIN_FINDER, end_key=Node.NOTE_TAKER)
+        else:
+            workflow.add_edge(start_key=Node.WEB_SEARCH, end_key=Node.NOTE_TAKER)
         workflow.add_edge(start_key=Node.NOTE_TAKER, end_key=Node.FACT_CHECKER)
-        workflow.add_edge(start_key=Node.FACT_CHECKER, end_key=Node.NOTE_REVIEWER)
+        workflow.add_edge(start_key=Node.SEARCH_PIPELINE, end_key=Node.FACT_CHECKER)
+        workflow.add_conditional_edges(
+            source=Node.FACT_CHECKER,
+            path=needs_escalation,
+            path_map={
+                'escalate': Node.ESCALATOR,
+                'review': Node.NOTE_REVIEWER,
+            }
+        )
+        workflow.add_edge(start_key=Node.ESCALATOR, end_key=Node.NOTE_REVIEWER)
 
         workflow.add_conditional_edges(
             source=Node.NOTE_REVIEWER,
-            path=is_review_successful,
+            path=functools.partial(is_review_successful, budget=self.budget),
             path_map={
                 'successful': END,
                 'unsuccessful': Node.QUERY_WRITER,
-                'max_iter': END
+                'max_iter': END,
+                'budget': END,
             }
         )
 
         ## Compile graph
-        compiled_graph = workflow.compile(checkpointer=self.memory_saver)
+        compiled_graph = workflow.compile(checkpointer=self.checkpointer)
         return compiled_graph
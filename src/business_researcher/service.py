@@ -0,0 +1,187 @@
+"""
+Long-running service mode: one shared `BusinessResearcher` behind a local HTTP/JSON endpoint.
+
+Concurrent requests for the same normalized entity (`BusinessResearcher.get_entity_key`) with the same freshness
+(`max_age`, `force_refresh`) attach to the one in-flight research and share its result instead of running a second
+graph.
+
+    POST /research   {"name": "Stripe", "search_type": "company", "max_age": 86400, "force_refresh": false}
+    GET  /metrics    queue depth, in-flight researches and request counters as JSON
+    GET  /health     {"status": "ok"}
+"""
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Optional
+from uuid import uuid4
+
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel
+
+from .researcher import BusinessResearcher
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class ServiceMetrics(BaseModel):
+    """
+    Counters of a `ResearchService`.
+
+    Attributes:
+        queue_depth: Researches waiting for a concurrency slot.
+        in_flight: Researches running a graph.
+        requests_total: Research requests received.
+        coalesced_total: Requests that attached to an in-flight research of the same entity.
+        completed_total: Researches that finished successfully.
+        failed_total: Researches that raised an error.
+    """
+    queue_depth: int = 0
+    in_flight: int = 0
+    requests_total: int = 0
+    coalesced_total: int = 0
+    completed_total: int = 0
+    failed_total: int = 0
+
+
+class ResearchService:
+    """
+    Shares one `BusinessResearcher` between many concurrent callers.
+
+    At most `max_concurrency` graphs run at a time; further researches wait in a queue. A request for an entity
+    that is already queued or running does not start a new research: it waits for the in-flight one and gets the
+    same result (with `is_coalesced` set), provided it asks for the same freshness (`max_age`, `force_refresh`), so
+    a request never gets back a result staler than it allows. A caller that gives up (e.g. a disconnected HTTP
+    client) does not cancel a research other callers may be waiting for. Every research runs with `config` (which
+    must hold the required `Configuration` fields) on its own thread.
+    """
+
+    def __init__(self,
+                 researcher: BusinessResearcher,
+                 config: RunnableConfig,
+                 max_concurrency: int = 8):
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be positive, got {max_concurrency}')
+        self.researcher = researcher
+        self.config = config
+        self.metrics = ServiceMetrics()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: dict[tuple[str, Optional[float], bool], asyncio.Task] = {}
+
+    async def research(self,
+                       input_dict: dict[str, Any],
+                       max_age: Optional[float] = None,
+                       force_refresh: bool = False) -> dict[str, Any]:
+        """Research an entity, or wait for the in-flight research of the same entity. Raises what `run` raises."""
+        self.metrics.requests_total += 1
+        key = (self.researcher.get_entity_key(input_dict=input_dict), max_age, force_refresh)
+
+        task = self._in_flight.get(key)
+        is_coalesced = task is not None
+        if is_coalesced:
+            self.metrics.coalesced_total += 1
+        else:
+            task = asyncio.create_task(self._research(input_dict=input_dict, max_age=max_age,
+                                                      force_refresh=force_refresh))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        out_dict = await asyncio.shield(task)
+        return {**out_dict, 'is_coalesced': is_coalesced}
+
+    async def _research(self, input_dict: dict[str, Any], max_age: Optional[float],
+                        force_refresh: bool) -> dict[str, Any]:
+        config = RunnableConfig(**self.config)
+        config['configurable'] = {**self.config.get('configurable', {}), 'thread_id': str(uuid4())}
+
+        self.metrics.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.metrics.queue_depth -= 1
+
+        self.metrics.in_flight += 1
+        try:
+            out_dict = await self.researcher.run(input_dict=input_dict, config=config,
+                                                 max_age=max_age, force_refresh=force_refresh)
+        except Exception:
+            self.metrics.failed_total += 1
+            raise
+        finally:
+            self.metrics.in_flight -= 1
+            self._semaphore.release()
+        self.metrics.completed_total += 1
+        return out_dict
+
+    async def handle_request(self, method: str, path: str, body: bytes) -> tuple[HTTPStatus, dict[str, Any]]:
+        """Route one HTTP request and return (status, JSON response)."""
+        match (method, path):
+            case ('GET', '/health'):
+                return HTTPStatus.OK, {'status': 'ok'}
+            case ('GET', '/metrics'):
+                return HTTPStatus.OK, self.metrics.model_dump()
+            case ('POST', '/research'):
+                pass
+            case (_, '/health' | '/metrics' | '/research'):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f'{method} is not allowed on {path}'}
+            case _:
+                return HTTPStatus.NOT_FOUND, {'error': f'Unknown path {path}'}
+
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict):
+                raise ValueError('The request body must be a JSON object')
+            input_dict = {k: request[k] for k in ('name', 'company', 'email', 'search_type') if k in request}
+            self.researcher.get_entity_key(input_dict=input_dict)
+            max_age = request.get('max_age')
+            if max_age is not None and (isinstance(max_age, bool) or not isinstance(max_age, (int, float))):
+                raise ValueError('max_age must be a number')
+            force_refresh = request.get('force_refresh', False)
+            if not isinstance(force_refresh, bool):
+                raise ValueError('force_refresh must be a boolean')
+        except (ValueError, KeyError) as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f'{type(e).__name__}: {e}'}
+
+        try:
+            out_dict = await self.research(input_dict=input_dict, max_age=max_age, force_refresh=force_refresh)
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'{type(e).__name__}: {e}'}
+        return HTTPStatus.OK, out_dict
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve a single HTTP/1.1 request per connection."""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            content_length = headers.get('content-length', '0')
+            if len(request_line) < 2:
+                status, response = HTTPStatus.BAD_REQUEST, {'error': 'Malformed request line'}
+            elif not (content_length.isascii() and content_length.isdigit()):
+                status, response = HTTPStatus.BAD_REQUEST, {'error': f'Invalid Content-Length {content_length!r}'}
+            elif int(content_length) > MAX_BODY_BYTES:
+                status, response = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'Request body is too large'}
+            else:
+                body = await reader.readexactly(int(content_length))
+                status, response = await self.handle_request(method=request_line[0].upper(),
+                                                             path=request_line[1].split('?')[0],
+                                                             body=body)
+
+            payload = json.dumps(response, default=str).encode()
+            writer.write(f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                         f'Content-Type: application/json\r\n'
+                         f'Content-Length: {len(payload)}\r\n'
+                         f'Connection: close\r\n\r\n'.encode('latin-1') + payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080) -> None:
+        """Serve the HTTP endpoint until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+        async with server:
+            await server.serve_forever()
@@ -61,6 +61,15 @@ class SearchState(BaseModel):
         company (Optional[Company]): Company entity information when search_type is 'company'.
             Contains company name and optional email for targeted research.
 
+        dropped_sources (dict[str, str]): URLs of sources dropped as near-duplicates, mapped to the URL of
+            the kept source they duplicate. Keeps provenance of the deduplicated content.
+
+        escalation_fields (list[str]): With `model_cascade`, fields of the current iteration that failed fact
+            checking after extraction on the language model and are re-extracted on the reasoning model next.
+
+        is_budget_exhausted (bool): Set once the per-run token/cost budget is exhausted. Nodes skip their
+            LLM and search calls from then on and the graph ends with the 'budget' outcome.
+
         is_review_successful (bool): Flag indicating whether the review process
             completed successfully. Used to determine if extracted information
             meets quality standards and research objectives.
@@ -81,6 +90,12 @@ class SearchState(BaseModel):
             Contains person name, optional email, and company affiliation for
             targeted biographical and professional research.
 
+        processed_sources (list[str]): Keys of unique_sources that NoteTaker has already extracted
+            information from. Used for incremental note taking across iterations.
+
+        saved_token_usage (dict): Tokens that were not spent because the LLM response was served from
+            the response cache. Same structure as token_usage.
+
         search_focus (list[str]): Specific areas or topics to focus research efforts.
             Guides query generation and information extraction to ensure
             comprehensive coverage of required information domains.
@@ -93,14 +108,23 @@ class SearchState(BaseModel):
             Determines which schemas, templates, and validation rules are applied
             throughout the research workflow.
 
+        skipped_llm_calls (dict[str, int]): Number of LLM calls each node skipped because the outcome could be
+            decided without the model (e.g. rule-based review, no new sources to take notes from).
+
         source_str (str): Concatenated raw source content from all search results.
             Serves as the primary input for information extraction and includes
             web search results, documents, and other research materials.
 
+        spans (list[dict]): One `NodeSpan` dump per executed graph node, with wall and wait time, token usage,
+            LLM calls, cache hits, retries and prompt size. Exported with `spans_to_jsonl`/`spans_to_prometheus`.
+
         steps (list[str]): Chronological list of processing steps completed.
             Tracks workflow progress, enables debugging, and supports resume
             functionality by identifying completed vs. pending operations.
 
+        tier_stats (dict[str, dict]): LLM calls and their total latency in seconds per model tier
+            ('language_model', 'reasoning_model'). Structure: {tier: {'llm_calls': int, 'latency': float}}
+
         token_usage (dict): Comprehensive token consumption tracking by model.
             Structure: {model_name: {'input_tokens': int, 'output_tokens': int}}
             Supports cost monitoring, optimization, and resource planning.
@@ -140,16 +164,24 @@ class SearchState(BaseModel):
         - Schema objects (PersonSchema/CompanySchema) provide structured validation
     """
     company: Optional[Company] = None
+    dropped_sources: dict[str, str] = {}
+    escalation_fields: list[str] = []
+    is_budget_exhausted: bool = False
     is_review_successful: bool
     iteration: int
     notes: PersonSchema | CompanySchema | None
     out_info: PersonSchema | CompanySchema | None
     person: Optional[Person] = None
+    processed_sources: list[str] = []
+    saved_token_usage: dict = {}
     search_focus: list[str]
     search_queries: list[SearchQuery]
     search_type: str  # 'person' or 'company'
+    skipped_llm_calls: dict[str, int] = {}
     source_str: str
+    spans: list[dict] = []
     steps: list[str]
+    tier_stats: dict[str, dict] = {}
     token_usage: dict
     topic: str
     unique_sources: dict[str, Any]
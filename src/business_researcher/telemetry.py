@@ -0,0 +1,133 @@
+import functools
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel
+
+from .state import SearchState
+
+METRIC_PREFIX = 'business_researcher_node'
+
+
+class NodeSpan(BaseModel):
+    """
+    Timing and usage of a single graph node execution.
+
+    Attributes:
+        node: Name of the graph node.
+        iteration: Research iteration the node ran in.
+        started_at: Unix time the node started.
+        wall_time: Seconds from node start to node end.
+        wait_time: Seconds between the end of the previous node of the run and the start of this one
+            (graph scheduling and event loop queueing; includes downtime when a run is resumed).
+        input_tokens: Input tokens the node consumed, over all models.
+        output_tokens: Output tokens the node produced, over all models.
+        llm_calls: LLM calls sent to a provider.
+        cache_hits: LLM calls served from the response cache.
+        retries: Failed LLM attempts that were retried.
+        prompt_chars: Characters sent to LLMs in prompts.
+    """
+    node: str
+    iteration: int
+    started_at: float
+    wall_time: float = 0.0
+    wait_time: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    llm_calls: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+    prompt_chars: int = 0
+
+
+current_span: ContextVar[Optional[NodeSpan]] = ContextVar('current_span', default=None)
+
+
+class RetryCounter(BaseCallbackHandler):
+    """Counts failed LLM attempts (each one is retried by `with_retry` or surfaces as an error) on the current span."""
+
+    def __init__(self, span: NodeSpan):
+        self.span = span
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        self.span.retries += 1
+
+
+def get_total_tokens(token_usage: dict[str, dict[str, int]]) -> tuple[int, int]:
+    return (sum(u['input_tokens'] for u in token_usage.values()),
+            sum(u['output_tokens'] for u in token_usage.values()))
+
+
+def instrument_node(node: str, action: Callable[[SearchState, RunnableConfig], Awaitable[SearchState]]):
+    """Wrap a graph node so that every execution appends a `NodeSpan` to `state.spans`."""
+
+    @functools.wraps(action)
+    async def instrumented(state: SearchState, config: RunnableConfig) -> SearchState:
+        started_at = time.time()
+        t0 = time.perf_counter()
+        input_tokens, output_tokens = get_total_tokens(token_usage=state.token_usage)
+        span = NodeSpan(node=str(node), iteration=state.iteration, started_at=started_at)
+        if len(state.spans) > 0:
+            previous = state.spans[-1]
+            span.wait_time = max(started_at - previous['started_at'] - previous['wall_time'], 0.0)
+
+        token = current_span.set(span)
+        try:
+            out_state = await action(state, config)
+        finally:
+            current_span.reset(token)
+
+        span.wall_time = time.perf_counter() - t0
+        end_input_tokens, end_output_tokens = get_total_tokens(token_usage=out_state.token_usage)
+        span.input_tokens = end_input_tokens - input_tokens
+        span.output_tokens = end_output_tokens - output_tokens
+        out_state.spans.append(span.model_dump())
+        return out_state
+
+    return instrumented
+
+
+def spans_to_jsonl(spans: Iterable[dict[str, Any]], **labels: Any) -> str:
+    """One JSON object per span; `labels` (e.g. thread_id) are added to every line."""
+    return ''.join(json.dumps({**labels, **span}) + '\n' for span in spans)
+
+
+def spans_to_prometheus(spans: Iterable[dict[str, Any]]) -> str:
+    """Aggregate spans per node into Prometheus text exposition format."""
+    metrics = {
+        'wall_seconds': ('summary', 'Node wall time in seconds'),
+        'wait_seconds': ('summary', 'Time a node waited after the previous node ended, in seconds'),
+        'input_tokens_total': ('counter', 'Input tokens consumed by the node'),
+        'output_tokens_total': ('counter', 'Output tokens produced by the node'),
+        'llm_calls_total': ('counter', 'LLM calls sent to a provider'),
+        'cache_hits_total': ('counter', 'LLM calls served from the response cache'),
+        'retries_total': ('counter', 'Failed LLM attempts'),
+        'prompt_chars_total': ('counter', 'Prompt characters sent to LLMs'),
+    }
+    totals: dict[str, dict[str, float]] = {}
+    for span in spans:
+        node_totals = totals.setdefault(span['node'], {m: 0 for m in metrics} | {'count': 0})
+        node_totals['count'] += 1
+        node_totals['wall_seconds'] += span['wall_time']
+        node_totals['wait_seconds'] += span['wait_time']
+        for m in metrics:
+            if m.endswith('_total'):
+                node_totals[m] += span[m.removesuffix('_total')]
+
+    lines = []
+    for m, (metric_type, description) in metrics.items():
+        name = f'{METRIC_PREFIX}_{m}'
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for node, node_totals in totals.items():
+            if metric_type == 'summary':
+                lines.append(f'{name}_sum{{node="{node}"}} {node_totals[m]}')
+                lines.append(f'{name}_count{{node="{node}"}} {node_totals["count"]}')
+            else:
+                lines.append(f'{name}{{node="{node}"}} {node_totals[m]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,204 @@
+import asyncio
+import multiprocessing
+import os
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from typing import Any, Optional
+from uuid import uuid4
+
+from langchain_core.runnables import RunnableConfig
+
+from .job_queue import DEAD, LEASED, PENDING, JobRetryPolicy, SqliteJobQueue
+from .researcher import BusinessResearcher
+
+
+async def work(queue_path: str,
+               retry_policy: JobRetryPolicy,
+               researcher_factory: Callable[[], BusinessResearcher],
+               config: RunnableConfig,
+               concurrency: int,
+               poll_interval: float) -> None:
+    """Lease and research jobs until the queue has no pending or leased job left."""
+    worker = f'{os.getpid()}-{uuid4().hex[:8]}'
+    queue = SqliteJobQueue(path=queue_path, retry_policy=retry_policy)
+    researcher = researcher_factory()
+    running: dict[asyncio.Task, int] = {}
+
+    async def process(job_id: int, input_dict: dict[str, Any]) -> None:
+        thread_id = str(uuid4())
+        job_config = RunnableConfig(**config)
+        job_config['configurable'] = {**config.get('configurable', {}), 'thread_id': thread_id}
+        try:
+            BusinessResearcher.validate_input(input_dict=input_dict)
+        except (KeyError, ValueError) as e:
+            # Fails the same way on every attempt: dead-letter right away
+            await asyncio.to_thread(queue.fail, job_id=job_id, worker=worker, error=f'{type(e).__name__}: {e}',
+                                    is_retriable=False)
+            return
+        try:
+            out_dict = await researcher.run(input_dict=input_dict, config=job_config)
+        except Exception as e:
+            await asyncio.to_thread(queue.fail, job_id=job_id, worker=worker, error=f'{type(e).__name__}: {e}')
+            return
+        result = {'content': out_dict['content'], 'token_usage': out_dict['token_usage'],
+                  'is_cached': out_dict['is_cached'], 'thread_id': thread_id}
+        await asyncio.to_thread(queue.complete, job_id=job_id, worker=worker, result=result)
+
+    async def heartbeat() -> None:
+        while True:
+            await asyncio.sleep(retry_policy.lease_seconds / 3)
+            if len(running) > 0:
+                await asyncio.to_thread(queue.heartbeat, job_ids=list(running.values()), worker=worker)
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    try:
+        while True:
+            if len(running) < concurrency:
+                for job_id, input_dict in await asyncio.to_thread(queue.lease, worker=worker,
+                                                                  max_jobs=concurrency - len(running)):
+                    running[asyncio.create_task(process(job_id=job_id, input_dict=input_dict))] = job_id
+
+            if len(running) == 0:
+                counts = await asyncio.to_thread(queue.counts)
+                if counts[PENDING] == 0 and counts[LEASED] == 0:
+                    break
+                # Retries waiting for their backoff, or jobs leased by other workers that may still expire
+                await asyncio.sleep(poll_interval)
+                continue
+
+            done, _ = await asyncio.wait(running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.pop(task)
+    finally:
+        heartbeat_task.cancel()
+        queue.close()
+
+
+def run_worker(queue_path: str,
+               retry_policy: JobRetryPolicy,
+               researcher_factory: Callable[[], BusinessResearcher],
+               config: RunnableConfig,
+               concurrency: int,
+               poll_interval: float) -> None:
+    """Process entry point of a pool worker."""
+    asyncio.run(work(queue_path=queue_path, retry_policy=retry_policy, researcher_factory=researcher_factory,
+                     config=config, concurrency=concurrency, poll_interval=poll_interval))
+
+
+class WorkerPool:
+    """
+    Researches the jobs of a `SqliteJobQueue` in several worker processes.
+
+    Each of the `processes` workers builds its own `BusinessResearcher` with `researcher_factory` (which must be
+    picklable, e.g. a module-level function or a `functools.partial` of one) and runs up to `concurrency` jobs at
+    a time with `config`. Jobs are leased, so the jobs of a worker that crashes are picked up by the others once their lease
+    expires; failed jobs are retried with backoff and dead-lettered after `max_attempts` (see `JobRetryPolicy`).
+    Invalid inputs are dead-lettered right away instead of being retried.
+    Workers that exit while jobs remain are restarted.
+
+    `run` merges the finished jobs of all workers into one stream, in completion order. Each item contains:
+        - job_id, key: Job id and the key it was enqueued with
+        - input: The input dict of the entity
+        - status: 'done', or 'dead' if the job ran out of attempts
+        - attempts: Number of times the job was leased
+        - content, token_usage, is_cached, thread_id: Research output (None for dead jobs)
+        - error: Last error of the job, None if it is done
+
+    The queue file is durable: after a crash of the whole pool, enqueueing the same keys again is a no-op and
+    `run` continues with the unfinished jobs. Results are delivered at least once.
+    """
+
+    def __init__(self,
+                 queue_path: str,
+                 researcher_factory: Callable[[], BusinessResearcher],
+                 config: RunnableConfig,
+                 processes: Optional[int] = None,
+                 concurrency: int = 4,
+                 retry_policy: Optional[JobRetryPolicy] = None,
+                 poll_interval: float = 0.5):
+        if concurrency < 1:
+            raise ValueError(f'concurrency must be positive, got {concurrency}')
+        self.queue_path = queue_path
+        self.researcher_factory = researcher_factory
+        self.config = config
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        self.concurrency = concurrency
+        self.retry_policy = retry_policy if retry_policy is not None else JobRetryPolicy()
+        self.poll_interval = poll_interval
+        self.queue = SqliteJobQueue(path=queue_path, retry_policy=self.retry_policy)
+        self.restarts = 0
+
+    def enqueue(self, jobs: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        """
+        Add (key, input_dict) jobs; keys already in the queue are skipped. Returns the number of new jobs.
+
+        Inputs that fail `BusinessResearcher.validate_input` are dead-lettered right away instead of being retried.
+        """
+        rejected = []
+
+        def valid_jobs() -> Iterator[tuple[str, dict[str, Any]]]:
+            for key, input_dict in jobs:
+                try:
+                    BusinessResearcher.validate_input(input_dict=input_dict)
+                except (KeyError, ValueError) as e:
+                    rejected.append((key, input_dict, f'{type(e).__name__}: {e}'))
+                    continue
+                yield key, input_dict
+
+        added = self.queue.enqueue(jobs=valid_jobs())
+        return added + self.queue.reject(jobs=rejected)
+
+    def _start_worker(self, context: multiprocessing.context.BaseContext) -> multiprocessing.Process:
+        process = context.Process(target=run_worker,
+                                  kwargs={'queue_path': self.queue_path,
+                                          'retry_policy': self.retry_policy,
+                                          'researcher_factory': self.researcher_factory,
+                                          'config': self.config,
+                                          'concurrency': self.concurrency,
+                                          'poll_interval': self.poll_interval},
+                                  daemon=True)
+        process.start()
+        return process
+
+    async def run(self) -> AsyncIterator[dict[str, Any]]:
+        """Start the workers and yield finished jobs until the queue is drained."""
+        context = multiprocessing.get_context('spawn')
+        workers = [self._start_worker(context=context) for _ in range(self.processes)]
+        try:
+            is_drained = False
+            while True:
+                finished = await asyncio.to_thread(self.queue.get_finished)
+                for job in finished:
+                    result = job['result'] if job['result'] is not None else {}
+                    yield {
+                        'job_id': job['job_id'],
+                        'key': job['key'],
+                        'input': job['payload'],
+                        'status': job['status'],
+                        'attempts': job['attempts'],
+                        'content': result.get('content'),
+                        'token_usage': result.get('token_usage'),
+                        'is_cached': result.get('is_cached'),
+                        'thread_id': result.get('thread_id'),
+                        'error': job['error'] if job['status'] == DEAD else None,
+                    }
+                    await asyncio.to_thread(self.queue.mark_delivered, job_ids=[job['job_id']])
+                if len(finished) > 0:
+                    continue
+                if is_drained:
+                    break
+
+                counts = await asyncio.to_thread(self.queue.counts)
+                # Fetch once more after the queue is drained: jobs may have finished since the last fetch
+                is_drained = counts[PENDING] == 0 and counts[LEASED] == 0
+                if not is_drained:
+                    for i, worker in enumerate(workers):
+                        if not worker.is_alive():
+                            worker.join()
+                            workers[i] = self._start_worker(context=context)
+                            self.restarts += 1
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
@@ -0,0 +1,110 @@
+import json
+import os
+from typing import Any, get_origin
+
+import pytest
+from langchain_core.runnables import RunnableConfig
+
+from business_researcher import BusinessResearcher
+from business_researcher.components import fact_checker, note_reviewer, note_taker, query_writer
+from business_researcher.enums import SearchType
+from business_researcher.schema import CompanySchema
+from business_researcher.state import Company, SearchState
+
+CONFIGURATION_MODULE_PREFIX = 'business_researcher.configuration'
+MODEL_PARAMS = {'model': 'test-model', 'model_provider': 'groq', 'api_key': 'test', 'max_llm_retries': 1,
+                'model_args': {'temperature': 0}}
+
+
+def make_config(**configurable: Any) -> RunnableConfig:
+    return RunnableConfig(configurable={
+        'max_iterations': 3,
+        'max_results_per_query': 5,
+        'max_tokens_per_source': 1000,
+        'number_of_days_back': 360,
+        'number_of_queries': 3,
+        'search_category': 'general',
+        'search_depth': 'advanced',
+        **configurable,
+    })
+
+
+def make_company_notes(**values: Any) -> CompanySchema:
+    """CompanySchema with every field well populated, overridden by `values`."""
+    defaults = {}
+    for name, field in CompanySchema.model_fields.items():
+        if field.annotation is bool:
+            defaults[name] = True
+        elif get_origin(field.annotation) is list:
+            defaults[name] = [f'{name} value']
+        else:
+            defaults[name] = f'{name} value'
+    defaults['linkedin_profile'] = 'https://www.linkedin.com/company/acme'
+    return CompanySchema(**{**defaults, **values})
+
+
+def make_state(**values: Any) -> SearchState:
+    return SearchState(**{
+        'company': Company(name='Acme', email=None),
+        'is_review_successful': False,
+        'iteration': 0,
+        'notes': None,
+        'out_info': None,
+        'search_focus': [],
+        'search_queries': [],
+        'search_type': SearchType.COMPANY,
+        'source_str': '',
+        'steps': [],
+        'token_usage': {MODEL_PARAMS['model']: {'input_tokens': 0, 'output_tokens': 0}},
+        'topic': 'Acme',
+        'unique_sources': {},
+        **values,
+    })
+
+
+class FakeChatModel:
+    """Stands in for the chat model returned by `get_llm`; components only build runnables from it."""
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> 'FakeChatModel':
+        return self
+
+    def with_retry(self, *args: Any, **kwargs: Any) -> 'FakeChatModel':
+        return self
+
+
+@pytest.fixture
+def fake_get_llm():
+    return lambda **kwargs: FakeChatModel()
+
+
+@pytest.fixture
+def make_researcher(monkeypatch):
+    """
+    Factory of `BusinessResearcher`s that replay the offline benchmark fixtures (no latency) instead of calling
+    the LLM and search providers. Keyword arguments are passed to `BusinessResearcher`.
+    """
+    from offline_pipeline import FIXTURES_DIR, LLM_CONFIG, Latency, ReplayChatModel, ReplayWebSearchNode
+
+    with open(os.path.join(FIXTURES_DIR, 'company_sources.json')) as f:
+        fixture = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'llm_responses.json')) as f:
+        responses = json.load(f)
+
+    def get_replay_llm(model_name: str, model_provider: str, api_key: Any, model_args: dict[str, Any]):
+        return ReplayChatModel(model_name_alias=model_name, responses=responses, notes=fixture['notes'],
+                               latency=Latency(median_ms=0, sigma=0, seed=0))
+
+    for module in (query_writer, note_taker, fact_checker, note_reviewer):
+        monkeypatch.setattr(module, 'get_llm', get_replay_llm)
+
+    def make(**kwargs: Any) -> BusinessResearcher:
+        researcher = BusinessResearcher(llm_config=LLM_CONFIG, web_search_api_key='offline', **kwargs)
+        researcher.web_search.web_search_node = ReplayWebSearchNode(
+            unique_sources=fixture['unique_sources'],
+            queries=[q['search_query'] for q in responses['query_writer']['queries']],
+            latency=Latency(median_ms=0, sigma=0, seed=0),
+            max_tokens_per_source=1000,
+        )
+        return researcher
+
+    return make
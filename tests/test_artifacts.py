@@ -0,0 +1,35 @@
+from business_researcher.components.artifacts import ArtifactCache
+from business_researcher.components.utils import get_schema
+from business_researcher.enums import SearchType
+from conftest import make_state
+
+
+def test_artifacts_are_keyed_by_kind_search_type_and_field_set():
+    artifacts = ArtifactCache(max_entries=2)
+    builds = []
+
+    def get(kind, search_type, fields):
+        return artifacts.get(kind=kind, search_type=search_type, fields=fields,
+                             build=lambda: builds.append((kind, search_type, fields)) or len(builds))
+
+    assert get('model', SearchType.COMPANY, ['name', 'website']) == 1
+    # The order of the fields does not matter
+    assert get('model', SearchType.COMPANY, ['website', 'name']) == 1
+    assert get('model', SearchType.COMPANY, ['name']) == 2
+    assert get('model', SearchType.PERSON, ['name']) == 3
+    assert len(builds) == 3 and len(artifacts) == 2
+    assert artifacts.stats() == {'model': {'hits': 1, 'misses': 3, 'hit_rate': 0.25}}
+
+    # The least recently used entry was evicted
+    assert get('model', SearchType.COMPANY, ['name', 'website']) == 4
+    assert get('runnable', SearchType.PERSON, ['name']) == 5
+
+
+def test_get_schema_narrows_to_the_fields_and_returns_copies():
+    state = make_state()
+    schema = get_schema(state=state, fields=['name', 'website'])
+    assert set(schema['properties']) == {'name', 'website'}
+
+    schema['properties'] = {}
+    assert set(get_schema(state=state, fields=['website', 'name'])['properties']) == {'name', 'website'}
+    assert len(get_schema(state=state)['properties']) > 2
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from business_researcher.batch import BatchFileRunner, read_entities
+from conftest import make_config
+
+
+class FakeResearcher:
+    def __init__(self):
+        self.inputs = []
+
+    async def run_batch(self, inputs, concurrency, config, max_resumes):
+        for index, input_dict in enumerate(inputs):
+            self.inputs.append(input_dict)
+            yield {'index': index, 'input': input_dict, 'content': {'name': input_dict['name']},
+                   'token_usage': {'model': {'input_tokens': 1, 'output_tokens': 1}}, 'thread_id': f't{index}',
+                   'resumes': 0, 'is_cached': False, 'error': None}
+
+
+def write_lines(path, lines):
+    path.write_text(''.join(line + '\n' for line in lines), encoding='utf-8')
+
+
+def run(runner, input_path, output_path):
+    async def collect():
+        return [line async for line in runner.run(input_path=str(input_path), output_path=str(output_path))]
+    return asyncio.run(collect())
+
+
+def test_read_entities_reports_malformed_jsonl_lines(tmp_path):
+    path = tmp_path / 'entities.jsonl'
+    write_lines(path, ['{"name": "Acme", "search_type": "Company"}', '{"name": ', '["Acme"]', '',
+                       '{"name": " Beta ", "email": ""}'])
+    entities = list(read_entities(path=str(path), default_search_type='company'))
+    assert entities[0] == (0, {'name': 'Acme', 'search_type': 'company'}, None)
+    assert entities[1][:2] == (1, {}) and entities[1][2].startswith('JSONDecodeError')
+    assert entities[2] == (2, {}, 'ValueError: Expected a JSON object, got list')
+    assert entities[3] == (3, {'name': 'Beta', 'search_type': 'company'}, None)
+
+
+def test_malformed_rows_get_error_lines_without_aborting_the_batch(tmp_path):
+    input_path, output_path = tmp_path / 'entities.jsonl', tmp_path / 'out.jsonl'
+    write_lines(input_path, ['{"name": "Acme", "search_type": "company"}', 'not json', '42',
+                             '{"name": "Beta", "search_type": "company"}'])
+    researcher = FakeResearcher()
+    runner = BatchFileRunner(researcher=researcher, get_cost=lambda token_usage: 0.5, config=make_config())
+
+    lines = run(runner, input_path, output_path)
+    assert sorted(line['row'] for line in lines) == [0, 1, 2, 3]
+    assert {line['row'] for line in lines if line['error'] is not None} == {1, 2}
+    assert [i['name'] for i in researcher.inputs] == ['Acme', 'Beta']
+    assert (runner.summary.completed, runner.summary.failed, runner.summary.cost) == (2, 2, 1.0)
+    assert len(output_path.read_text(encoding='utf-8').splitlines()) == 4
+
+    # A rerun retries only the rows without a successful result
+    write_lines(input_path, ['{"name": "Acme", "search_type": "company"}',
+                             '{"name": "Gamma", "search_type": "company"}',
+                             '42',
+                             '{"name": "Beta", "search_type": "company"}'])
+    rerun = BatchFileRunner(researcher=FakeResearcher(), get_cost=lambda token_usage: 0.5, config=make_config())
+    lines = run(rerun, input_path, output_path)
+    assert sorted(line['row'] for line in lines) == [1, 2]
+    assert rerun.summary.skipped == 2
+    assert json.loads(output_path.read_text(encoding='utf-8').splitlines()[-1])['row'] in (1, 2)
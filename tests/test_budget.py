@@ -0,0 +1,36 @@
+import asyncio
+
+from business_researcher.components.budget import Budget
+from business_researcher.configuration import Configuration
+from conftest import make_config
+
+LLM_CONFIG = {'language_model': {'model': 'small', 'model_provider': 'groq'},
+              'reasoning_model': {'model': 'large', 'model_provider': 'groq'}}
+
+
+def test_budget_allows_calls_until_the_estimated_prompt_overflows():
+    budget = Budget(llm_config=LLM_CONFIG)
+    config = make_config(max_input_tokens_per_run=1000, max_output_tokens_per_run=100)
+    configurable = Configuration(**config['configurable'])
+    usage = {'small': {'input_tokens': 600, 'output_tokens': 50}}
+
+    assert budget.allows(token_usage=usage, configurable=configurable, model_name='large', input_tokens=400)
+    assert not budget.allows(token_usage=usage, configurable=configurable, model_name='large', input_tokens=401)
+    assert not budget.is_exhausted(token_usage=usage, configurable=configurable)
+    assert budget.is_exhausted(token_usage={'small': {'input_tokens': 600, 'output_tokens': 100}},
+                               configurable=configurable)
+    unlimited = Configuration(**make_config()['configurable'])
+    assert budget.allows(token_usage=usage, configurable=unlimited, model_name='large', input_tokens=10 ** 9)
+
+
+def test_run_stops_within_the_token_budget(make_researcher):
+    researcher = make_researcher()
+
+    async def main():
+        return await researcher.run(input_dict={'name': 'Norvale Robotics', 'search_type': 'company'},
+                                    config=make_config(thread_id='t1', max_input_tokens_per_run=5000))
+
+    out_dict = asyncio.run(main())
+    assert out_dict['is_budget_exhausted']
+    assert sum(usage['input_tokens'] for usage in out_dict['token_usage'].values()) <= 5000
+    assert sum(out_dict['skipped_llm_calls'].values()) > 0 or out_dict['content'] is None
@@ -0,0 +1,13 @@
+from business_researcher.cache import InMemoryCache, SqliteCache
+
+
+def test_cached_values_are_not_shared_with_callers(tmp_path):
+    for cache in (InMemoryCache(), SqliteCache(path=str(tmp_path / 'cache.sqlite'))):
+        value = {'content': {'ceo': 'Jane Doe'}, 'token_usage': {'model': {'input_tokens': 10}}}
+        cache.set(key='acme', value=value)
+        value['content']['ceo'] = 'changed after set'
+
+        got = cache.get(key='acme')
+        got['token_usage']['model']['input_tokens'] += 5
+        assert cache.get(key='acme') == {'content': {'ceo': 'Jane Doe'}, 'token_usage': {'model': {'input_tokens': 10}}}
+        cache.close()
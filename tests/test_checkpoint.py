@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from business_researcher.checkpoint import CheckpointManager, CheckpointRetention, SqliteCheckpointer
+
+
+@pytest.fixture
+def checkpointer(tmp_path):
+    checkpointer = SqliteCheckpointer(path=str(tmp_path / 'checkpoints.sqlite'))
+    yield checkpointer
+    checkpointer.close()
+
+
+def put(checkpointer, thread_id, checkpoint_id, parent_id=None, **metadata):
+    checkpoint = {**empty_checkpoint(), 'id': checkpoint_id, 'channel_values': {'iteration': int(checkpoint_id)}}
+    config = {'configurable': {'thread_id': thread_id, 'checkpoint_ns': ''}}
+    if parent_id is not None:
+        config['configurable']['checkpoint_id'] = parent_id
+    return checkpointer.put(config, checkpoint, {'step': int(checkpoint_id), **metadata}, {})
+
+
+def test_checkpoints_round_trip(checkpointer):
+    put(checkpointer, 't1', '1', source='input')
+    saved = put(checkpointer, 't1', '2', parent_id='1', source='loop')
+    assert saved == {'configurable': {'thread_id': 't1', 'checkpoint_ns': '', 'checkpoint_id': '2'}}
+
+    latest = checkpointer.get_tuple({'configurable': {'thread_id': 't1'}})
+    assert latest.checkpoint['channel_values'] == {'iteration': 2}
+    assert latest.metadata == {'step': 2, 'source': 'loop'}
+    assert latest.parent_config['configurable']['checkpoint_id'] == '1'
+
+    first = checkpointer.get_tuple({'configurable': {'thread_id': 't1', 'checkpoint_id': '1'}})
+    assert first.checkpoint['channel_values'] == {'iteration': 1}
+    assert first.parent_config is None
+    assert checkpointer.get_tuple({'configurable': {'thread_id': 'unknown'}}) is None
+
+
+def test_pending_writes_are_attached_to_their_checkpoint(checkpointer):
+    put(checkpointer, 't1', '1')
+    config = {'configurable': {'thread_id': 't1', 'checkpoint_ns': '', 'checkpoint_id': '1'}}
+    checkpointer.put_writes(config, [('notes', {'ceo': 'Jane Doe'}), ('steps', ['note_taker'])], task_id='task-a')
+    # Regular writes are stored once, special channels replace earlier writes
+    checkpointer.put_writes(config, [('notes', {'ceo': 'changed'})], task_id='task-a')
+    checkpointer.put_writes(config, [('__error__', 'TimeoutError')], task_id='task-b')
+    checkpointer.put_writes(config, [('__error__', 'RateLimitError')], task_id='task-b')
+
+    pending_writes = checkpointer.get_tuple({'configurable': {'thread_id': 't1'}}).pending_writes
+    assert pending_writes == [('task-a', 'notes', {'ceo': 'Jane Doe'}), ('task-a', 'steps', ['note_taker']),
+                              ('task-b', '__error__', 'RateLimitError')]
+
+
+def test_list_filters_by_thread_metadata_before_and_limit(checkpointer):
+    for i in range(1, 4):
+        put(checkpointer, 't1', str(i), source='loop' if i > 1 else 'input')
+    put(checkpointer, 't2', '4', source='loop')
+
+    def ids(*args, **kwargs):
+        return [c.config['configurable']['checkpoint_id'] for c in checkpointer.list(*args, **kwargs)]
+
+    assert ids(None) == ['4', '3', '2', '1']
+    assert ids({'configurable': {'thread_id': 't1'}}) == ['3', '2', '1']
+    assert ids({'configurable': {'thread_id': 't1'}}, filter={'source': 'input'}) == ['1']
+    assert ids({'configurable': {'thread_id': 't1'}}, before={'configurable': {'checkpoint_id': '3'}}) == ['2', '1']
+    assert ids(None, filter={'source': 'loop'}, limit=2) == ['4', '3']
+
+    async def alist():
+        return [c async for c in checkpointer.alist({'configurable': {'thread_id': 't2'}})]
+
+    assert [c.metadata['step'] for c in asyncio.run(alist())] == [4]
+
+
+def test_delete_thread_removes_checkpoints_and_writes(checkpointer):
+    put(checkpointer, 't1', '1')
+    put(checkpointer, 't2', '2')
+    checkpointer.put_writes({'configurable': {'thread_id': 't1', 'checkpoint_ns': '', 'checkpoint_id': '1'}},
+                            [('notes', {})], task_id='task-a')
+    asyncio.run(checkpointer.adelete_thread('t1'))
+    assert checkpointer.get_tuple({'configurable': {'thread_id': 't1'}}) is None
+    assert list(checkpointer.list_threads()) == ['t2']
+    assert checkpointer._connection.execute('SELECT COUNT(*) FROM writes').fetchone()[0] == 0
+
+
+def test_retention_covers_threads_of_earlier_processes(checkpointer):
+    for i in range(1, 4):
+        put(checkpointer, f'old-{i}', str(i))
+    manager = CheckpointManager(checkpointer=checkpointer, retention=CheckpointRetention(max_threads=2))
+
+    async def run():
+        manager.start(thread_id='new')
+        await manager.finish(thread_id='new', is_successful=True)
+
+    asyncio.run(run())
+    assert sorted(checkpointer.list_threads()) == ['old-3']
+    assert list(manager.finished) == ['old-3', 'new']
@@ -0,0 +1,50 @@
+import asyncio
+
+from business_researcher.components.dedup import deduplicate_sources
+from business_researcher.components.web_search import WebSearch
+from conftest import CONFIGURATION_MODULE_PREFIX, make_config, make_state
+
+TEXT = ('Acme Robotics designs warehouse robots in Austin Texas and was founded in 2015 by Jane Doe '
+        'who serves as chief executive officer of the company today')
+
+
+def make_source(url, content):
+    return {'url': url, 'title': url, 'content': content, 'raw_content': None}
+
+
+def test_near_duplicates_of_higher_ranked_sources_are_dropped():
+    sources = {
+        'https://a.com': make_source('https://a.com', TEXT),
+        'https://b.com': make_source('https://b.com', 'Breaking news: ' + TEXT),
+        'https://c.com': make_source('https://c.com', 'Beta Foods sells frozen meals across Europe since 1990'),
+    }
+    kept, dropped = deduplicate_sources(unique_sources=sources, threshold=0.8, shingle_size=3)
+    assert list(kept) == ['https://a.com', 'https://c.com']
+    assert dropped == {'https://b.com': 'https://a.com'}
+
+    # A threshold above any similarity keeps everything
+    kept, dropped = deduplicate_sources(unique_sources=sources, threshold=1.01, shingle_size=3)
+    assert list(kept) == list(sources) and dropped == {}
+
+
+class FakeWebSearchNode:
+    async def run(self, state, config):
+        state.unique_sources = {
+            'https://a.com': make_source('https://a.com', TEXT),
+            'https://b.com': make_source('https://b.com', TEXT + ' Read more.'),
+        }
+        state.source_str = 'both sources'
+        return state
+
+
+def test_web_search_drops_near_duplicates_from_the_source_string():
+    web_search = WebSearch(web_search_node=FakeWebSearchNode(), configuration_module_prefix=CONFIGURATION_MODULE_PREFIX)
+
+    state = asyncio.run(web_search.run(state=make_state(), config=make_config(near_duplicate_threshold=0.8,
+                                                                              shingle_size=3)))
+    assert list(state.unique_sources) == ['https://a.com']
+    assert state.dropped_sources == {'https://b.com': 'https://a.com'}
+    assert 'https://b.com' not in state.source_str
+
+    state = asyncio.run(web_search.run(state=make_state(), config=make_config()))
+    assert len(state.unique_sources) == 2 and state.dropped_sources == {}
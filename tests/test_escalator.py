@@ -0,0 +1,21 @@
+import asyncio
+
+from conftest import make_config
+
+
+def test_model_cascade_runs_extraction_and_review_on_the_language_model(make_researcher):
+    researcher = make_researcher()
+    input_dict = {'name': 'Norvale Robotics', 'search_type': 'company'}
+
+    async def main():
+        return [await researcher.run(input_dict=input_dict,
+                                     config=make_config(thread_id=f't{i}', model_cascade=is_cascade))
+                for i, is_cascade in enumerate((False, True))]
+
+    single_tier, cascade = asyncio.run(main())
+    assert cascade['content'] == single_tier['content']
+    # Only the query writer uses the language model without the cascade
+    assert single_tier['tier_stats']['language_model']['llm_calls'] == 1
+    assert cascade['tier_stats']['language_model']['llm_calls'] > 1
+    reasoning_calls = [out['tier_stats']['reasoning_model']['llm_calls'] for out in (single_tier, cascade)]
+    assert reasoning_calls[1] < reasoning_calls[0]
@@ -0,0 +1,54 @@
+import asyncio
+import math
+
+from business_researcher.components import fact_checker
+from business_researcher.components.fact_checker import FactChecker
+from business_researcher.components.retrieval import ChunkIndex, retrieve_evidence
+from business_researcher.schema import CompanySchema
+from conftest import CONFIGURATION_MODULE_PREFIX, MODEL_PARAMS, make_company_notes, make_config, make_state
+
+UNIQUE_SOURCES = {
+    'https://acme.com/about': {'url': 'https://acme.com/about', 'title': 'About Acme',
+                               'content': 'Acme was founded in 1990. The CEO of Acme is Jane Doe.'},
+    'https://news.com/acme': {'url': 'https://news.com/acme', 'title': 'Acme news',
+                              'content': 'Acme employs 500 people and sells robots worldwide.'},
+}
+
+
+def test_chunk_index_matches_one_off_retrieval():
+    notes = {'ceo': 'Jane Doe', 'number_of_employees': '500'}
+    json_schema = {'ceo': {'description': 'Chief executive officer'}, 'number_of_employees': {}}
+    chunk_index = ChunkIndex(unique_sources=UNIQUE_SOURCES, chunk_size=5, chunk_overlap=1)
+    expected = retrieve_evidence(unique_sources=UNIQUE_SOURCES, notes=notes, json_schema=json_schema, top_k=2,
+                                 chunk_size=5, chunk_overlap=1)
+    assert chunk_index.retrieve(notes=notes, json_schema=json_schema, top_k=2) == expected
+    assert 'Jane Doe' in expected
+
+
+def test_shards_share_one_chunk_index(monkeypatch, fake_get_llm):
+    monkeypatch.setattr(fact_checker, 'get_llm', fake_get_llm)
+    built = []
+
+    class CountingChunkIndex(ChunkIndex):
+        def __init__(self, **kwargs):
+            built.append(kwargs)
+            super().__init__(**kwargs)
+
+    asked = []
+
+    async def fake_ainvoke_llm(instructions, schema, **kwargs):
+        asked.append(instructions)
+        return schema.model_validate({f: {'title': f, 'value': None, 'is_fact': True, 'sources': []}
+                                      for f in schema.model_fields})
+
+    monkeypatch.setattr(fact_checker, 'ChunkIndex', CountingChunkIndex)
+    monkeypatch.setattr(fact_checker, 'ainvoke_llm', fake_ainvoke_llm)
+    checker = FactChecker(model_params=MODEL_PARAMS, configuration_module_prefix=CONFIGURATION_MODULE_PREFIX)
+    state = make_state(notes=make_company_notes(), unique_sources=UNIQUE_SOURCES)
+    config = make_config(fact_check_retrieval=True, fact_check_shard_size=2, fact_check_chunk_size=5,
+                         fact_check_chunk_overlap=1)
+    state = asyncio.run(checker.arun(state=state, config=config))
+
+    assert len(built) == 1
+    assert len(asked) == math.ceil(len(CompanySchema.model_fields) / 2)
+    assert any('The CEO of Acme' in instructions for instructions in asked)
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import business_researcher
+
+HEAVY_MODULES = ('langgraph', 'langchain_core', 'ai_common')
+
+CHECK_IMPORTS = f"""
+import contextlib, io, sys
+import business_researcher
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        business_researcher.main(['--help'])
+    except SystemExit:
+        pass
+print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def test_import_and_help_do_not_load_the_heavy_dependencies():
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(p for p in sys.path if p)}
+    result = subprocess.run([sys.executable, '-c', CHECK_IMPORTS], capture_output=True, text=True, env=env,
+                            check=True)
+    assert result.stdout.strip() == ''
+
+
+def test_lazy_exports_resolve_on_access():
+    for name in business_researcher.__all__:
+        assert getattr(business_researcher, name).__name__ == name
+    assert dir(business_researcher) == sorted(business_researcher.__all__)
+    with pytest.raises(AttributeError):
+        business_researcher.NotAnExport
@@ -0,0 +1,111 @@
+import pytest
+
+from business_researcher import job_queue
+from business_researcher.job_queue import DEAD, DONE, LEASED, PENDING, JobRetryPolicy, SqliteJobQueue
+from business_researcher.worker_pool import WorkerPool
+from conftest import make_config
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_queue.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = SqliteJobQueue(path=str(tmp_path / 'jobs.sqlite'),
+                           retry_policy=JobRetryPolicy(lease_seconds=10, max_attempts=2, retry_delay_seconds=5))
+    yield queue
+    queue.close()
+
+
+def test_enqueue_skips_known_keys(queue):
+    assert queue.enqueue(jobs=[('a', {'name': 'A'}), ('b', {'name': 'B'})]) == 2
+    assert queue.enqueue(jobs=[('a', {'name': 'A'}), ('c', {'name': 'C'})]) == 1
+    assert queue.counts()[PENDING] == 3
+
+
+def test_expired_lease_is_handed_to_another_worker(queue, clock):
+    queue.enqueue(jobs=[('a', {'name': 'A'})])
+    [(job_id, payload)] = queue.lease(worker='w1')
+    assert payload == {'name': 'A'}
+    assert queue.lease(worker='w2') == []
+
+    clock.now += 11
+    assert queue.lease(worker='w2') == [(job_id, payload)]
+    # The first worker lost its lease, its result is dropped
+    assert not queue.complete(job_id=job_id, worker='w1', result={'content': 'stale'})
+    assert queue.complete(job_id=job_id, worker='w2', result={'content': 'fresh'})
+    [finished] = queue.get_finished()
+    assert (finished['status'], finished['attempts'], finished['result']) == (DONE, 2, {'content': 'fresh'})
+
+
+def test_heartbeat_extends_the_lease(queue, clock):
+    queue.enqueue(jobs=[('a', {'name': 'A'})])
+    [(job_id, _)] = queue.lease(worker='w1')
+    clock.now += 8
+    queue.heartbeat(job_ids=[job_id], worker='w1')
+    clock.now += 8
+    assert queue.lease(worker='w2') == []
+    assert queue.counts()[LEASED] == 1
+
+
+def test_failed_job_is_retried_with_backoff_then_dead_lettered(queue, clock):
+    queue.enqueue(jobs=[('a', {'name': 'A'})])
+    [(job_id, _)] = queue.lease(worker='w1')
+    assert queue.fail(job_id=job_id, worker='w1', error='TimeoutError: slow')
+    assert queue.lease(worker='w1') == []
+
+    clock.now += 5
+    assert [j for j, _ in queue.lease(worker='w1')] == [job_id]
+    queue.fail(job_id=job_id, worker='w1', error='TimeoutError: slow again')
+    [finished] = queue.get_finished()
+    assert (finished['status'], finished['attempts'], finished['error']) == (DEAD, 2, 'TimeoutError: slow again')
+
+    assert queue.requeue_dead() == 1
+    assert queue.counts()[PENDING] == 1
+
+
+def test_expired_lease_out_of_attempts_is_dead_lettered(queue, clock):
+    queue.enqueue(jobs=[('a', {'name': 'A'})])
+    queue.lease(worker='w1')
+    clock.now += 11
+    queue.lease(worker='w2')
+    clock.now += 11
+    assert queue.lease(worker='w3') == []
+    [finished] = queue.get_finished()
+    assert (finished['status'], finished['error']) == (DEAD, 'Lease expired')
+
+
+def test_non_retriable_failure_is_dead_lettered_right_away(queue):
+    queue.enqueue(jobs=[('a', {'name': 'A'})])
+    [(job_id, _)] = queue.lease(worker='w1')
+    queue.fail(job_id=job_id, worker='w1', error="KeyError: 'search_type'", is_retriable=False)
+    [finished] = queue.get_finished()
+    assert (finished['status'], finished['attempts']) == (DEAD, 1)
+
+
+def test_pool_dead_letters_invalid_inputs_at_enqueue(tmp_path, clock):
+    pool = WorkerPool(queue_path=str(tmp_path / 'jobs.sqlite'), researcher_factory=lambda: None, config=make_config(),
+                      processes=1)
+    added = pool.enqueue(jobs=[('a', {'name': 'Acme', 'search_type': 'company'}),
+                               ('b', {'name': 'Acme'}),
+                               ('c', {'name': 'Acme', 'search_type': 'planet'})])
+    assert added == 3
+    assert pool.queue.counts() == {PENDING: 1, LEASED: 0, DONE: 0, DEAD: 2}
+    errors = {job['key']: job['error'] for job in pool.queue.get_finished()}
+    assert errors['b'] == "KeyError: 'search_type'"
+    assert errors['c'].startswith('ValueError: Invalid search type')
+    # Enqueueing the same keys again is still a no-op
+    assert pool.enqueue(jobs=[('b', {'name': 'Acme'})]) == 0
+    pool.queue.close()
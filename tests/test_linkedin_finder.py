@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+from langchain_core.runnables import RunnableLambda
+
+from business_researcher.cache import SqliteCache
+from business_researcher.components.linkedin_finder import LinkedinFinder
+from business_researcher.configuration import Configuration
+from conftest import CONFIGURATION_MODULE_PREFIX, make_config, make_state
+
+SOURCES = {url: {'url': url, 'title': url, 'content': url, 'raw_content': None}
+           for url in ('https://www.linkedin.com/company/acme', 'https://www.linkedin.com/company/acme-foods',
+                       'https://acme.com')}
+
+
+class ThreadRecordingCache(SqliteCache):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.threads = set()
+
+    def get(self, key, max_age=None):
+        self.threads.add(threading.get_ident())
+        return super().get(key=key, max_age=max_age)
+
+    def set(self, key, value):
+        self.threads.add(threading.get_ident())
+        super().set(key=key, value=value)
+
+
+def test_foreign_linkedin_pages_are_dropped_and_verdicts_cached(tmp_path):
+    cache = ThreadRecordingCache(path=str(tmp_path / 'linkedin.sqlite'))
+    finder = LinkedinFinder(model_name='local', context_window_length=4096, ollama_url='http://localhost:11434',
+                            configuration_module_prefix=CONFIGURATION_MODULE_PREFIX, verdict_cache=cache)
+    asked = []
+
+    async def verify(instructions: str) -> dict[str, str]:
+        asked.append(instructions)
+        return {'result': 'NO' if 'acme-foods' in instructions else 'YES'}
+
+    finder.linkedin_llm = RunnableLambda(lambda instructions: None, afunc=verify)
+    configurable = Configuration(**make_config(linkedin_verification=True)['configurable'])
+
+    async def main():
+        kept = [await finder.filter_sources(state=make_state(), sources=SOURCES, configurable=configurable)
+                for _ in range(2)]
+        return threading.get_ident(), kept
+
+    loop_thread, kept = asyncio.run(main())
+    assert list(kept[0]) == list(kept[1]) == ['https://www.linkedin.com/company/acme', 'https://acme.com']
+    assert len(asked) == 2
+    assert loop_thread not in cache.threads
+    cache.close()
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+from offline_pipeline import Latency, ReplayChatModel
+
+from business_researcher.cache import InMemoryCache
+from business_researcher.components.artifacts import schema_artifacts
+from business_researcher.components.llm_call import ainvoke_llm
+from business_researcher.components.note_reviewer import ReviewOutput
+from conftest import MODEL_PARAMS, make_state
+
+REVIEW = {'is_satisfactory': True, 'missing_fields': [], 'reasoning': 'Complete'}
+
+
+class ThreadRecordingCache(InMemoryCache):
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key, max_age=None):
+        self.threads.add(threading.get_ident())
+        return super().get(key=key, max_age=max_age)
+
+    def set(self, key, value):
+        self.threads.add(threading.get_ident())
+        super().set(key=key, value=value)
+
+
+def test_cached_structured_call_is_served_off_the_event_loop():
+    llm = ReplayChatModel(model_name_alias=MODEL_PARAMS['model'], responses={'note_reviewer': REVIEW}, notes={},
+                          latency=Latency(median_ms=0, sigma=0, seed=0))
+    structured_llm = llm.with_structured_output(ReviewOutput, include_raw=True)
+    cache = ThreadRecordingCache()
+    state = make_state()
+    hits = schema_artifacts.hits.get('json_schema:ReviewOutput', 0)
+
+    async def main():
+        outputs = [await ainvoke_llm(llm=structured_llm, instructions='Review the notes', state=state,
+                                     model_params=MODEL_PARAMS, model_name_alias=MODEL_PARAMS['model'],
+                                     schema=ReviewOutput, cache=cache) for _ in range(2)]
+        return threading.get_ident(), outputs
+
+    loop_thread, outputs = asyncio.run(main())
+    assert outputs[0] == outputs[1] == ReviewOutput(**REVIEW)
+    assert cache.stats['hits'] == 1
+    assert state.saved_token_usage[MODEL_PARAMS['model']] == state.token_usage[MODEL_PARAMS['model']]
+    assert loop_thread not in cache.threads
+    # The JSON schema in the cache key is memoized
+    assert schema_artifacts.hits['json_schema:ReviewOutput'] == hits + 1
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from business_researcher.components import note_reviewer
+from business_researcher.components.note_reviewer import NoteReviewer, ReviewOutput, pre_review
+from business_researcher.schema import CompanySchema
+from conftest import CONFIGURATION_MODULE_PREFIX, MODEL_PARAMS, make_company_notes, make_config, make_state
+
+FIELDS = list(CompanySchema.model_fields.keys())
+
+
+def test_pre_review_marks_placeholders_missing():
+    info = make_company_notes(ceo='Not Available', key_executives=[], website='h***@acme.com')
+    missing_fields, ambiguous_fields = pre_review(info=info, fields=FIELDS)
+    assert missing_fields == ['website', 'ceo', 'key_executives']
+    assert ambiguous_fields == []
+
+
+def test_pre_review_matches_markers_as_whole_words():
+    info = make_company_notes(number_of_employees='Approximately 500', ceo='Jane Doe (unverified)',
+                              company_summary='Acme builds unlikely robots in various sizes')
+    _, ambiguous_fields = pre_review(info=info, fields=FIELDS)
+    assert ambiguous_fields == ['ceo', 'number_of_employees', 'company_summary']
+
+
+def test_pre_review_ignores_urls_booleans_and_lists():
+    info = make_company_notes(website='https://acme.com/about?lang=en', is_verified=False,
+                              main_products=['Likely Robot'])
+    missing_fields, ambiguous_fields = pre_review(info=info, fields=FIELDS)
+    assert missing_fields == []
+    assert ambiguous_fields == []
+
+
+@pytest.fixture
+def reviewer(monkeypatch, fake_get_llm):
+    monkeypatch.setattr(note_reviewer, 'get_llm', fake_get_llm)
+    return NoteReviewer(model_params=MODEL_PARAMS, configuration_module_prefix=CONFIGURATION_MODULE_PREFIX)
+
+
+def review(monkeypatch, reviewer, notes, review_output, **configurable):
+    asked = []
+
+    async def fake_ainvoke_llm(instructions, **kwargs):
+        asked.append(instructions)
+        return review_output
+
+    monkeypatch.setattr(note_reviewer, 'ainvoke_llm', fake_ainvoke_llm)
+    state = asyncio.run(reviewer.arun(state=make_state(notes=notes), config=make_config(**configurable)))
+    return state, asked
+
+
+def test_rule_based_review_is_off_by_default(monkeypatch, reviewer):
+    output = ReviewOutput(is_satisfactory=False, missing_fields=['ceo'], reasoning='Outdated')
+    state, asked = review(monkeypatch, reviewer, notes=make_company_notes(), review_output=output)
+    assert len(asked) == 1
+    assert state.search_focus == ['ceo']
+    assert not state.is_review_successful
+
+
+def test_rule_based_review_keeps_every_field_the_llm_names(monkeypatch, reviewer):
+    notes = make_company_notes(ceo='Probably Jane Doe', address='Not Available')
+    output = ReviewOutput(is_satisfactory=False, missing_fields=['ceo', 'year_founded'], reasoning='Outdated')
+    state, asked = review(monkeypatch, reviewer, notes=notes, review_output=output, rule_based_review=True)
+    assert len(asked) == 1
+    assert state.search_focus == ['address', 'ceo', 'year_founded']
+    assert not state.is_review_successful
+
+
+def test_review_success_follows_the_search_focus(monkeypatch, reviewer):
+    # An unsatisfactory verdict without any missing field leaves nothing to search for
+    output = ReviewOutput(is_satisfactory=False, missing_fields=[], reasoning='Looks incomplete')
+    state, _ = review(monkeypatch, reviewer, notes=make_company_notes(), review_output=output)
+    assert state.search_focus == []
+    assert state.is_review_successful
+
+
+def test_rule_based_review_skips_the_llm_without_ambiguous_fields(monkeypatch, reviewer):
+    state, asked = review(monkeypatch, reviewer, notes=make_company_notes(), review_output=None,
+                          rule_based_review=True)
+    assert asked == []
+    assert state.skipped_llm_calls == {'note_reviewer': 1}
+    assert state.is_review_successful
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from business_researcher.components import note_taker
+from business_researcher.components.note_taker import NoteTaker
+from business_researcher.enums import Node
+from business_researcher.schema import CompanySchema
+from conftest import CONFIGURATION_MODULE_PREFIX, MODEL_PARAMS, make_company_notes, make_config, make_state
+
+SOURCES = {url: {'url': url, 'title': url, 'content': f'Content of {url}', 'raw_content': None}
+           for url in ('https://a.com', 'https://b.com')}
+
+
+@pytest.fixture
+def extraction(monkeypatch, fake_get_llm):
+    """Runs a NoteTaker whose LLM answers with `values`; returns the state and the (prompt, fields) of each call."""
+    monkeypatch.setattr(note_taker, 'get_llm', fake_get_llm)
+    taker = NoteTaker(model_params=MODEL_PARAMS, configuration_module_prefix=CONFIGURATION_MODULE_PREFIX)
+
+    def run(state, values, **configurable):
+        calls = []
+
+        async def fake_ainvoke_llm(instructions, schema, **kwargs):
+            calls.append((instructions, list(schema.model_fields)))
+            return schema.model_validate({f: values.get(f, 'Not Available') for f in schema.model_fields})
+
+        monkeypatch.setattr(note_taker, 'ainvoke_llm', fake_ainvoke_llm)
+        state = asyncio.run(taker.arun(state=state, config=make_config(**configurable)))
+        return state, calls
+
+    return run
+
+
+def test_later_iterations_extract_only_new_sources_and_focus_fields(extraction):
+    state = make_state(notes=make_company_notes(ceo='Not Available', website='https://acme.com'),
+                       unique_sources=SOURCES, processed_sources=['https://a.com'],
+                       search_focus=['ceo', 'website'], iteration=1)
+    state, calls = extraction(state, values={'ceo': 'Jane Doe'})
+
+    [(instructions, fields)] = calls
+    assert fields == ['website', 'ceo']
+    assert 'https://b.com' in instructions and 'https://a.com' not in instructions
+    # A value found earlier is not overwritten with a missing one
+    assert (state.notes.ceo, state.notes.website) == ('Jane Doe', 'https://acme.com')
+    assert state.processed_sources == ['https://a.com', 'https://b.com']
+
+
+def test_no_new_sources_skips_the_call(extraction):
+    state = make_state(notes=make_company_notes(), unique_sources=SOURCES,
+                       processed_sources=list(SOURCES), search_focus=['ceo'], iteration=1)
+    state, calls = extraction(state, values={})
+    assert calls == []
+    assert state.skipped_llm_calls == {Node.NOTE_TAKER: 1}
+
+
+def test_non_incremental_mode_re_extracts_everything(extraction):
+    state = make_state(notes=make_company_notes(ceo='Jane Doe'), unique_sources=SOURCES,
+                       processed_sources=list(SOURCES), search_focus=['ceo'], iteration=1,
+                       source_str='All sources')
+    state, calls = extraction(state, values=make_company_notes(ceo='John Roe').model_dump(),
+                              incremental_note_taking=False)
+    assert len(calls) == 1 and calls[0][1] == list(CompanySchema.model_fields)
+    assert state.notes.ceo == 'John Roe'
@@ -0,0 +1,18 @@
+import asyncio
+
+from offline_pipeline import Latency, ReplayChatModel
+
+from business_researcher.components.note_reviewer import ReviewOutput
+
+REVIEW = {'is_satisfactory': False, 'missing_fields': ['ceo'], 'reasoning': 'No CEO'}
+
+
+def test_replay_model_answers_the_same_sync_and_async():
+    llm = ReplayChatModel(model_name_alias='replay', responses={'note_reviewer': REVIEW}, notes={},
+                          latency=Latency(median_ms=1, sigma=0, seed=0))
+    structured_llm = llm.with_structured_output(ReviewOutput, include_raw=True)
+
+    sync_result = structured_llm.invoke('Review the notes')
+    async_result = asyncio.run(structured_llm.ainvoke('Review the notes'))
+    assert sync_result['parsed'] == async_result['parsed'] == ReviewOutput(**REVIEW)
+    assert sync_result['raw'].usage_metadata == async_result['raw'].usage_metadata
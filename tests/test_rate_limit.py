@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from business_researcher.components import rate_limit
+from business_researcher.components.rate_limit import WEB_SEARCH_KEY, ProviderLimiter, RateLimit, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, 'monotonic', clock)
+    return clock
+
+
+def make_limiter(**limits) -> ProviderLimiter:
+    return ProviderLimiter(name='test/model', rate_limit=RateLimit(**limits))
+
+
+def test_rate_limit_error_halves_concurrency_once_per_cooldown(clock):
+    limiter = make_limiter(max_concurrency=8, min_concurrency=2, cooldown_seconds=5)
+    assert limiter.on_rate_limited() == 5
+    assert limiter.concurrency == 4
+    # A burst of errors from the same window counts once
+    limiter.on_rate_limited()
+    assert limiter.concurrency == 4
+
+    clock.now += 5
+    limiter.on_rate_limited()
+    assert limiter.concurrency == 2
+    clock.now += 5
+    limiter.on_rate_limited()
+    assert limiter.concurrency == 2
+    assert limiter.rate_limited == 4
+
+
+def test_retry_after_sets_the_pause(clock):
+    limiter = make_limiter(cooldown_seconds=5)
+    assert limiter.on_rate_limited(retry_after=12) == 12
+    assert limiter.paused_until == clock.now + 12
+    # A shorter hint does not cut an existing pause short
+    clock.now += 2
+    assert limiter.on_rate_limited(retry_after=1) == 10
+
+
+def test_successes_recover_concurrency_up_to_the_maximum(clock):
+    limiter = make_limiter(max_concurrency=4, cooldown_seconds=0)
+    limiter.on_rate_limited()
+    assert limiter.concurrency == 2
+    for _ in range(2):
+        limiter.on_success(latency=0.1)
+    assert limiter.concurrency == pytest.approx(2.9, abs=0.05)
+    for _ in range(20):
+        limiter.on_success(latency=0.1)
+    assert limiter.concurrency == 4
+
+
+def test_slow_calls_shrink_concurrency(clock):
+    limiter = make_limiter(max_concurrency=8, latency_target_seconds=1, cooldown_seconds=0)
+    limiter.on_success(latency=2)
+    assert limiter.concurrency == 4
+    assert limiter.rate_limited == 0
+
+
+def test_token_bucket_waits_for_the_refill():
+    bucket = rate_limit.TokenBucket(per_minute=60)
+    now = bucket.updated
+    assert bucket.get_wait(amount=60, now=now) == 0
+    bucket.take(amount=70)
+    # 10 units of debt plus 5 requested at one unit per second
+    assert bucket.get_wait(amount=5, now=now) == pytest.approx(15)
+    assert bucket.get_wait(amount=5, now=now + 15) == pytest.approx(0)
+
+
+def test_concurrency_limit_queues_calls():
+    limiter = make_limiter(max_concurrency=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.limit():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*[call() for _ in range(6)])
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.stats()['calls'] == 6
+    assert limiter.in_flight == 0
+
+
+def test_only_configured_keys_are_limited():
+    limiter = RateLimiter.from_llm_config(llm_config={
+        'language_model': {'model_provider': 'groq', 'model': 'small', 'rate_limit': {'requests_per_minute': 30}},
+        'reasoning_model': {'model_provider': 'groq', 'model': 'large'},
+    }, web_search_rate_limit=RateLimit(max_concurrency=2))
+    assert limiter.get(model_provider='groq', model='small').rate_limit.requests_per_minute == 30
+    assert limiter.get(model_provider='groq', model='large') is None
+    assert limiter.get(*WEB_SEARCH_KEY).rate_limit.max_concurrency == 2
+    assert set(limiter.stats()) == {'groq/small', 'tavily/search'}
+
+    limiter = RateLimiter(default_rate_limit=RateLimit(max_concurrency=3))
+    assert limiter.get(model_provider='groq', model='large').rate_limit.max_concurrency == 3
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from business_researcher.cache import SqliteCache
+from business_researcher.checkpoint import SqliteCheckpointer
+from business_researcher.enums import Node
+from conftest import make_config
+
+
+def test_run_batch_yields_every_entity_and_survives_failures(make_researcher):
+    researcher = make_researcher()
+    inputs = [{'name': 'Norvale Robotics', 'search_type': 'company'},
+              {'name': 'Norvale Robotics', 'search_type': 'planet'},
+              {'name': 'Norvale Labs', 'search_type': 'company'}]
+
+    async def main():
+        return [r async for r in researcher.run_batch(inputs=inputs, config=make_config(), concurrency=2)]
+
+    results = sorted(asyncio.run(main()), key=lambda r: r['index'])
+    assert [r['error'] is None for r in results] == [True, False, True]
+    assert results[1]['error'].startswith('ValueError: Invalid search type')
+    assert results[0]['content']['name'] == 'Norvale Robotics Inc.'
+    assert len({r['thread_id'] for r in results}) == 3
+
+
+def test_resume_without_config_reuses_the_recorded_configuration(make_researcher):
+    researcher = make_researcher()
+    config = make_config()
+    config['configurable']['thread_id'] = 'thread-1'
+
+    async def main():
+        out_dict = await researcher.run(input_dict={'name': 'Norvale Robotics', 'search_type': 'company'},
+                                        config=config)
+        return out_dict, await researcher.resume(thread_id='thread-1')
+
+    out_dict, resumed = asyncio.run(main())
+    assert resumed['content'] == out_dict['content']
+
+
+def test_stored_result_is_returned_without_running_the_graph(make_researcher, tmp_path):
+    store = SqliteCache(path=str(tmp_path / 'results.sqlite'), namespace='results')
+    researcher = make_researcher(result_store=store)
+    input_dict = {'name': 'Norvale Robotics', 'search_type': 'company'}
+
+    async def main():
+        first = await researcher.run(input_dict=input_dict, config=make_config(thread_id='t1'))
+        second = await researcher.run(input_dict={**input_dict, 'name': ' norvale  robotics '},
+                                      config=make_config(thread_id='t2'))
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert (first['is_cached'], second['is_cached']) == (False, True)
+    assert second['content'] == first['content']
+    assert second['saved_token_usage'] == first['token_usage']
+    assert all(usage['input_tokens'] == 0 for usage in second['token_usage'].values())
+    store.close()
+
+
+class FailingWebSearchNode:
+    async def run(self, state, config):
+        raise ConnectionError('search provider unavailable')
+
+
+def test_failed_research_resumes_from_its_last_checkpoint(make_researcher, tmp_path):
+    path = str(tmp_path / 'checkpoints.sqlite')
+    input_dict = {'name': 'Norvale Robotics', 'search_type': 'company'}
+
+    async def fail():
+        checkpointer = SqliteCheckpointer(path=path)
+        researcher = make_researcher(checkpointer=checkpointer)
+        researcher.web_search.web_search_node = FailingWebSearchNode()
+        try:
+            await researcher.run(input_dict=input_dict, config=make_config(thread_id='t1'))
+        finally:
+            checkpointer.close()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(fail())
+
+    # A new researcher (as in a new process) picks the thread up from the SQLite checkpoint
+    async def resume():
+        checkpointer = SqliteCheckpointer(path=path)
+        researcher = make_researcher(checkpointer=checkpointer)
+        try:
+            assert await researcher.is_resumable(thread_id='t1')
+            return await researcher.resume(thread_id='t1', config=make_config())
+        finally:
+            checkpointer.close()
+
+    out_dict = asyncio.run(resume())
+    assert out_dict['content']['name'] == 'Norvale Robotics Inc.'
+    # The query writer completed before the failure and is not run again
+    assert [span['node'] for span in out_dict['spans']].count(Node.QUERY_WRITER) == 1
+
+
+def test_astream_yields_node_progress_and_then_the_result(make_researcher):
+    researcher = make_researcher()
+
+    async def main():
+        return [event async for event in researcher.astream(input_dict={'name': 'Norvale Robotics',
+                                                                        'search_type': 'company'},
+                                                            config=make_config(thread_id='t1'))]
+
+    events = asyncio.run(main())
+    node_events, result = events[:-1], events[-1]
+    assert all(event['type'] == 'node' for event in node_events) and result['type'] == 'result'
+    assert node_events[0]['node'] == Node.QUERY_WRITER and node_events[0]['fields'] == {}
+    assert all(event['span']['node'] == event['node'] for event in node_events)
+    assert node_events[-1]['fields']['name'] == 'Norvale Robotics Inc.'
+
+    # The token deltas add up to the usage of the run
+    output = result['output']
+    for model, usage in output['token_usage'].items():
+        assert sum(event['token_delta'].get(model, {}).get('input_tokens', 0)
+                   for event in node_events) == usage['input_tokens']
+    assert output['content']['name'] == 'Norvale Robotics Inc.'
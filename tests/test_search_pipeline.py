@@ -0,0 +1,26 @@
+import asyncio
+
+from business_researcher.components.utils import merge_values
+from conftest import make_company_notes, make_config
+
+
+def test_merge_values_keeps_values_found_earlier():
+    notes = make_company_notes(ceo='Jane Doe', key_executives=[])
+    merge_values(notes=notes, values={'ceo': 'Not Available', 'key_executives': ['John Roe'],
+                                      'website': 'Not Available'})
+    assert (notes.ceo, notes.key_executives, notes.website) == ('Jane Doe', ['John Roe'], 'website value')
+
+
+def test_pipelined_extraction_gives_the_same_content(make_researcher):
+    researcher = make_researcher()
+    input_dict = {'name': 'Norvale Robotics', 'search_type': 'company'}
+
+    async def main():
+        return [await researcher.run(input_dict=input_dict,
+                                     config=make_config(thread_id=f't{i}', pipelined_extraction=is_pipelined))
+                for i, is_pipelined in enumerate((False, True))]
+
+    sequential, pipelined = asyncio.run(main())
+    assert pipelined['content'] == sequential['content']
+    assert 'search_pipeline' in [span['node'] for span in pipelined['spans']]
+    assert 'web_search' not in [span['node'] for span in pipelined['spans']]
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Optional
+
+from business_researcher.service import ResearchService
+from conftest import make_config
+
+
+class FakeResearcher:
+    """Records every research and blocks it until `release` is set."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    @staticmethod
+    def get_entity_key(input_dict: dict[str, Any]) -> str:
+        return f"{input_dict['search_type']}:{input_dict['name'].strip().lower()}"
+
+    async def run(self, input_dict: dict[str, Any], config: Any, max_age: Optional[float] = None,
+                  force_refresh: bool = False) -> dict[str, Any]:
+        self.calls.append({'input': input_dict, 'max_age': max_age, 'force_refresh': force_refresh})
+        await self.release.wait()
+        return {'content': {'name': input_dict['name']}, 'force_refresh': force_refresh}
+
+
+async def research_all(service: ResearchService, researcher: FakeResearcher, requests: list[dict[str, Any]]):
+    tasks = [asyncio.create_task(service.research(**request)) for request in requests]
+    await asyncio.sleep(0.01)
+    researcher.release.set()
+    return await asyncio.gather(*tasks)
+
+
+def test_requests_for_the_same_entity_are_coalesced():
+    async def main():
+        researcher = FakeResearcher()
+        service = ResearchService(researcher=researcher, config=make_config(), max_concurrency=4)
+        company = {'name': 'Acme', 'search_type': 'company'}
+        results = await research_all(service, researcher, [{'input_dict': company},
+                                                           {'input_dict': {**company, 'name': ' ACME '}},
+                                                           {'input_dict': {'name': 'Other', 'search_type': 'company'}}])
+        return researcher, service, results
+
+    researcher, service, results = asyncio.run(main())
+    assert len(researcher.calls) == 2
+    assert [r['is_coalesced'] for r in results] == [False, True, False]
+    assert service.metrics.coalesced_total == 1
+    assert service.metrics.completed_total == 2
+
+
+def test_fresher_requests_are_not_coalesced_with_looser_ones():
+    async def main():
+        researcher = FakeResearcher()
+        service = ResearchService(researcher=researcher, config=make_config(), max_concurrency=4)
+        company = {'name': 'Acme', 'search_type': 'company'}
+        results = await research_all(service, researcher, [{'input_dict': company},
+                                                           {'input_dict': company, 'force_refresh': True},
+                                                           {'input_dict': company, 'max_age': 60}])
+        return researcher, results
+
+    researcher, results = asyncio.run(main())
+    assert len(researcher.calls) == 3
+    assert not any(r['is_coalesced'] for r in results)
+    assert results[1]['force_refresh'] is True
+
+
+def test_invalid_requests_are_rejected():
+    service = ResearchService(researcher=FakeResearcher(), config=make_config())
+
+    def post(body: Any) -> HTTPStatus:
+        status, _ = asyncio.run(service.handle_request(method='POST', path='/research',
+                                                       body=json.dumps(body).encode()))
+        return status
+
+    assert post([]) == HTTPStatus.BAD_REQUEST
+    assert post({'name': 'Acme'}) == HTTPStatus.BAD_REQUEST
+    assert post({'name': 'Acme', 'search_type': 'company', 'max_age': '60'}) == HTTPStatus.BAD_REQUEST
+    assert post({'name': 'Acme', 'search_type': 'company', 'force_refresh': 'yes'}) == HTTPStatus.BAD_REQUEST
+    assert asyncio.run(service.handle_request(method='GET', path='/nowhere', body=b''))[0] == HTTPStatus.NOT_FOUND
+
+
+def test_bad_content_length_gets_a_response():
+    async def main():
+        service = ResearchService(researcher=FakeResearcher(), config=make_config())
+        server = await asyncio.start_server(service.handle_connection, host='127.0.0.1', port=0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(b'POST /research HTTP/1.1\r\nContent-Length: abc\r\n\r\n')
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response
+
+    response = asyncio.run(main())
+    assert response.startswith(b'HTTP/1.1 400 Bad Request')
+    assert b'Invalid Content-Length' in response
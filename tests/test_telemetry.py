@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+from business_researcher.enums import Node
+from business_researcher.telemetry import current_span, instrument_node, spans_to_jsonl, spans_to_prometheus
+from conftest import MODEL_PARAMS, make_config, make_state
+
+
+def test_instrument_node_records_a_span_per_execution():
+    async def action(state, config):
+        current_span.get().llm_calls += 1
+        state.token_usage[MODEL_PARAMS['model']]['input_tokens'] += 100
+        state.token_usage[MODEL_PARAMS['model']]['output_tokens'] += 10
+        return state
+
+    node = instrument_node(Node.NOTE_TAKER, action)
+    state = asyncio.run(node(make_state(iteration=2), make_config()))
+    state = asyncio.run(node(state, make_config()))
+
+    assert len(state.spans) == 2
+    span = state.spans[-1]
+    assert (span['node'], span['iteration']) == (Node.NOTE_TAKER, 2)
+    assert (span['input_tokens'], span['output_tokens'], span['llm_calls']) == (100, 10, 1)
+    assert span['wall_time'] >= 0 and span['wait_time'] >= 0
+    assert current_span.get() is None
+
+
+def test_spans_export_as_json_lines_and_prometheus_metrics(make_researcher):
+    researcher = make_researcher()
+    out_dict = asyncio.run(researcher.run(input_dict={'name': 'Norvale Robotics', 'search_type': 'company'},
+                                          config=make_config(thread_id='t1')))
+    spans = out_dict['spans']
+    note_taker_spans = [s for s in spans if s['node'] == Node.NOTE_TAKER]
+    assert len(note_taker_spans) > 0
+    assert all(s['llm_calls'] > 0 and s['prompt_chars'] > 0 and s['input_tokens'] > 0 for s in note_taker_spans)
+
+    lines = [json.loads(line) for line in spans_to_jsonl(spans, thread_id='t1').splitlines()]
+    assert len(lines) == len(spans) and all(line['thread_id'] == 't1' for line in lines)
+
+    metrics = spans_to_prometheus(spans)
+    assert '# TYPE business_researcher_node_wall_seconds summary' in metrics
+    count = f'business_researcher_node_wall_seconds_count{{node="{Node.NOTE_TAKER}"}} {len(note_taker_spans)}'
+    assert count in metrics.splitlines()
+    calls = sum(s['llm_calls'] for s in note_taker_spans)
+    assert f'business_researcher_node_llm_calls_total{{node="{Node.NOTE_TAKER}"}} {calls}' in metrics.splitlines()
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+from ai_common import SearchQuery
+
+from business_researcher.cache import SqliteCache
+from business_researcher.components.web_search import WebSearch
+from conftest import CONFIGURATION_MODULE_PREFIX, make_config, make_state
+
+
+class FakeWebSearchNode:
+    def __init__(self):
+        self.queries = []
+
+    async def run(self, state, config):
+        query = state.search_queries[0].search_query
+        self.queries.append(query)
+        url = f'https://example.com/{len(self.queries)}'
+        state.unique_sources = {url: {'url': url, 'title': query, 'content': query, 'raw_content': None}}
+        return state
+
+
+class RecordingCache(SqliteCache):
+    """Records the threads the cache is used from."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.threads = []
+
+    def get(self, **kwargs):
+        self.threads.append(threading.get_ident())
+        return super().get(**kwargs)
+
+    def set(self, **kwargs):
+        self.threads.append(threading.get_ident())
+        return super().set(**kwargs)
+
+
+def test_cached_search_keeps_cache_io_off_the_event_loop(tmp_path):
+    node = FakeWebSearchNode()
+    cache = RecordingCache(path=str(tmp_path / 'search.sqlite'))
+    web_search = WebSearch(web_search_node=node, configuration_module_prefix=CONFIGURATION_MODULE_PREFIX, cache=cache)
+    queries = [SearchQuery(search_query=q, aspect='test', rationale='test')
+               for q in ('Acme CEO', 'acme  ceo', 'Acme revenue')]
+
+    async def main():
+        loop_thread = threading.get_ident()
+        first = await web_search.run(state=make_state(search_queries=queries[:1]), config=make_config())
+        second = await web_search.run(state=make_state(search_queries=queries), config=make_config())
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(main())
+    # The normalized duplicate query is a cache hit
+    assert node.queries == ['Acme CEO', 'Acme revenue']
+    assert list(first.unique_sources) == ['https://example.com/1']
+    assert list(second.unique_sources) == ['https://example.com/1', 'https://example.com/2']
+    assert len(cache.threads) > 0 and loop_thread not in cache.threads
+    cache.close()